@@ -0,0 +1,18 @@
+"""NewsCatcher documentation maintenance scripts.
+
+Every script in this folder can still be run directly
+(`python scripts/generate_llms_txt.py`) and imports its siblings by their
+top-level names (`from generate_sitemap import collect_pages`).  Importing
+this package puts the folder on `sys.path` so that the same module objects,
+and their caches, are shared however a script is reached.
+
+`python -m scripts <command>` is the single entry point used by the npm
+scripts; see `scripts/__main__.py` for the command table.
+"""
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = str(Path(__file__).resolve().parent)
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
@@ -0,0 +1,46 @@
+"""Single entry point for the documentation scripts.
+
+    python -m scripts <command> [options]
+    python -m scripts --list
+
+Only the module behind the requested command is imported, and because it is
+imported rather than run as `__main__`, its compiled bytecode is cached in
+`__pycache__/` and reused by later invocations.  Running a file directly
+(`python scripts/generate_llms_txt.py`) recompiles it on every run.
+"""
+
+import importlib
+import sys
+
+import scripts  # noqa: F401  (puts the scripts folder on sys.path)
+from commands import COMMANDS
+
+
+def _usage() -> str:
+    width = max(len(name) for name in COMMANDS)
+    lines = ["usage: python -m scripts <command> [options]", "", "commands:"]
+    lines += [f"  {name:<{width}}  {summary}" for name, (_, summary) in COMMANDS.items()]
+    lines += ["", "Run 'python -m scripts <command> --help' for command options."]
+    return "\n".join(lines)
+
+
+def main() -> None:
+    if len(sys.argv) < 2 or sys.argv[1] in ("-h", "--help", "--list"):
+        print(_usage())
+        return
+
+    command = sys.argv[1]
+    if command not in COMMANDS:
+        print(f"Error: unknown command '{command}'\n", file=sys.stderr)
+        print(_usage(), file=sys.stderr)
+        sys.exit(2)
+
+    module_name = COMMANDS[command][0]
+    module = importlib.import_module(module_name)
+    # Present the script's own name to argparse / manual argv parsing.
+    sys.argv = [f"scripts/{module_name}.py", *sys.argv[2:]]
+    module.main()
+
+
+if __name__ == "__main__":
+    main()
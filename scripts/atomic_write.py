@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Atomic file replacement shared by the generators and caches.
+
+Every writer here goes through a temporary file next to the target
+(`.<name>.tmp<pid>`) that is renamed over the target once it is complete,
+so readers (the preview server, a concurrent run, CI) never see a partial
+file and an interrupted run leaves the previous file in place.  Missing
+parent directories are created.
+
+    write_atomic(path, text_or_bytes)      # one string or bytes object
+    write_atomic_chunks(path, chunks)      # an iterable of text chunks
+    with open_atomic(path) as fh: ...      # anything else
+
+Text is written as UTF-8 without newline translation.
+
+Requirements:
+    Python 3.8+, stdlib only
+"""
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Union
+
+
+@contextmanager
+def open_atomic(path: Path, mode: str = "w") -> Iterator[IO]:
+    """
+    Open a temporary file that replaces `path` when the block exits cleanly.
+
+    `mode` is "w" (text) or "wb".  If the block raises, the temporary file is
+    removed and `path` is left untouched.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp{os.getpid()}")
+    try:
+        if "b" in mode:
+            fh = open(tmp, mode)
+        else:
+            fh = open(tmp, mode, encoding="utf-8", newline="")
+        with fh:
+            yield fh
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def write_atomic(path: Path, content: Union[str, bytes]) -> None:
+    """Replace `path` with `content` without exposing a partial file."""
+    with open_atomic(path, "wb" if isinstance(content, bytes) else "w") as fh:
+        fh.write(content)
+
+
+def write_atomic_chunks(path: Path, chunks: Iterable[str]) -> None:
+    """Stream `chunks` to `path` without holding them or exposing a partial file."""
+    with open_atomic(path) as fh:
+        fh.writelines(chunks)
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""Backlinks index: which pages and specs link to a given docs URL.
+
+Scans every MDX/Markdown page, every snippet and every OpenAPI YAML file
+for internal links and builds a reverse index from normalized target path
+to each linking location (file, line, link kind):
+
+    markdown       [text](/news-api/api-reference/search)
+    image          ![alt](/images/diagram.png)
+    href           <Card href="/news-api/get-started/quickstart">
+    import         import X from "/snippets/news-api/example.mdx";
+    yaml-url       url: https://www.newscatcherapi.com/docs/news-api/...
+    yaml-markdown  [text](/news-api/...) inside an OAS description
+
+Files are scanned as a whole, so Markdown link text that wraps onto the
+next line is found too; a link's line is the line it starts on.
+
+Targets are normalized to site paths: the https://www.newscatcherapi.com
+host and the /docs prefix are dropped, anchors, query strings, trailing
+slashes and .mdx/.md extensions are removed, and relative links are resolved
+against the linking page.  External URLs are ignored.
+
+The links of each file are kept in the build cache (build_cache.py) keyed
+by its path and content, so an update re-scans only changed files.  When many
+files changed they are scanned in parallel worker processes.
+
+Usage:
+    python scripts/backlinks.py /news-api/api-reference/search
+    python scripts/backlinks.py news-api/api-reference/search.mdx --json
+    python scripts/backlinks.py --prefix /news-api/how-to/
+    python scripts/backlinks.py --stats --no-cache
+
+Requirements:
+    Python 3.10+, stdlib only
+"""
+
+import argparse
+import json
+import os
+import posixpath
+import sys
+import time
+from bisect import bisect_right
+from multiprocessing import Pool
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import patterns
+from build_cache import BUILD_CACHE, add_cache_arguments, apply_cache_arguments, cache_key
+from snippet_graph import SKIP_DIRS
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+# Build cache namespaces of each file's links and of the assembled index.
+CACHE_NAMESPACE = "backlinks-file"
+INDEX_NAMESPACE = "backlinks-index"
+
+# Bump when scanning or normalization rules change.
+INDEX_VERSION = 2
+
+DOCS_HOSTS = {"www.newscatcherapi.com", "newscatcherapi.com"}
+DOCS_PREFIX = "/docs"
+
+PAGE_SUFFIXES = (".mdx", ".md")
+YAML_SUFFIXES = (".yml", ".yaml")
+
+# Scan in worker processes only when at least this many files changed;
+# below it, process start-up costs more than it saves.
+PARALLEL_THRESHOLD = 256
+
+# ---------------------------------------------------------------------------
+# Scanning
+# ---------------------------------------------------------------------------
+
+
+def iter_link_sources(root: Path):
+    """Yield the repo-relative path of every page, snippet and YAML file."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(
+            d for d in dirnames if not d.startswith(".") and d not in SKIP_DIRS
+        )
+        rel_dir = Path(dirpath).relative_to(root).as_posix()
+        for filename in sorted(filenames):
+            if filename == "README.md":
+                continue
+            if filename.endswith(PAGE_SUFFIXES + YAML_SUFFIXES):
+                yield filename if rel_dir == "." else f"{rel_dir}/{filename}"
+
+
+def page_url(rel: str) -> str:
+    """Site path of a page file: news-api/x.mdx -> /news-api/x."""
+    for suffix in PAGE_SUFFIXES:
+        if rel.endswith(suffix):
+            rel = rel[: -len(suffix)]
+            break
+    return "/" + rel
+
+
+def normalize_target(url: str, source: str = "") -> str | None:
+    """
+    Return the site path `url` points to, or None if it is not internal.
+
+    `source` is the repo-relative file holding the link; relative URLs are
+    resolved against its page URL.
+    """
+    url = url.strip()
+    if not url or url.startswith(("#", "mailto:", "tel:", "{")):
+        return None
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc:
+        if parts.scheme not in ("http", "https", "") or parts.netloc not in DOCS_HOSTS:
+            return None
+        path = parts.path
+        if path != DOCS_PREFIX and not path.startswith(DOCS_PREFIX + "/"):
+            return None
+    else:
+        path = parts.path
+        if not path:
+            return None
+        if not path.startswith("/"):
+            base = posixpath.dirname(page_url(source)) if source else "/"
+            path = posixpath.join(base, path)
+
+    if path == DOCS_PREFIX or path.startswith(DOCS_PREFIX + "/"):
+        path = path[len(DOCS_PREFIX) :]
+    path = posixpath.normpath(path or "/")
+    for suffix in PAGE_SUFFIXES:
+        if path.endswith(suffix):
+            path = path[: -len(suffix)]
+            break
+    return path.rstrip("/") or "/"
+
+
+def normalize_query(value: str) -> str | None:
+    """Normalize a query given as a URL, site path or repo-relative page file."""
+    if "://" in value:
+        return normalize_target(value)
+    return normalize_target("/" + value.lstrip("/"))
+
+
+def _word_start(text: str, at: int) -> bool:
+    return at == 0 or not (text[at - 1].isalnum() or text[at - 1] == "_")
+
+
+def _page_links(text: str):
+    for match in patterns.MARKDOWN_LINK.finditer(text):
+        at = match.start()
+        kind = "image" if at and text[at - 1] == "!" else "markdown"
+        yield match.group(1), kind, at, match.start(1)
+    for match in patterns.HREF_ATTR.finditer(text):
+        if _word_start(text, match.start()):
+            yield match.group(1), "href", match.start(), match.start(1)
+    for line in patterns.IMPORT_LINE.finditer(text):
+        match = patterns.MDX_INCLUDE.match(line.group())
+        if match:
+            yield match.group(1), "import", line.start(), line.start() + match.start(1)
+
+
+def _yaml_links(text: str):
+    for match in patterns.MARKDOWN_LINK.finditer(text):
+        yield match.group(1), "yaml-markdown", match.start(), match.start(1)
+    for match in patterns.YAML_URL.finditer(text):
+        if _word_start(text, match.start()):
+            yield match.group(1), "yaml-url", match.start(), match.start(1)
+
+
+# Substrings every file with links contains; other files are skipped cheaply.
+_LINK_HINTS = ("](", "href=", "url:", "import")
+
+
+def text_links(rel: str, text: str) -> list[tuple[str, str, int, int]]:
+    """
+    Return (raw URL, kind, link offset, URL offset) for every link in file `rel`.
+
+    Offsets index `text`: the link offset is where the whole link starts (the
+    "[" of a Markdown link, whose text may wrap onto later lines), the URL
+    offset where the URL itself starts.  Sorted by URL offset.
+    """
+    if not any(hint in text for hint in _LINK_HINTS):
+        return []
+    found = _yaml_links(text) if rel.endswith(YAML_SUFFIXES) else _page_links(text)
+    return sorted(found, key=lambda link: link[3])
+
+
+def line_starts(text: str) -> list[int]:
+    """Offset of the start of every line in `text`; bisect_right gives line numbers."""
+    starts = [0]
+    at = text.find("\n")
+    while at != -1:
+        starts.append(at + 1)
+        at = text.find("\n", at + 1)
+    return starts
+
+
+def scan_links(rel: str, text: str) -> list[list]:
+    """Return [target, line number, kind] for every internal link in a file."""
+    links = []
+    starts = None
+    for url, kind, link_at, _ in text_links(rel, text):
+        target = normalize_target(url, rel)
+        if target is None:
+            continue
+        if starts is None:
+            starts = line_starts(text)
+        links.append([target, bisect_right(starts, link_at), kind])
+    return links
+
+
+def _scan_file(job: tuple[str, bytes]) -> tuple[str, list[list]]:
+    rel, raw = job
+    return rel, scan_links(rel, raw.decode("utf-8", errors="replace"))
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+
+class Backlinks:
+    """Reverse index: target path -> [(file, line, kind), ...]."""
+
+    def __init__(self, files: dict[str, dict]):
+        self.files = files
+        self.targets: dict[str, list[tuple[str, int, str]]] = {}
+        for rel, entry in files.items():
+            for target, lineno, kind in entry["links"]:
+                self.targets.setdefault(target, []).append((rel, lineno, kind))
+
+    @property
+    def link_count(self) -> int:
+        return sum(len(locations) for locations in self.targets.values())
+
+    def links_to(self, target: str) -> list[tuple[str, int, str]]:
+        """Every location linking to `target` (a URL, site path or page file)."""
+        normalized = normalize_query(target)
+        return sorted(self.targets.get(normalized, ())) if normalized else []
+
+    def links_under(self, prefix: str) -> dict[str, list[tuple[str, int, str]]]:
+        """Backlinks of every target equal to or below the `prefix` path."""
+        prefix = normalize_query(prefix) or "/"
+        below = prefix.rstrip("/") + "/"
+        return {
+            target: sorted(locations)
+            for target, locations in sorted(self.targets.items())
+            if target == prefix or target.startswith(below) or prefix == "/"
+        }
+
+
+def build_backlinks(root: Path, rebuild: bool = False, workers: int = 0) -> tuple[Backlinks, dict]:
+    """
+    Bring the cached index up to date; return (index, build stats).
+
+    `workers` caps the worker processes used for changed files (0: one per
+    CPU).  Small updates are scanned in-process.
+    """
+    files: dict[str, dict] = {}
+    pending: list[tuple[str, bytes]] = []
+    keys: dict[str, str] = {}
+    for rel in iter_link_sources(root):
+        raw = (root / rel).read_bytes()
+        # Relative links resolve against the file, so the path is an input too.
+        key = keys[rel] = cache_key(CACHE_NAMESPACE, INDEX_VERSION, rel, raw)
+        links = None if rebuild else BUILD_CACHE.get_json(CACHE_NAMESPACE, key)
+        if links is not None:
+            files[rel] = {"links": links}
+        else:
+            pending.append((rel, raw))
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(pending) >= PARALLEL_THRESHOLD:
+        with Pool(min(workers, len(pending))) as pool:
+            scanned = pool.map(_scan_file, pending, chunksize=16)
+    else:
+        scanned = [_scan_file(job) for job in pending]
+    for rel, links in scanned:
+        BUILD_CACHE.put_json(CACHE_NAMESPACE, keys[rel], links, exact=False)
+        files[rel] = {"links": links}
+
+    files = dict(sorted(files.items()))
+    stats = {"files": len(files), "scanned": len(pending), "reused": len(files) - len(pending)}
+
+    # The assembled index, for load_backlinks (--no-update).
+    index_key = cache_key(INDEX_NAMESPACE, INDEX_VERSION, *keys.values())
+    if BUILD_CACHE.get(INDEX_NAMESPACE, index_key) is None:
+        BUILD_CACHE.put_json(INDEX_NAMESPACE, index_key, files, exact=False)
+    BUILD_CACHE.set_ref(INDEX_NAMESPACE, INDEX_NAMESPACE, index_key)
+    return Backlinks(files), stats
+
+
+def load_backlinks(root: Path) -> Backlinks | None:
+    """Open the last built index as is, without checking inputs; None if absent."""
+    data = BUILD_CACHE.ref(INDEX_NAMESPACE)
+    if data is None:
+        return None
+    return Backlinks(json.loads(data))
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def _print_locations(locations: list[tuple[str, int, str]]) -> None:
+    width = max((len(f"{rel}:{lineno}") for rel, lineno, _ in locations), default=0)
+    for rel, lineno, kind in locations:
+        print(f"  {f'{rel}:{lineno}':<{width}}  {kind}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Show which pages and specs link to a docs URL.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument(
+        "target", nargs="?", help="URL, site path or page file to find links to"
+    )
+    parser.add_argument(
+        "--prefix", metavar="PATH", help="Show backlinks of every target under PATH"
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--stats", action="store_true", help="Print index statistics")
+    add_cache_arguments(parser)
+    parser.add_argument(
+        "--rebuild", dest="no_cache", action="store_true", help="Alias of --no-cache"
+    )
+    parser.add_argument(
+        "--no-update",
+        action="store_true",
+        help="Query the cached index without checking files for changes",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=0, help="Worker processes (default: one per CPU)"
+    )
+    args = parser.parse_args()
+    apply_cache_arguments(args)
+
+    if args.target and args.prefix:
+        parser.error("give either a target or --prefix, not both")
+
+    root = Path(__file__).resolve().parent.parent
+    index = load_backlinks(root) if args.no_update and not args.no_cache else None
+    if index is None:
+        started = time.perf_counter()
+        index, stats = build_backlinks(root, rebuild=args.no_cache, workers=args.workers)
+        if args.stats and not args.json:
+            print(
+                f"Indexed {stats['files']} files in "
+                f"{(time.perf_counter() - started) * 1000:.0f} ms "
+                f"({stats['scanned']} scanned, {stats['reused']} cached)."
+            )
+    if args.stats and not args.json:
+        print(f"  Targets: {len(index.targets)}")
+        print(f"  Links:   {index.link_count}")
+
+    if args.target:
+        locations = index.links_to(args.target)
+        if args.json:
+            json.dump(
+                [{"file": rel, "line": lineno, "kind": kind} for rel, lineno, kind in locations],
+                sys.stdout,
+                indent=2,
+            )
+            sys.stdout.write("\n")
+        else:
+            print(f"{len(locations)} link(s) to {normalize_query(args.target)}:")
+            _print_locations(locations)
+    elif args.prefix:
+        grouped = index.links_under(args.prefix)
+        if args.json:
+            json.dump(
+                {
+                    target: [{"file": r, "line": n, "kind": k} for r, n, k in locations]
+                    for target, locations in grouped.items()
+                },
+                sys.stdout,
+                indent=2,
+            )
+            sys.stdout.write("\n")
+        else:
+            for target, locations in grouped.items():
+                print(f"{target}  ({len(locations)})")
+                _print_locations(locations)
+
+
+if __name__ == "__main__":
+    main()
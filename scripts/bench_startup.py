@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Measure import and startup cost of the documentation scripts.
+
+Each module behind a `python -m scripts` command is imported in a fresh
+interpreter under `python -X importtime`.  Per module the report shows:
+
+- import: cumulative time spent importing the module and everything it pulls
+  in that a bare interpreter had not already loaded (median of --runs)
+- process: wall time of the whole interpreter run (median of --runs)
+- heavy: heavy dependencies (PyYAML) imported eagerly, which should only
+  happen on first use
+
+Short CI checks should be dominated by real work, not imports; `--budget-ms`
+turns the report into a check.
+
+Usage:
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --runs 10 --json
+    python scripts/bench_startup.py --budget-ms 30   # exit 1 if any import is slower
+
+Requirements:
+    Python 3.10+, stdlib only
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from commands import COMMANDS
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# Modules whose eager import counts as "heavy".
+HEAVY_MODULES = ("yaml",)
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Return {module: cumulative microseconds} from `-X importtime` output."""
+    result = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue  # header line
+        result[fields[2].strip()] = int(fields[1])
+    return result
+
+
+def measure(module: str, runs: int) -> dict:
+    """Import `module` `runs` times in fresh interpreters; return medians."""
+    code = (
+        f"import sys; sys.path.insert(0, {str(SCRIPTS_DIR)!r}); "
+        f"import {module}"
+    )
+    import_us: list[int] = []
+    process_s: list[float] = []
+    heavy: set[str] = set()
+    for _ in range(runs):
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+        )
+        process_s.append(time.perf_counter() - started)
+        if proc.returncode != 0:
+            raise RuntimeError(f"importing {module} failed:\n{proc.stderr[-2000:]}")
+        times = parse_importtime(proc.stderr)
+        import_us.append(times.get(module, 0))
+        heavy |= {name for name in HEAVY_MODULES if name in times}
+    return {
+        "module": module,
+        "import_ms": round(statistics.median(import_us) / 1000, 2),
+        "process_ms": round(statistics.median(process_s) * 1000, 1),
+        "heavy": sorted(heavy),
+    }
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure import and startup cost of the documentation scripts.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Runs per module (default: 5)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        metavar="MS",
+        help="Exit 1 if any module's import time exceeds MS milliseconds",
+    )
+    parser.add_argument(
+        "modules",
+        nargs="*",
+        metavar="COMMAND",
+        help="Commands to measure (default: all)",
+    )
+    args = parser.parse_args()
+
+    unknown = [name for name in args.modules if name not in COMMANDS]
+    if unknown:
+        parser.error(f"unknown command(s): {', '.join(unknown)}")
+    names = args.modules or list(COMMANDS)
+
+    baseline = measure("sys", args.runs)["process_ms"]
+    results = [
+        {"command": name, **measure(COMMANDS[name][0], max(1, args.runs))} for name in names
+    ]
+
+    over = [
+        r for r in results if args.budget_ms is not None and r["import_ms"] > args.budget_ms
+    ]
+
+    if args.json:
+        json.dump(
+            {"baseline_process_ms": baseline, "results": results}, sys.stdout, indent=2
+        )
+        sys.stdout.write("\n")
+    else:
+        width = max(len(r["command"]) for r in results)
+        print(f"Bare interpreter: {baseline:.1f} ms\n")
+        print(f"  {'command':<{width}}  {'import':>9}  {'process':>9}  heavy")
+        for r in results:
+            print(
+                f"  {r['command']:<{width}}  {r['import_ms']:7.1f} ms"
+                f"  {r['process_ms']:7.1f} ms  {', '.join(r['heavy']) or '-'}"
+            )
+
+    if over:
+        print(
+            f"\n✗  {len(over)} module(s) over the {args.budget_ms} ms import budget: "
+            + ", ".join(r["command"] for r in over),
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
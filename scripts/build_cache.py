@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""Content-addressed build cache shared by the scripts.
+
+Every derived value the scripts reuse between runs (parsed OpenAPI specs,
+frontmatter, the operation index, snippet imports, link and search
+documents) is stored in one directory, so CI can save and restore it as a
+unit and branches share whatever inputs they have in common:
+
+    .cache/build/
+        manifest.json                 sizes, last use and named refs
+        objects/<namespace>/<key>     one entry per value
+
+A key is the SHA-256 of the namespace, the tool version of that namespace
+and the input bytes (`cache_key`), so a changed input or a bumped version
+simply misses; nothing is ever invalidated in place.  Writes are atomic.
+
+Each run that touches the cache bumps the manifest's run counter and marks
+the entries it read or wrote with it.  When the directory grows beyond
+MAX_BYTES the least recently used entries are evicted, never ones used by
+the current run.
+
+The cache never changes results: parsed inputs (YAML, frontmatter) are only
+stored when they load back equal, and `--no-cache` (or DOCS_NO_CACHE=1)
+skips the cache entirely, recomputing everything.
+
+Scripts use the module-level `BUILD_CACHE`:
+
+    from build_cache import BUILD_CACHE
+
+    spec = BUILD_CACHE.memo_json("oas-spec", SPEC_VERSION, raw, lambda: parse(raw))
+
+Usage:
+    python scripts/build_cache.py              # size and entries per namespace
+    python scripts/build_cache.py --prune      # evict down to MAX_BYTES, drop orphans
+    python scripts/build_cache.py --prune --max-mb 16
+    python scripts/build_cache.py --clear
+
+Requirements:
+    Python 3.10+, stdlib only
+"""
+
+import argparse
+import atexit
+import hashlib
+import json
+import os
+import shutil
+import sys
+from collections.abc import Callable
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+from atomic_write import write_atomic
+from profiling import PROFILER
+
+ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = ".cache/build"
+MANIFEST_NAME = "manifest.json"
+
+# Bump when the directory layout or manifest format changes.
+LAYOUT_VERSION = 1
+
+# Evict least recently used entries beyond this size.
+MAX_BYTES = 64 * 1024 * 1024
+
+NO_CACHE_ENV = "DOCS_NO_CACHE"
+
+# Cache files written before the build cache existed; --clear removes them.
+LEGACY_PATHS = (
+    ".cache/oas-operation-index.json",
+    ".cache/snippet-graph.json",
+    ".cache/backlinks.json",
+    ".cache/search-docs.json",
+)
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+
+def cache_key(namespace: str, version: int, *inputs: bytes | str) -> str:
+    """SHA-256 hex key of a namespace, its tool version and the input parts."""
+    digest = hashlib.sha256(f"{namespace}\0{version}".encode())
+    for part in inputs:
+        data = part.encode("utf-8") if isinstance(part, str) else part
+        digest.update(b"\0%d\0" % len(data))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+# YAML timestamps (e.g. in spec examples) are stored as single-key objects
+# under these keys.  A real mapping with such a key would not load back
+# equal, so the exact check in put_json refuses to store it.
+_DATETIME_KEY = "\0datetime"
+_DATE_KEY = "\0date"
+
+
+def _encode_value(value: Any) -> dict:
+    if isinstance(value, datetime):
+        return {_DATETIME_KEY: value.isoformat()}
+    if isinstance(value, date):
+        return {_DATE_KEY: value.isoformat()}
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _decode_object(obj: dict) -> Any:
+    if len(obj) == 1:
+        if _DATETIME_KEY in obj:
+            return datetime.fromisoformat(obj[_DATETIME_KEY])
+        if _DATE_KEY in obj:
+            return date.fromisoformat(obj[_DATE_KEY])
+    return obj
+
+
+def _loads(data: bytes | str) -> Any:
+    return json.loads(data, object_hook=_decode_object)
+
+
+class BuildCache:
+    """A directory of content-addressed entries with LRU size eviction."""
+
+    def __init__(self, directory: Path, max_bytes: int = MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = not os.environ.get(NO_CACHE_ENV)
+        # "<namespace>/<key>" -> size, for every entry read or written this run.
+        self._used: dict[str, int] = {}
+        self._refs: dict[str, str] = {}
+        self._registered = False
+
+    def _object(self, entry: str) -> Path:
+        return self.directory / "objects" / entry
+
+    def _mark(self, entry: str, size: int) -> None:
+        self._used[entry] = size
+        if not self._registered:
+            atexit.register(self.flush)
+            self._registered = True
+
+    def get(self, namespace: str, key: str) -> bytes | None:
+        """Return the stored bytes, or None on a miss (or when disabled)."""
+        if not self.enabled:
+            return None
+        entry = f"{namespace}/{key}"
+        try:
+            data = self._object(entry).read_bytes()
+        except OSError:
+            PROFILER.count("build cache misses")
+            return None
+        PROFILER.count("build cache hits")
+        self._mark(entry, len(data))
+        return data
+
+    def put(self, namespace: str, key: str, data: bytes) -> None:
+        if not self.enabled:
+            return
+        entry = f"{namespace}/{key}"
+        try:
+            write_atomic(self._object(entry), data)
+        except OSError:
+            return  # Read-only checkout: run uncached
+        PROFILER.count("build cache writes")
+        self._mark(entry, len(data))
+
+    def get_json(self, namespace: str, key: str) -> Any | None:
+        data = self.get(namespace, key)
+        if data is None:
+            return None
+        try:
+            return _loads(data)
+        except ValueError:
+            return None  # Torn or foreign object: recompute
+
+    def put_json(self, namespace: str, key: str, value: Any, exact: bool = True) -> None:
+        """
+        Store `value` as JSON.
+
+        With `exact`, values that would not load back equal (tuples, integer
+        keys, sets) are not stored, so a hit always returns what a fresh
+        computation would.
+        """
+        if not self.enabled:
+            return
+        try:
+            text = json.dumps(
+                value, ensure_ascii=False, separators=(",", ":"), default=_encode_value
+            )
+        except (TypeError, ValueError):
+            return
+        if exact and _loads(text) != value:
+            PROFILER.count("build cache unstorable")
+            return
+        self.put(namespace, key, text.encode("utf-8"))
+
+    def memo_json(
+        self,
+        namespace: str,
+        version: int,
+        source: bytes | str,
+        compute: Callable[[], Any],
+        exact: bool = True,
+    ) -> Any:
+        """Return compute(), reusing the value stored for (version, source)."""
+        if not self.enabled:
+            return compute()
+        key = cache_key(namespace, version, source)
+        value = self.get_json(namespace, key)
+        if value is None:
+            value = compute()
+            self.put_json(namespace, key, value, exact)
+        return value
+
+    def ref(self, name: str) -> bytes | None:
+        """Return the entry a named ref points to (e.g. the latest full index)."""
+        if not self.enabled:
+            return None
+        entry = self._refs.get(name) or self.read_manifest()["refs"].get(name)
+        if not entry:
+            return None
+        namespace, _, key = entry.partition("/")
+        return self.get(namespace, key)
+
+    def set_ref(self, name: str, namespace: str, key: str) -> None:
+        if self.enabled and f"{namespace}/{key}" in self._used:
+            self._refs[name] = f"{namespace}/{key}"
+
+    def read_manifest(self) -> dict:
+        try:
+            manifest = json.loads((self.directory / MANIFEST_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            manifest = {}
+        if manifest.get("version") != LAYOUT_VERSION:
+            manifest = {"version": LAYOUT_VERSION, "run": 0, "entries": {}, "refs": {}}
+        return manifest
+
+    def _evict(self, manifest: dict, max_bytes: int, keep: int) -> int:
+        """Drop least recently used entries (not used in run `keep`) beyond max_bytes."""
+        entries = manifest["entries"]
+        total = sum(size for size, _ in entries.values())
+        evicted = 0
+        for entry in sorted(entries, key=lambda e: entries[e][1]):
+            if total <= max_bytes or entries[entry][1] >= keep:
+                break
+            total -= entries.pop(entry)[0]
+            self._object(entry).unlink(missing_ok=True)
+            evicted += 1
+        manifest["refs"] = {
+            name: entry for name, entry in manifest["refs"].items() if entry in entries
+        }
+        return evicted
+
+    def _write_manifest(self, manifest: dict) -> None:
+        write_atomic(
+            self.directory / MANIFEST_NAME,
+            (json.dumps(manifest, separators=(",", ":"), sort_keys=True) + "\n").encode("utf-8"),
+        )
+
+    def flush(self) -> None:
+        """Record this run's entries in the manifest and evict beyond max_bytes."""
+        if not self._used:
+            return
+        # Re-read so that entries written by concurrent runs are kept.
+        manifest = self.read_manifest()
+        manifest["run"] += 1
+        for entry, size in self._used.items():
+            manifest["entries"][entry] = [size, manifest["run"]]
+        manifest["refs"].update(self._refs)
+        evicted = self._evict(manifest, self.max_bytes, manifest["run"])
+        PROFILER.count("build cache evictions", evicted)
+        try:
+            self._write_manifest(manifest)
+        except OSError:
+            pass
+        self._used.clear()
+        self._refs.clear()
+
+    def prune(self, max_bytes: int) -> tuple[int, int]:
+        """Evict down to max_bytes and delete objects the manifest does not know."""
+        manifest = self.read_manifest()
+        evicted = self._evict(manifest, max_bytes, manifest["run"] + 1)
+        orphans = 0
+        objects = self.directory / "objects"
+        if objects.is_dir():
+            for path in objects.glob("*/*"):
+                if path.relative_to(objects).as_posix() not in manifest["entries"]:
+                    path.unlink()
+                    orphans += 1
+        if manifest["entries"] or (self.directory / MANIFEST_NAME).exists():
+            self._write_manifest(manifest)
+        return evicted, orphans
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self._used.clear()
+        self._refs.clear()
+
+
+BUILD_CACHE = BuildCache(ROOT / CACHE_DIR)
+
+
+def add_cache_arguments(parser) -> None:
+    """Add --no-cache to an argparse parser (see `apply_cache_arguments`)."""
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Neither read nor write the build cache in {CACHE_DIR}/",
+    )
+
+
+def apply_cache_arguments(args) -> None:
+    if args.no_cache:
+        BUILD_CACHE.enabled = False
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def _format_size(size: int) -> str:
+    return f"{size / 1024:.1f} KiB" if size < 1024 * 1024 else f"{size / 1024 / 1024:.1f} MiB"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Inspect, prune or clear the shared build cache.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument("--prune", action="store_true", help="Evict LRU entries, drop orphans")
+    action.add_argument("--clear", action="store_true", help="Delete the whole cache")
+    parser.add_argument(
+        "--max-mb",
+        type=float,
+        default=MAX_BYTES / 1024 / 1024,
+        help="Size budget for --prune in MiB (default: %(default).0f)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the statistics as JSON")
+    args = parser.parse_args()
+
+    if args.clear:
+        BUILD_CACHE.clear()
+        for rel in LEGACY_PATHS:
+            (ROOT / rel).unlink(missing_ok=True)
+        print(f"✓  Cleared {CACHE_DIR}/.")
+        return
+    if args.prune:
+        evicted, orphans = BUILD_CACHE.prune(int(args.max_mb * 1024 * 1024))
+        if not args.json:
+            print(f"✓  Evicted {evicted} entry(ies), removed {orphans} orphaned object(s).")
+
+    manifest = BUILD_CACHE.read_manifest()
+    namespaces: dict[str, list[int]] = {}
+    for entry, (size, _) in manifest["entries"].items():
+        stats = namespaces.setdefault(entry.split("/", 1)[0], [0, 0])
+        stats[0] += 1
+        stats[1] += size
+    total = sum(size for _, size in namespaces.values())
+    if args.json:
+        json.dump(
+            {
+                "directory": CACHE_DIR,
+                "runs": manifest["run"],
+                "bytes": total,
+                "max_bytes": MAX_BYTES,
+                "namespaces": {
+                    name: {"entries": count, "bytes": size}
+                    for name, (count, size) in sorted(namespaces.items())
+                },
+                "refs": manifest["refs"],
+            },
+            sys.stdout,
+            indent=2,
+        )
+        sys.stdout.write("\n")
+        return
+    print(
+        f"{CACHE_DIR}/: {sum(c for c, _ in namespaces.values())} entries, "
+        f"{_format_size(total)} of {_format_size(MAX_BYTES)}, {manifest['run']} run(s)."
+    )
+    width = max((len(name) for name in namespaces), default=0)
+    for name, (count, size) in sorted(namespaces.items()):
+        print(f"  {name:<{width}}  {count:>6}  {_format_size(size):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""Command table for `python -m scripts` (see scripts/__main__.py)."""
+
+# command -> (module, one-line summary).  Kept as plain data so that
+# `--list` and `--help` import nothing.
+COMMANDS: dict[str, tuple[str, str]] = {
+    "llms": ("generate_llms_txt", "Generate or check llms.txt"),
+    "sitemap": ("generate_sitemap", "Generate or check sitemap.xml"),
+    "validate-openapi": ("validate_openapi_refs", "Check openapi: frontmatter references"),
+    "validate-examples": ("validate_examples", "Check request examples against the specs"),
+    "scaffold-endpoints": ("scaffold_endpoint_pages", "Create missing endpoint pages"),
+    "snippets": ("snippet_graph", "Snippet import graph, affected and unused snippets"),
+    "backlinks": ("backlinks", "Show which pages and specs link to a URL"),
+    "search": ("search_index", "Build or query the offline search index"),
+    "serve": ("preview_server", "Local preview server for artifacts and redirects"),
+    "oas-deref": ("oas_deref", "Dereference or bundle an OpenAPI spec"),
+    "oas-markdown": ("oas_markdown", "Render the OpenAPI specs as per-operation Markdown"),
+    "oas-diff": ("diff_oas", "Structural diff between two OpenAPI specs"),
+    "oas-convert": ("convert_oas_json", "Convert OpenAPI JSON to the YAML snapshot"),
+    "replay-log": ("replay_access_log", "Replay access logs against the redirects"),
+    "redirects-validate": ("validate_redirects", "Validate redirect-map.json"),
+    "redirects-export": ("export_redirects", "Export redirects for hosting platforms"),
+    "redirects-verify": ("verify_redirect_exports", "Verify exported redirect files"),
+    "redirects-from-git": ("redirects_from_git", "Redirects for pages renamed or deleted in git"),
+    "redirects-snapshot": ("redirect_snapshot", "Compile the redirect map snapshot"),
+    "restructure": ("restructure_plan", "Move pages with links, docs.json and redirects"),
+    "update-links": ("update_links", "Rewrite internal links after a restructure"),
+    "build-cache": ("build_cache", "Inspect, prune or clear the shared build cache"),
+    "bench-startup": ("bench_startup", "Measure script import and startup time"),
+}
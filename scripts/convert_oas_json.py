@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Convert an OpenAPI JSON document to the committed YAML snapshot.
+
+Used by `.github/workflows/mirror-fastapi-oas.yml` to sync
+`web-search-api/api-reference/fastapi-openapi.yml` from the live
+`openapi.json`.  The conversion is deterministic and cheap:
+
+- The specs are compared first by the SHA-256 of their canonical JSON form
+  (sorted keys, compact separators), so an unchanged upstream spec exits
+  before anything is written, regardless of YAML formatting.
+- YAML is emitted with the libyaml `CSafeDumper` when available (several
+  times faster than the pure-Python emitter, identical output) with pinned
+  quoting, indentation and line width, so the snapshot only changes when the
+  spec does.  Key order is kept as served by upstream.
+- The output file is replaced atomically.
+
+Works offline on any saved JSON file, so the conversion can be checked
+against a fixture without network access.
+
+Usage:
+    python scripts/convert_oas_json.py openapi.json
+    python scripts/convert_oas_json.py openapi.json --output path/to/spec.yml
+    python scripts/convert_oas_json.py openapi.json --check   # exit 1 if file would change
+
+When run under GitHub Actions, `changed=true|false` is appended to
+$GITHUB_OUTPUT.
+
+Requirements:
+    pip install pyyaml
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+from atomic_write import write_atomic
+
+try:
+    import yaml
+except ImportError:
+    print("Error: pyyaml is required.  Run: pip install pyyaml", file=sys.stderr)
+    sys.exit(1)
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+OUTPUT_PATH = "web-search-api/api-reference/fastapi-openapi.yml"
+
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Pinned emitter settings.  These match the historical `yaml.dump(...,
+# allow_unicode=True, default_flow_style=False, sort_keys=False)` output so
+# switching emitters does not rewrite the committed file.
+DUMP_OPTIONS = {
+    "allow_unicode": True,
+    "default_flow_style": False,
+    "sort_keys": False,
+    "indent": 2,
+    "width": 80,
+    "line_break": "\n",
+}
+
+# ---------------------------------------------------------------------------
+# Conversion
+# ---------------------------------------------------------------------------
+
+
+def canonical_hash(data) -> str:
+    """Return the SHA-256 of the canonical JSON form of `data`."""
+    canonical = json.dumps(
+        data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def to_yaml(data) -> str:
+    """Render `data` as canonical snapshot YAML."""
+    return yaml.dump(data, Dumper=_Dumper, **DUMP_OPTIONS)
+
+
+def existing_hash(path: Path) -> str | None:
+    """Return the canonical hash of an existing YAML snapshot, or None."""
+    if not path.exists():
+        return None
+    with path.open(encoding="utf-8") as fh:
+        return canonical_hash(yaml.load(fh, Loader=_Loader))
+
+
+def _set_github_output(changed: bool) -> None:
+    github_output = os.environ.get("GITHUB_OUTPUT")
+    if github_output:
+        with open(github_output, "a", encoding="utf-8") as fh:
+            fh.write(f"changed={'true' if changed else 'false'}\n")
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert an OpenAPI JSON document to the committed YAML snapshot.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("input", metavar="JSON", help="OpenAPI JSON file to convert")
+    parser.add_argument(
+        "--output",
+        default=OUTPUT_PATH,
+        metavar="FILE",
+        help=f"YAML snapshot path, relative to the repo root (default: {OUTPUT_PATH})",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Do not write; exit 1 if the snapshot would change",
+    )
+    args = parser.parse_args()
+
+    root = Path(__file__).resolve().parent.parent
+    output_path = root / args.output
+
+    try:
+        data = json.loads(Path(args.input).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        print(f"Error: {args.input} not found", file=sys.stderr)
+        sys.exit(1)
+    except json.JSONDecodeError as exc:
+        print(f"Error: {args.input} is not valid JSON: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    new_hash = canonical_hash(data)
+    if new_hash == existing_hash(output_path):
+        _set_github_output(False)
+        print(f"✓  {args.output} is up to date (sha256 {new_hash[:12]}).")
+        return
+
+    _set_github_output(True)
+    if args.check:
+        print(f"✗  {args.output} is out of date (new sha256 {new_hash[:12]}).", file=sys.stderr)
+        sys.exit(1)
+
+    write_atomic(output_path, to_yaml(data))
+    print(f"✓  Updated {args.output} (sha256 {new_hash[:12]}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""Structural diff between two OpenAPI specs.
+
+Built for the CatchAll docs update flow: compares the mirrored FastAPI spec
+(`web-search-api/api-reference/fastapi-openapi.yml`) against the curated docs
+spec (`web-search-api/api-reference/catch-all-api.yml`) and produces a
+deterministic changeset instead of a textual diff.
+
+Both specs are loaded with the libyaml loader, fully dereferenced with
+`oas_deref.Resolver`, and canonicalised into flat field signatures, so
+reordered keys and moved `$ref` targets do not show up as changes.  The diff
+reports:
+
+- added and removed endpoints
+- added, removed and changed parameters
+- request and response schema fields that were added, removed or changed
+  (type, required, enum, format, default, ...)
+- description-only changes, kept separate from contract changes
+
+Output is JSON for tooling and Markdown for PR bodies.
+
+Usage:
+    python scripts/diff_oas.py
+    python scripts/diff_oas.py OLD.yml NEW.yml --json diff.json --markdown diff.md
+
+Requirements:
+    pip install pyyaml
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from build_cache import add_cache_arguments, apply_cache_arguments
+from oas_deref import HTTP_METHODS, Resolver, load_spec
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+# Defaults mirror the update-docs.yml workflow inputs.
+OLD_SPEC_PATH = "web-search-api/api-reference/catch-all-api.yml"
+NEW_SPEC_PATH = "web-search-api/api-reference/fastapi-openapi.yml"
+
+# Schema keywords compared as part of a field's contract.
+CONTRACT_KEYS = (
+    "type",
+    "format",
+    "enum",
+    "const",
+    "default",
+    "nullable",
+    "minimum",
+    "maximum",
+    "minLength",
+    "maxLength",
+    "minItems",
+    "maxItems",
+    "pattern",
+    "deprecated",
+)
+
+# Schema/operation keywords that only affect prose.
+DESCRIPTION_KEYS = ("description", "summary", "title")
+
+# Guard against pathological nesting in flattened schemas.
+MAX_DEPTH = 12
+
+# ---------------------------------------------------------------------------
+# Canonicalisation
+# ---------------------------------------------------------------------------
+
+
+def _canonical(value):
+    """Return a JSON-stable form of a schema value for comparison."""
+    return json.loads(json.dumps(value, sort_keys=True, default=str))
+
+
+def _merge_all_of(schema: dict) -> dict:
+    """Fold `allOf` members into one schema (properties and required merged)."""
+    if "allOf" not in schema:
+        return schema
+    merged = {k: v for k, v in schema.items() if k != "allOf"}
+    properties = dict(merged.get("properties") or {})
+    required = list(merged.get("required") or [])
+    for part in schema["allOf"]:
+        if not isinstance(part, dict):
+            continue
+        part = _merge_all_of(part)
+        properties.update(part.get("properties") or {})
+        required.extend(part.get("required") or [])
+        for key, value in part.items():
+            if key not in ("properties", "required"):
+                merged.setdefault(key, value)
+    if properties:
+        merged["properties"] = properties
+    if required:
+        merged["required"] = sorted(set(required))
+    return merged
+
+
+def _signature(schema: dict, required: bool) -> dict:
+    """Return the contract and prose of a single schema node."""
+    contract = {"required": required}
+    variants = schema.get("anyOf") or schema.get("oneOf")
+    if variants:
+        types = []
+        for variant in variants:
+            if not isinstance(variant, dict):
+                continue
+            if variant.get("type") == "null":
+                contract["nullable"] = True
+            elif "$ref" in variant:
+                types.append(variant["$ref"].rsplit("/", 1)[-1])
+            else:
+                types.append(variant.get("type") or "object")
+        if types:
+            contract["type"] = "|".join(sorted(set(map(str, types))))
+    if "$ref" in schema:
+        # Circular reference left in place by the resolver
+        contract["type"] = "$ref:" + schema["$ref"].rsplit("/", 1)[-1]
+    for key in CONTRACT_KEYS:
+        if key in schema:
+            value = schema[key]
+            contract[key] = sorted(map(str, value)) if key == "enum" else _canonical(value)
+    # `type: [string, "null"]` (3.1), `nullable: true` (3.0) and
+    # `anyOf: [{type: string}, {type: "null"}]` all describe the same field
+    if isinstance(contract.get("type"), list):
+        types = [str(t) for t in contract["type"]]
+        if "null" in types:
+            contract["nullable"] = True
+        contract["type"] = "|".join(sorted(t for t in types if t != "null"))
+    if contract.get("nullable") is False:
+        del contract["nullable"]
+    prose = {key: schema[key] for key in DESCRIPTION_KEYS if key in schema}
+    return {"contract": contract, "prose": prose}
+
+
+def flatten_schema(schema, prefix: str = "", required: bool = False, depth: int = 0) -> dict:
+    """
+    Flatten a resolved schema into {field path: signature}.
+
+    Object properties become dotted paths, array items get a `[]` suffix, and
+    the members of `anyOf`/`oneOf` are walked with a `<n>` suffix.
+    """
+    fields: dict = {}
+    if not isinstance(schema, dict) or depth > MAX_DEPTH:
+        return fields
+    schema = _merge_all_of(schema)
+    fields[prefix or "(root)"] = _signature(schema, required)
+
+    required_names = set(schema.get("required") or [])
+    for name, child in (schema.get("properties") or {}).items():
+        path = f"{prefix}.{name}" if prefix else name
+        fields.update(flatten_schema(child, path, name in required_names, depth + 1))
+
+    if isinstance(schema.get("items"), dict):
+        fields.update(flatten_schema(schema["items"], f"{prefix}[]", False, depth + 1))
+
+    for key in ("anyOf", "oneOf"):
+        members = [m for m in schema.get(key) or [] if isinstance(m, dict)]
+        object_members = [m for m in members if m.get("properties") or m.get("items")]
+        for n, member in enumerate(object_members):
+            fields.update(flatten_schema(member, f"{prefix}<{n}>", False, depth + 1))
+    return fields
+
+
+def canonicalize(spec: dict) -> dict:
+    """Return {"METHOD path": canonical operation} for every operation."""
+    resolver = Resolver(spec)
+    operations = {}
+    for path, item in (spec.get("paths") or {}).items():
+        if not isinstance(item, dict):
+            continue
+        shared_params = resolver.resolve(item.get("parameters") or [])
+        for method in HTTP_METHODS:
+            if method not in item:
+                continue
+            op = resolver.resolve(item[method])
+            parameters = {}
+            for param in shared_params + (op.get("parameters") or []):
+                if not isinstance(param, dict) or "name" not in param:
+                    continue
+                key = f"{param.get('in', 'query')}:{param['name']}"
+                parameters[key] = flatten_schema(
+                    param.get("schema") or {}, "", bool(param.get("required"))
+                )
+                root = parameters[key].setdefault("(root)", {"contract": {}, "prose": {}})
+                if "description" in param:
+                    root["prose"] = {**root["prose"], "description": param["description"]}
+                root["contract"] = {**root["contract"], "required": bool(param.get("required"))}
+
+            body = {}
+            request_body = op.get("requestBody") or {}
+            for media_type, media in (request_body.get("content") or {}).items():
+                body[media_type] = flatten_schema(
+                    (media or {}).get("schema") or {}, "", bool(request_body.get("required"))
+                )
+
+            responses = {}
+            for status, response in (op.get("responses") or {}).items():
+                content = (response or {}).get("content") or {}
+                if not content:
+                    responses[str(status)] = {}
+                for media_type, media in content.items():
+                    responses[f"{status} {media_type}"] = flatten_schema(
+                        (media or {}).get("schema") or {}
+                    )
+
+            operations[f"{method.upper()} {path}"] = {
+                "meta": {
+                    "contract": {
+                        "operationId": op.get("operationId"),
+                        "tags": sorted(op.get("tags") or []),
+                        "deprecated": bool(op.get("deprecated")),
+                    },
+                    "prose": {k: op[k] for k in ("summary", "description") if k in op},
+                },
+                "parameters": parameters,
+                "requestBody": body,
+                "responses": responses,
+            }
+    return operations
+
+
+# ---------------------------------------------------------------------------
+# Diffing
+# ---------------------------------------------------------------------------
+
+
+def _diff_signature(before: dict, after: dict) -> tuple[dict, dict]:
+    """Return (contract changes, prose changes) as {key: [before, after]}."""
+    contract = {}
+    for key in sorted(set(before["contract"]) | set(after["contract"])):
+        old, new = before["contract"].get(key), after["contract"].get(key)
+        if old != new:
+            contract[key] = [old, new]
+    prose = {}
+    for key in sorted(set(before["prose"]) | set(after["prose"])):
+        old, new = before["prose"].get(key), after["prose"].get(key)
+        if old != new:
+            prose[key] = [old, new]
+    return contract, prose
+
+
+def _diff_fields(endpoint: str, section: str, old: dict, new: dict, changes: list) -> None:
+    for name in sorted(set(old) | set(new)):
+        location = f"{section} {name}".strip()
+        if name not in new:
+            changes.append({"kind": "field_removed", "endpoint": endpoint, "location": location})
+            continue
+        if name not in old:
+            changes.append(
+                {
+                    "kind": "field_added",
+                    "endpoint": endpoint,
+                    "location": location,
+                    "after": new[name]["contract"],
+                }
+            )
+            continue
+        contract, prose = _diff_signature(old[name], new[name])
+        if contract:
+            changes.append(
+                {
+                    "kind": "field_changed",
+                    "endpoint": endpoint,
+                    "location": location,
+                    "changes": contract,
+                }
+            )
+        if prose:
+            changes.append(
+                {
+                    "kind": "description_changed",
+                    "endpoint": endpoint,
+                    "location": location,
+                    "changes": prose,
+                }
+            )
+
+
+def diff_specs(old_spec: dict, new_spec: dict) -> dict:
+    """Return the structural diff of two loaded specs."""
+    old_ops = canonicalize(old_spec)
+    new_ops = canonicalize(new_spec)
+
+    added = sorted(set(new_ops) - set(old_ops))
+    removed = sorted(set(old_ops) - set(new_ops))
+    changes: list = []
+
+    for endpoint in sorted(set(old_ops) & set(new_ops)):
+        old, new = old_ops[endpoint], new_ops[endpoint]
+        _diff_fields(endpoint, "operation", {"": old["meta"]}, {"": new["meta"]}, changes)
+
+        for key in sorted(set(old["parameters"]) | set(new["parameters"])):
+            if key not in new["parameters"]:
+                changes.append(
+                    {"kind": "parameter_removed", "endpoint": endpoint, "location": key}
+                )
+            elif key not in old["parameters"]:
+                changes.append(
+                    {
+                        "kind": "parameter_added",
+                        "endpoint": endpoint,
+                        "location": key,
+                        "after": new["parameters"][key].get("(root)", {}).get("contract"),
+                    }
+                )
+            else:
+                _diff_fields(
+                    endpoint,
+                    f"parameter {key}",
+                    old["parameters"][key],
+                    new["parameters"][key],
+                    changes,
+                )
+
+        for section in ("requestBody", "responses"):
+            for key in sorted(set(old[section]) | set(new[section])):
+                label = f"{section} {key}"
+                if key not in new[section]:
+                    changes.append(
+                        {"kind": "field_removed", "endpoint": endpoint, "location": label}
+                    )
+                elif key not in old[section]:
+                    changes.append(
+                        {"kind": "field_added", "endpoint": endpoint, "location": label}
+                    )
+                else:
+                    _diff_fields(endpoint, label, old[section][key], new[section][key], changes)
+
+    # "(root)" reads badly in reports; the section label already names it
+    for change in changes:
+        change["location"] = change["location"].replace(" (root)", "")
+
+    kinds: dict[str, int] = {}
+    for change in changes:
+        kinds[change["kind"]] = kinds.get(change["kind"], 0) + 1
+
+    old_version = (old_spec.get("info") or {}).get("version")
+    new_version = (new_spec.get("info") or {}).get("version")
+    return {
+        "version": {"old": old_version, "new": new_version},
+        "summary": {
+            "endpoints_added": len(added),
+            "endpoints_removed": len(removed),
+            "endpoints_changed": len({c["endpoint"] for c in changes}),
+            **kinds,
+        },
+        "endpoints": {"added": added, "removed": removed},
+        "changes": changes,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+
+def _short(value, limit: int = 80) -> str:
+    text = json.dumps(value, ensure_ascii=False, default=str)
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def render_markdown(diff: dict, old_label: str, new_label: str) -> str:
+    """Render the diff as a Markdown changeset for PR bodies."""
+    lines = [f"## OpenAPI changes: `{old_label}` → `{new_label}`", ""]
+    version = diff["version"]
+    if version["old"] != version["new"]:
+        lines += [f"Version: `{version['old']}` → `{version['new']}`", ""]
+
+    summary = diff["summary"]
+    lines += [
+        f"- Endpoints added: {summary['endpoints_added']}",
+        f"- Endpoints removed: {summary['endpoints_removed']}",
+        f"- Endpoints changed: {summary['endpoints_changed']}",
+        "",
+    ]
+
+    for title, key in (("Added endpoints", "added"), ("Removed endpoints", "removed")):
+        if diff["endpoints"][key]:
+            lines += [f"### {title}", ""]
+            lines += [f"- `{endpoint}`" for endpoint in diff["endpoints"][key]]
+            lines.append("")
+
+    contract = [c for c in diff["changes"] if c["kind"] != "description_changed"]
+    prose = [c for c in diff["changes"] if c["kind"] == "description_changed"]
+
+    if contract:
+        lines += ["### Contract changes", ""]
+        current = None
+        for change in contract:
+            if change["endpoint"] != current:
+                current = change["endpoint"]
+                lines += ["", f"#### `{current}`", ""]
+            kind = change["kind"].replace("_", " ")
+            detail = ""
+            if "changes" in change:
+                detail = "; ".join(
+                    f"{key}: {_short(old, 40)} → {_short(new, 40)}"
+                    for key, (old, new) in change["changes"].items()
+                )
+            elif change.get("after"):
+                detail = _short(change["after"])
+            lines.append(f"- {kind}: `{change['location']}`" + (f" — {detail}" if detail else ""))
+        lines.append("")
+
+    if prose:
+        lines += [
+            "<details>",
+            f"<summary>Description-only changes ({len(prose)})</summary>",
+            "",
+        ]
+        for change in prose:
+            keys = ", ".join(change["changes"])
+            lines.append(f"- `{change['endpoint']}` `{change['location']}`: {keys}")
+        lines += ["", "</details>", ""]
+
+    if not diff["endpoints"]["added"] and not diff["endpoints"]["removed"] and not diff["changes"]:
+        lines += ["No structural changes.", ""]
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Structural diff between two OpenAPI specs.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("old", nargs="?", default=OLD_SPEC_PATH, help=f"Old spec (default: {OLD_SPEC_PATH})")
+    parser.add_argument("new", nargs="?", default=NEW_SPEC_PATH, help=f"New spec (default: {NEW_SPEC_PATH})")
+    parser.add_argument("--json", metavar="FILE", help="Write the diff as JSON")
+    parser.add_argument("--markdown", metavar="FILE", help="Write the diff as Markdown")
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+    apply_cache_arguments(args)
+
+    root = Path(__file__).resolve().parent.parent
+    paths = []
+    for arg in (args.old, args.new):
+        path = Path(arg) if Path(arg).is_absolute() else root / arg
+        if not path.exists():
+            print(f"Error: spec not found: {arg}", file=sys.stderr)
+            sys.exit(1)
+        paths.append(path)
+
+    diff = diff_specs(load_spec(paths[0]), load_spec(paths[1]))
+    diff["old"], diff["new"] = args.old, args.new
+    markdown = render_markdown(diff, args.old, args.new)
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps(diff, indent=2, ensure_ascii=False, default=str) + "\n", encoding="utf-8"
+        )
+        print(f"✓  Wrote {args.json}")
+    if args.markdown:
+        Path(args.markdown).write_text(markdown, encoding="utf-8")
+        print(f"✓  Wrote {args.markdown}")
+    if not args.json and not args.markdown:
+        print(markdown)
+
+
+if __name__ == "__main__":
+    main()
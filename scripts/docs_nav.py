@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Read and write docs.json without reformatting it.
+
+docs.json is formatted by Prettier (see .prettierrc), which `json.dumps`
+does not reproduce: Prettier keeps short arrays of scalars on one line when
+they fit within the print width.  Scripts that edit the navigation use
+`dump_docs_json` so their changes produce minimal diffs.
+
+Requirements:
+    Python 3.8+, stdlib only
+"""
+
+import json
+from pathlib import Path
+
+from atomic_write import write_atomic
+from generate_sitemap import iter_leaves
+
+DOCS_JSON_PATH = "docs.json"
+
+# Matches "printWidth" in .prettierrc.
+PRINT_WIDTH = 80
+INDENT = "  "
+
+
+def load_docs_json(root: Path) -> dict:
+    return json.loads((root / DOCS_JSON_PATH).read_text(encoding="utf-8"))
+
+
+def _scalar(value) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _format(value, level: int, prefix_len: int, trailing: int) -> str:
+    """Format `value` starting at column `prefix_len` in Prettier's JSON style."""
+    pad = INDENT * (level + 1)
+    if isinstance(value, dict):
+        if not value:
+            return "{}"
+        items = list(value.items())
+        lines = []
+        for i, (key, item) in enumerate(items):
+            comma = "," if i < len(items) - 1 else ""
+            head = f"{pad}{_scalar(key)}: "
+            lines.append(head + _format(item, level + 1, len(head), len(comma)) + comma)
+        return "{\n" + "\n".join(lines) + "\n" + INDENT * level + "}"
+    if isinstance(value, list):
+        if not value:
+            return "[]"
+        if all(not isinstance(v, (dict, list)) for v in value):
+            inline = "[" + ", ".join(_scalar(v) for v in value) + "]"
+            if prefix_len + len(inline) + trailing <= PRINT_WIDTH:
+                return inline
+        lines = []
+        for i, item in enumerate(value):
+            comma = "," if i < len(value) - 1 else ""
+            lines.append(pad + _format(item, level + 1, len(pad), len(comma)) + comma)
+        return "[\n" + "\n".join(lines) + "\n" + INDENT * level + "]"
+    return _scalar(value)
+
+
+def dump_docs_json(data: dict) -> str:
+    """Serialise docs.json the way Prettier formats it."""
+    return _format(data, 0, 0, 0) + "\n"
+
+
+def write_docs_json(root: Path, data: dict) -> None:
+    """Atomically replace docs.json with `data`."""
+    write_atomic(root / DOCS_JSON_PATH, dump_docs_json(data))
+
+
+def find_tab_for_prefix(docs_json: dict, prefix: str) -> dict | None:
+    """Return the navigation tab whose pages live under `prefix/`."""
+    for tab in docs_json.get("navigation", {}).get("tabs", []):
+        if any(page.startswith(prefix + "/") for page in iter_leaves(tab)):
+            return tab
+    return None
@@ -16,6 +16,7 @@ Usage:
     python export_redirects.py redirect-map.json --format nginx
     python export_redirects.py redirect-map.json --format apache
     python export_redirects.py redirect-map.json --format all
+    python export_redirects.py redirect-map.json --format all --verify
 
 Author: Documentation Team
 """
@@ -23,11 +24,13 @@ Author: Documentation Team
 import json
 import sys
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterable
+
+from redirect_snapshot import load_redirect_table
 
 
 def export_mintlify(
-    redirects: List[Dict],
+    redirects: Iterable[Dict],
     output_file: str = "exported-redirects/mintlify-redirects.json",
 ):
     """Export to Mintlify redirects.json format."""
@@ -50,7 +53,7 @@ def export_mintlify(
 
 
 def export_cloudflare(
-    redirects: List[Dict], output_file: str = "exported-redirects/cloudflare-rules.txt"
+    redirects: Iterable[Dict], output_file: str = "exported-redirects/cloudflare-rules.txt"
 ):
     """Export to Cloudflare Page Rules format."""
 
@@ -78,7 +81,7 @@ def export_cloudflare(
 
 
 def export_nginx(
-    redirects: List[Dict], output_file: str = "exported-redirects/nginx-redirects.conf"
+    redirects: Iterable[Dict], output_file: str = "exported-redirects/nginx-redirects.conf"
 ):
     """Export to Nginx configuration format."""
 
@@ -111,7 +114,7 @@ def export_nginx(
 
 
 def export_apache(
-    redirects: List[Dict],
+    redirects: Iterable[Dict],
     output_file: str = "exported-redirects/apache-redirects.htaccess",
 ):
     """Export to Apache .htaccess format."""
@@ -155,7 +158,7 @@ def export_apache(
 
 
 def export_vercel(
-    redirects: List[Dict], output_file: str = "exported-redirects/vercel-redirects.json"
+    redirects: Iterable[Dict], output_file: str = "exported-redirects/vercel-redirects.json"
 ):
     """Export to Vercel vercel.json format."""
 
@@ -180,7 +183,7 @@ def export_vercel(
 
 
 def export_netlify(
-    redirects: List[Dict], output_file: str = "exported-redirects/_redirects"
+    redirects: Iterable[Dict], output_file: str = "exported-redirects/_redirects"
 ):
     """Export to Netlify _redirects format."""
 
@@ -214,7 +217,7 @@ def main():
 
     if len(sys.argv) < 2:
         print(
-            "Usage: python export_redirects.py redirect-map.json --format [mintlify|cloudflare|nginx|apache|vercel|netlify|all]"
+            "Usage: python export_redirects.py redirect-map.json --format [mintlify|cloudflare|nginx|apache|vercel|netlify|all] [--verify]"
         )
         sys.exit(1)
 
@@ -234,16 +237,17 @@ def main():
         print(f"Error: File not found: {json_file}")
         sys.exit(1)
 
-    # Load JSON
+    # Read rules through the compiled snapshot (rebuilt when the JSON
+    # changes); each exporter streams them from the mapped file.
     try:
-        with open(json_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        redirects = load_redirect_table(json_file)
     except json.JSONDecodeError as e:
         print(f"Error: Invalid JSON in {json_file}")
         print(f"  {e}")
         sys.exit(1)
-
-    redirects = data.get("redirects", [])
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
 
     if not redirects:
         print("Error: No redirects found in JSON file")
@@ -286,6 +290,16 @@ def main():
     print("Export Complete")
     print("=" * 70)
 
+    # Parse the artifacts back and check them against the source map
+    if "--verify" in sys.argv:
+        from verify_redirect_exports import print_results, verify_exports
+
+        print()
+        exported = list(formats) if export_format == "all" else [export_format]
+        results = verify_exports(redirects, Path("exported-redirects"), exported)
+        if not print_results(results):
+            sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
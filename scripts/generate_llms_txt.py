@@ -9,22 +9,40 @@ The output is deterministic: identical inputs always produce identical output.
 Usage:
     python scripts/generate_llms_txt.py
     python scripts/generate_llms_txt.py --output path/to/llms.txt
-    python scripts/generate_llms_txt.py --check   # exit 1 if file would change
+    python scripts/generate_llms_txt.py --check   # exit 1 (with a diff) if file would change
+    python scripts/generate_llms_txt.py --watch   # regenerate on every change
+    python scripts/generate_llms_txt.py --shards  # also <tab>/llms.txt per product
+    python scripts/generate_llms_txt.py --catalog # also docs-index.jsonl
+    python scripts/generate_llms_txt.py --check --no-cache
+
+Every output file must fit the MAX_BYTES / MAX_TOKENS budgets (override with
+--max-bytes / --max-tokens); generation fails when one does not.
+
+With --catalog, the same pass streams a JSON Lines catalog with one record
+per navigation page (path, URL, tab and group, title, description, OAS
+operation, SHA-256, size and internal links), so other tools can load one
+file instead of re-parsing the repo.
+
+Parsed frontmatter and specs are reused from the shared build cache
+(build_cache.py), keyed by their content; --no-cache parses everything again
+and produces the same output.
 
 Requirements:
     pip install pyyaml
 """
 
 import argparse
+import hashlib
 import json
 import sys
+import time
 from pathlib import Path
 
-try:
-    import yaml
-except ImportError:
-    print("Error: pyyaml is required.  Run: pip install pyyaml", file=sys.stderr)
-    sys.exit(1)
+import patterns
+from atomic_write import open_atomic, write_atomic
+from build_cache import BUILD_CACHE, add_cache_arguments, apply_cache_arguments
+from output_check import compare_chunks
+from profiling import PROFILER, add_profile_arguments, profile_session
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -32,8 +50,13 @@ except ImportError:
 
 BASE_URL = "https://www.newscatcherapi.com/docs"
 GITHUB_BASE = "https://github.com/NewscatcherAPI/docs/blob/main"
+GITHUB_RAW_BASE = "https://raw.githubusercontent.com/NewscatcherAPI/docs/main"
+# Per-operation Markdown rendered from the specs by oas_markdown.py.  It is
+# committed and linked raw, so its relative links resolve for agents too.
+API_MARKDOWN_DIR = "exported-api-markdown"
 DOCS_JSON_PATH = "docs.json"
 OUTPUT_PATH = "llms.txt"
+CATALOG_PATH = "docs-index.jsonl"
 
 # Active OAS specs only. Maps the frontmatter identifier (e.g. the first token
 # of `openapi: catch-all-api post /catchAll/initialize`) to the repo-relative
@@ -55,34 +78,101 @@ BLOCKQUOTE = (
     "detection and filtering."
 )
 
+# Blockquotes of the per-tab shards (--shards), keyed by docs.json tab name.
+TAB_BLOCKQUOTES: dict[str, str] = {
+    "Web Search API": (
+        "CatchAll (Web Search API): recall-first structured event extraction "
+        "from 50,000+ web pages per job."
+    ),
+    "News API": (
+        "News API: 120,000+ source news search with NLP enrichment, "
+        "clustering, and deduplication."
+    ),
+    "Local News API": (
+        "Local News API: hyper-local news with intelligent geographic "
+        "detection and filtering."
+    ),
+}
+
+# Per-file size budgets, applied to llms.txt and every shard.  Agents load
+# these files whole, so their size is their context cost.
+MAX_BYTES = 48_000
+MAX_TOKENS = 12_000
+
 # ---------------------------------------------------------------------------
-# Frontmatter parsing
+# YAML (imported on first use)
 # ---------------------------------------------------------------------------
 
-import re
+_yaml = None
+_yaml_loader = None
+
+# Build cache versions of parsed frontmatter and parsed specs (the "oas-spec"
+# namespace is shared with oas_deref.load_spec).  Bump when parsing changes.
+FRONTMATTER_CACHE_VERSION = 1
+SPEC_CACHE_VERSION = 1
+
+
+def _load_yaml(text: str):
+    """
+    Parse YAML with the libyaml-backed safe loader when available.
+
+    PyYAML is imported on first use so that `--help` and modules that only
+    need OAS_SPECS do not pay for it.
+    """
+    global _yaml, _yaml_loader
+    if _yaml is None:
+        try:
+            import yaml
+        except ImportError:
+            print("Error: pyyaml is required.  Run: pip install pyyaml", file=sys.stderr)
+            sys.exit(1)
+        _yaml = yaml
+        _yaml_loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    PROFILER.count("yaml parses")
+    return _yaml.load(text, Loader=_yaml_loader)
+
 
-_FRONTMATTER_RE = re.compile(r"^---[ \t]*\n(.*?)\n---", re.DOTALL)
+# ---------------------------------------------------------------------------
+# Frontmatter parsing
+# ---------------------------------------------------------------------------
 
 
 def parse_frontmatter(text: str) -> dict:
     """Return the YAML frontmatter block as a dict, or {} if absent/invalid."""
-    match = _FRONTMATTER_RE.match(text)
+    match = patterns.FRONTMATTER.match(text)
     if not match:
         return {}
+    block = match.group(1)
+    return BUILD_CACHE.memo_json(
+        "frontmatter", FRONTMATTER_CACHE_VERSION, block, lambda: _parse_frontmatter_block(block)
+    )
+
+
+def _parse_frontmatter_block(block: str) -> dict:
     try:
-        result = yaml.safe_load(match.group(1))
+        result = _load_yaml(block)
         return result if isinstance(result, dict) else {}
-    except yaml.YAMLError:
+    except _yaml.YAMLError:
         return {}
 
 
+_frontmatter_cache: dict[str, dict] = {}
+
+
 def read_mdx_frontmatter(page_path: str, root: Path) -> dict:
     """Read and parse frontmatter from the .mdx (or .md) file for a page."""
+    if page_path in _frontmatter_cache:
+        PROFILER.count("frontmatter cache hits")
+        return _frontmatter_cache[page_path]
+    PROFILER.count("frontmatter cache misses")
+    fm: dict = {}
     for ext in (".mdx", ".md"):
         candidate = root / f"{page_path}{ext}"
         if candidate.exists():
-            return parse_frontmatter(candidate.read_text(encoding="utf-8"))
-    return {}
+            fm = parse_frontmatter(PROFILER.read_text(candidate))
+            break
+    _frontmatter_cache[page_path] = fm
+    return fm
 
 
 # ---------------------------------------------------------------------------
@@ -94,17 +184,26 @@ _oas_cache: dict[str, dict] = {}
 
 def _load_oas(spec_name: str, root: Path) -> dict:
     """Load and cache an OAS YAML file, keyed by spec name."""
-    if spec_name not in _oas_cache:
-        file_path = OAS_SPECS.get(spec_name)
-        if not file_path:
-            _oas_cache[spec_name] = {}
+    if spec_name in _oas_cache:
+        PROFILER.count("oas cache hits")
+        return _oas_cache[spec_name]
+    PROFILER.count("oas cache misses")
+    file_path = OAS_SPECS.get(spec_name)
+    if not file_path:
+        _oas_cache[spec_name] = {}
+    else:
+        full_path = root / file_path
+        if full_path.exists():
+            with PROFILER.phase(f"load spec {spec_name}"):
+                raw = PROFILER.read_bytes(full_path)
+                _oas_cache[spec_name] = BUILD_CACHE.memo_json(
+                    "oas-spec",
+                    SPEC_CACHE_VERSION,
+                    raw,
+                    lambda: _load_yaml(raw.decode("utf-8")) or {},
+                )
         else:
-            full_path = root / file_path
-            if full_path.exists():
-                with full_path.open(encoding="utf-8") as fh:
-                    _oas_cache[spec_name] = yaml.safe_load(fh) or {}
-            else:
-                _oas_cache[spec_name] = {}
+            _oas_cache[spec_name] = {}
     return _oas_cache[spec_name]
 
 
@@ -152,7 +251,7 @@ def get_oas_info_description(spec_name: str, root: Path) -> str | None:
         if not line or line.startswith("#"):
             continue
         # Take text up to the first full stop followed by whitespace or EOL.
-        match = re.search(r"^(.+?\.)\ ", line + " ")
+        match = patterns.FIRST_SENTENCE.search(line + " ")
         if match:
             return match.group(1)
         # No full stop — return the whole line (truncated to 200 chars).
@@ -196,6 +295,11 @@ def resolve_page(page_path: str, root: Path) -> tuple[str, str | None]:
       3. OAS operation `summary` (fallback)
       4. None (entry is emitted without a description)
     """
+    with PROFILER.phase("resolve pages"):
+        return _resolve_page(page_path, root)
+
+
+def _resolve_page(page_path: str, root: Path) -> tuple[str, str | None]:
     fm = read_mdx_frontmatter(page_path, root)
     slug = page_path.rsplit("/", 1)[-1]
 
@@ -251,6 +355,8 @@ def _render_group(
     root: Path,
     missing: list[str],
     parent_label: str = "",
+    emit=None,
+    trail: tuple[str, ...] = (),
 ) -> list[str]:
     """
     Render one navigation group as markdown lines.
@@ -265,24 +371,30 @@ def _render_group(
     Pages whose description cannot be resolved are appended to `missing` and
     emitted as bare entries so the file is still syntactically valid, but the
     caller is expected to treat any non-empty `missing` list as a hard error.
+
+    `emit(page_path, trail)` renders one entry; `trail` is the tab and group
+    names above the page, extended here with the (sub-)group names.
     """
     lines: list[str] = []
     flat = [p for p in pages if isinstance(p, str)]
     nested = [p for p in pages if isinstance(p, dict)]
     heading_prefix = parent_label or group_name
+    trail = (*trail, group_name)
 
-    def emit(page_path: str) -> str:
-        title, desc = resolve_page(page_path, root)
-        if not desc:
-            missing.append(page_path)
-            return f"- [{title}]({BASE_URL}/{page_path})"
-        return _entry(page_path, title, desc)
+    if emit is None:
+
+        def emit(page_path: str, trail: tuple[str, ...] = ()) -> str:
+            title, desc = resolve_page(page_path, root)
+            if not desc:
+                missing.append(page_path)
+                return f"- [{title}]({BASE_URL}/{page_path})"
+            return _entry(page_path, title, desc)
 
     if flat:
         lines.append(f"### {heading_prefix}")
         lines.append("")
         for page_path in flat:
-            lines.append(emit(page_path))
+            lines.append(emit(page_path, trail))
         lines.append("")
 
     for sub_group in nested:
@@ -291,7 +403,7 @@ def _render_group(
         lines.append(f"### {heading_prefix} — {sub_name}")
         lines.append("")
         for page_path in sub_pages:
-            lines.append(emit(page_path))
+            lines.append(emit(page_path, (*trail, sub_name)))
         lines.append("")
 
     # Simple group with no nesting
@@ -302,12 +414,119 @@ def _render_group(
         lines.append(f"### {group_name}")
         lines.append("")
         for page_path in iter_leaves(pages):
-            lines.append(emit(page_path))
+            lines.append(emit(page_path, trail))
         lines.append("")
 
     return lines
 
 
+# ---------------------------------------------------------------------------
+# Resident caches (--watch)
+# ---------------------------------------------------------------------------
+
+_docs_json_cache: dict[Path, dict] = {}
+
+
+def _load_docs_json(root: Path) -> dict:
+    if root not in _docs_json_cache:
+        with PROFILER.phase("load docs.json"):
+            _docs_json_cache[root] = json.loads(PROFILER.read_text(root / DOCS_JSON_PATH))
+    return _docs_json_cache[root]
+
+
+def is_input(path: Path, root: Path) -> bool:
+    """True for files that can change llms.txt: docs.json, pages and specs."""
+    rel = path.relative_to(root).as_posix()
+    return rel == DOCS_JSON_PATH or rel in OAS_SPECS.values() or path.suffix in (".mdx", ".md")
+
+
+def invalidate(paths, root: Path) -> None:
+    """Drop cached navigation, frontmatter and specs for the changed files."""
+    spec_names = {file_path: name for name, file_path in OAS_SPECS.items()}
+    for path in paths:
+        rel = path.relative_to(root).as_posix()
+        if rel == DOCS_JSON_PATH:
+            _docs_json_cache.pop(root, None)
+        elif rel in spec_names:
+            _oas_cache.pop(spec_names[rel], None)
+        else:
+            _frontmatter_cache.pop(rel.rsplit(".", 1)[0], None)
+
+
+# ---------------------------------------------------------------------------
+# Page catalog (--catalog)
+# ---------------------------------------------------------------------------
+
+
+def _page_file(page_path: str, root: Path) -> Path | None:
+    for ext in (".mdx", ".md"):
+        candidate = root / f"{page_path}{ext}"
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def catalog_record(
+    page_path: str, trail: tuple[str, ...], title: str, description: str | None, root: Path
+) -> dict:
+    """One docs-index.jsonl record: what llms.txt knows about a page, plus its file."""
+    # Imported here: only --catalog needs the link scanner.
+    from backlinks import scan_links
+
+    fm = read_mdx_frontmatter(page_path, root)
+    openapi = fm.get("openapi") or fm.get("api")
+    record = {
+        "path": page_path,
+        "url": f"{BASE_URL}/{page_path}",
+        "tab": trail[0] if trail else None,
+        "groups": list(trail[1:]),
+        "title": title,
+        "description": description,
+        "openapi": str(openapi) if openapi else None,
+        "file": None,
+        "sha256": None,
+        "bytes": 0,
+        "links": [],
+    }
+    file = _page_file(page_path, root)
+    if file is not None:
+        raw = PROFILER.read_bytes(file)
+        rel = file.relative_to(root).as_posix()
+        record["file"] = rel
+        record["sha256"] = hashlib.sha256(raw).hexdigest()
+        record["bytes"] = len(raw)
+        targets = (target for target, _, _ in scan_links(rel, raw.decode("utf-8")))
+        record["links"] = list(dict.fromkeys(targets))
+    return record
+
+
+class CatalogWriter:
+    """
+    Stream catalog records to a JSON Lines file as pages are resolved.
+
+    Records go to a temporary file that replaces the catalog when the block
+    exits cleanly, so readers never see a partial catalog.  A page listed in
+    several places in the navigation gets one record, from its first place.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.paths: set[str] = set()
+        self._target = open_atomic(path)
+        self._fh = None
+
+    def __enter__(self) -> "CatalogWriter":
+        self._fh = self._target.__enter__()
+        return self
+
+    def write(self, record: dict) -> None:
+        self.paths.add(record["path"])
+        self._fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._target.__exit__(exc_type, exc, tb)
+
+
 # ---------------------------------------------------------------------------
 # Main generator
 # ---------------------------------------------------------------------------
@@ -322,14 +541,89 @@ def generate(root: Path) -> tuple[str, list[str]]:
         no description could be resolved.  Callers should treat a non-empty
         `missing` list as a hard error.
     """
-    docs_json: dict = json.loads((root / DOCS_JSON_PATH).read_text(encoding="utf-8"))
+    outputs, missing = generate_outputs(root)
+    return outputs[OUTPUT_PATH], missing
+
+
+def generate_outputs(
+    root: Path, shards: bool = False, catalog: "CatalogWriter | None" = None
+) -> tuple[dict[str, str], list[str]]:
+    """
+    Build llms.txt and, with `shards`, one llms.txt per product tab.
+
+    Returns ({output path: content}, missing).  Output paths are relative to
+    the directory of the root file: "llms.txt", "web-search-api/llms.txt", ...
+    Each page is resolved once; a shard reuses the lines of its tab.  With a
+    `catalog`, each page's record is written to it as the page is resolved.
+    """
+    with PROFILER.phase("render"):
+        return _generate(root, shards, catalog)
+
+
+def tab_prefix(tab: dict) -> str | None:
+    """Top-level directory shared by a tab's pages (e.g. "news-api")."""
+    leaves = iter_leaves(tab.get("groups", [])) or iter_leaves(tab.get("pages", []))
+    return leaves[0].split("/", 1)[0] if leaves else None
+
+
+def _render_tab(tab: dict, root: Path, missing: list[str], emit) -> list[str]:
+    tab_name = tab.get("tab", "")
+    lines = [f"## {tab_name}", ""]
+    for group in tab.get("groups", []):
+        group_name: str = group.get("group", "")
+        group_pages: list = group.get("pages", [])
+
+        has_nested = any(isinstance(p, dict) for p in group_pages)
+
+        if has_nested:
+            lines.extend(
+                _render_group(
+                    group_name, group_pages, root, missing, emit=emit, trail=(tab_name,)
+                )
+            )
+        else:
+            # Flat group — emit H3 + list
+            lines.append(f"### {group_name}")
+            lines.append("")
+            for page_path in iter_leaves(group_pages):
+                lines.append(emit(page_path, (tab_name, group_name)))
+            lines.append("")
+    return lines
+
+
+def _render_specs(spec_names, root: Path) -> list[str]:
+    lines = ["## API Specifications", ""]
+    for spec_name in spec_names:
+        github_url = f"{GITHUB_BASE}/{OAS_SPECS[spec_name]}"
+        info_desc = get_oas_info_description(spec_name, root)
+        if info_desc:
+            lines.append(f"- [{spec_name}]({github_url}): {info_desc}")
+        else:
+            lines.append(f"- [{spec_name}]({github_url})")
+        markdown_index = f"{API_MARKDOWN_DIR}/{spec_name}/index.md"
+        if (root / markdown_index).exists():
+            lines.append(
+                f"- [{spec_name} (Markdown)]({GITHUB_RAW_BASE}/{markdown_index}): "
+                "The same spec as one small Markdown file per operation"
+            )
+    lines.append("")
+    return lines
+
+
+def _generate(
+    root: Path, shards: bool, catalog: "CatalogWriter | None"
+) -> tuple[dict[str, str], list[str]]:
+    docs_json: dict = _load_docs_json(root)
     tabs: list = docs_json["navigation"]["tabs"]
 
     lines: list[str] = []
     missing: list[str] = []
 
-    def emit(page_path: str) -> str:
+    def emit(page_path: str, trail: tuple[str, ...] = ()) -> str:
         title, desc = resolve_page(page_path, root)
+        if catalog is not None and page_path not in catalog.paths:
+            with PROFILER.phase("catalog"):
+                catalog.write(catalog_record(page_path, trail, title, desc, root))
         if not desc:
             missing.append(page_path)
             return f"- [{title}]({BASE_URL}/{page_path})"
@@ -345,48 +639,81 @@ def generate(root: Path) -> tuple[str, list[str]]:
     for tab in tabs:
         if tab.get("tab") == "Home":
             for page_path in tab.get("pages", []):
-                lines.append(emit(page_path))
+                lines.append(emit(page_path, ("Home",)))
             lines.append("")
             break
 
     # Product tabs
+    tab_sections: list[tuple[dict, list[str]]] = []
     for tab in tabs:
-        tab_name: str = tab.get("tab", "")
-        if tab_name == "Home":
+        if tab.get("tab", "") == "Home":
             continue
-
-        lines.append(f"## {tab_name}")
+        section = _render_tab(tab, root, missing, emit)
+        lines.extend(section)
+        tab_sections.append((tab, section))
+
+    outputs: dict[str, str] = {}
+    shard_links: list[str] = []
+    if shards:
+        for tab, section in tab_sections:
+            prefix = tab_prefix(tab)
+            if prefix is None:
+                continue
+            name = tab.get("tab", "")
+            shard_path = f"{prefix}/{OUTPUT_PATH}"
+            page_count = sum(line.startswith("- [") for line in section)
+            shard_links.append(
+                f"- [{name}]({BASE_URL}/{shard_path}): "
+                f"The {name} section of this file on its own ({page_count} pages)"
+            )
+            specs = [n for n, path in OAS_SPECS.items() if path.startswith(prefix + "/")]
+            shard = [
+                f"# NewsCatcher {name} Documentation",
+                "",
+                f"> {TAB_BLOCKQUOTES.get(name, BLOCKQUOTE)}",
+                "",
+                f"Part of the NewsCatcher API documentation. Index of all products: "
+                f"{BASE_URL}/{OUTPUT_PATH}",
+                "",
+                *section,
+                *(_render_specs(specs, root) if specs else []),
+            ]
+            outputs[shard_path] = "\n".join(shard)
+
+    # Per-product files, when sharded
+    if shard_links:
+        lines.append("## Product llms.txt files")
+        lines.append("")
+        lines.extend(shard_links)
         lines.append("")
 
-        for group in tab.get("groups", []):
-            group_name: str = group.get("group", "")
-            group_pages: list = group.get("pages", [])
+    # API Specifications section
+    lines.extend(_render_specs(OAS_SPECS, root))
 
-            has_nested = any(isinstance(p, dict) for p in group_pages)
+    return {OUTPUT_PATH: "\n".join(lines), **outputs}, missing
 
-            if has_nested:
-                lines.extend(_render_group(group_name, group_pages, root, missing))
-            else:
-                # Flat group — emit H3 + list
-                lines.append(f"### {group_name}")
-                lines.append("")
-                for page_path in iter_leaves(group_pages):
-                    lines.append(emit(page_path))
-                lines.append("")
 
-    # API Specifications section
-    lines.append("## API Specifications")
-    lines.append("")
-    for spec_name, spec_path in OAS_SPECS.items():
-        github_url = f"{GITHUB_BASE}/{spec_path}"
-        info_desc = get_oas_info_description(spec_name, root)
-        if info_desc:
-            lines.append(f"- [{spec_name}]({github_url}): {info_desc}")
-        else:
-            lines.append(f"- [{spec_name}]({github_url})")
-    lines.append("")
+# ---------------------------------------------------------------------------
+# Size budgets
+# ---------------------------------------------------------------------------
+
+
+def approx_tokens(text: str) -> int:
+    """Rough LLM token count: one per word run or punctuation mark."""
+    return len(patterns.TOKEN_ESTIMATE.findall(text))
+
 
-    return "\n".join(lines), missing
+def check_budgets(outputs: dict[str, str], max_bytes: int, max_tokens: int) -> list[str]:
+    """Return one message per output file over its byte or token budget."""
+    over = []
+    for path, content in outputs.items():
+        size = len(content.encode("utf-8"))
+        tokens = approx_tokens(content)
+        if size > max_bytes:
+            over.append(f"{path}: {size} bytes (budget {max_bytes})")
+        if tokens > max_tokens:
+            over.append(f"{path}: ~{tokens} tokens (budget {max_tokens})")
+    return over
 
 
 # ---------------------------------------------------------------------------
@@ -429,42 +756,197 @@ def main() -> None:
             "Exits with code 1 if the file would change or descriptions are missing."
         ),
     )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and regenerate whenever docs.json, a page or a spec changes",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="With --watch, poll for changes instead of using inotify",
+    )
+    parser.add_argument(
+        "--shards",
+        action="store_true",
+        help=(
+            "Also write one llms.txt per product tab (e.g. news-api/llms.txt) "
+            "next to the output file, linked from it"
+        ),
+    )
+    parser.add_argument(
+        "--catalog",
+        nargs="?",
+        const=CATALOG_PATH,
+        metavar="FILE",
+        help=(
+            "Also write the JSON Lines page catalog "
+            f"(default FILE: {CATALOG_PATH}, also with --check)"
+        ),
+    )
+    parser.add_argument(
+        "--max-bytes",
+        type=int,
+        default=MAX_BYTES,
+        metavar="N",
+        help=f"Fail if any output file exceeds N bytes (default: {MAX_BYTES})",
+    )
+    parser.add_argument(
+        "--max-tokens",
+        type=int,
+        default=MAX_TOKENS,
+        metavar="N",
+        help=f"Fail if any output file exceeds ~N tokens (default: {MAX_TOKENS})",
+    )
+    add_cache_arguments(parser)
+    add_profile_arguments(parser)
     args = parser.parse_args()
+    apply_cache_arguments(args)
 
     # Always run from project root regardless of invocation directory
     script_dir = Path(__file__).resolve().parent
     root = script_dir.parent if script_dir.name == "scripts" else script_dir
 
     output_path = root / args.output
-    content, missing = generate(root)
+
+    if args.watch:
+        if args.check:
+            parser.error("--watch cannot be combined with --check")
+        _watch(root, output_path, args)
+        return
+
+    with profile_session(args, "generate_llms_txt"):
+        _run(args, root, output_path)
+
+
+def _output_files(output_path: Path, outputs: dict[str, str]) -> dict[Path, str]:
+    """Map generated outputs to files: shards sit next to the root file."""
+    return {
+        output_path if rel == OUTPUT_PATH else output_path.parent / rel: content
+        for rel, content in outputs.items()
+    }
+
+
+def _display(path: Path, root: Path) -> str:
+    return path.relative_to(root).as_posix() if path.is_relative_to(root) else str(path)
+
+
+def _report_budgets(over: list[str]) -> None:
+    print("\n✗  Size budget exceeded:\n", file=sys.stderr)
+    for message in over:
+        print(f"   {message}", file=sys.stderr)
+    print(
+        "\nSplit the content (--shards) or shorten descriptions; raise "
+        "MAX_BYTES / MAX_TOKENS only deliberately.",
+        file=sys.stderr,
+    )
+
+
+def _generate_outputs(root: Path, args) -> tuple[dict[str, str], list[str]]:
+    """generate_outputs() with the CLI's --shards and --catalog options."""
+    if not args.catalog:
+        return generate_outputs(root, shards=args.shards)
+    catalog_path = root / args.catalog
+    with CatalogWriter(catalog_path) as catalog:
+        result = generate_outputs(root, shards=args.shards, catalog=catalog)
+    print(f"✓  Wrote {_display(catalog_path, root)} ({len(catalog.paths)} pages).")
+    return result
+
+
+def _run(args, root: Path, output_path: Path) -> None:
+    outputs, missing = _generate_outputs(root, args)
 
     # Hard-fail on any page lacking a description, regardless of mode
     if missing:
         _report_missing(missing)
         sys.exit(1)
 
+    over = check_budgets(outputs, args.max_bytes, args.max_tokens)
+    if over:
+        _report_budgets(over)
+        sys.exit(1)
+
+    files = _output_files(output_path, outputs)
+
     if args.check:
-        if not output_path.exists():
-            print(
-                f"✗  {args.output} does not exist.\n" "   Run: npm run llms:generate",
-                file=sys.stderr,
-            )
-            sys.exit(1)
-        existing = output_path.read_text(encoding="utf-8")
-        if existing != content:
-            print(
-                f"✗  {args.output} is out of date.\n"
-                "   Run: npm run llms:generate  and commit the result.",
-                file=sys.stderr,
-            )
+        stale = False
+        with PROFILER.phase("compare"):
+            for path, content in files.items():
+                name = _display(path, root)
+                if not path.exists():
+                    print(f"✗  {name} is missing.", file=sys.stderr)
+                    stale = True
+                    continue
+                diff = compare_chunks(path, [content])
+                if diff is not None:
+                    print(
+                        f"✗  {name} is out of date (- committed, + generated):\n",
+                        file=sys.stderr,
+                    )
+                    for line in diff:
+                        print(f"   {line}", file=sys.stderr)
+                    print(file=sys.stderr)
+                    stale = True
+        if stale:
+            print("   Run: npm run llms:generate  and commit the result.", file=sys.stderr)
             sys.exit(1)
-        page_count = content.count("\n- [")
-        print(f"✓  {args.output} is up to date ({page_count} entries).")
+        for path, content in files.items():
+            print(f"✓  {_display(path, root)} is up to date ({_describe(content)}).")
         return
 
-    output_path.write_text(content, encoding="utf-8")
-    page_count = content.count("\n- [")
-    print(f"✓  Generated {args.output} ({page_count} entries).")
+    with PROFILER.phase("write"):
+        for path, content in files.items():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+    for path, content in files.items():
+        print(f"✓  Generated {_display(path, root)} ({_describe(content)}).")
+
+
+def _describe(content: str) -> str:
+    entries = content.count("\n- [")
+    return f"{entries} entries, {len(content.encode('utf-8'))} bytes, ~{approx_tokens(content)} tokens"
+
+
+def _watch(root: Path, output_path: Path, args) -> None:
+    """Regenerate after every change, re-reading only the touched inputs."""
+    from watcher import run_watch
+
+    last: dict[Path, str] = {}
+
+    def rebuild(changed) -> None:
+        started = time.perf_counter()
+        invalidate(changed, root)
+        try:
+            outputs, missing = _generate_outputs(root, args)
+        except (ValueError, KeyError) as exc:
+            print(f"✗  {DOCS_JSON_PATH} is not usable yet: {exc}", file=sys.stderr)
+            return
+        elapsed = (time.perf_counter() - started) * 1000
+        what = f"{len(changed)} file(s)" if changed else "initial build"
+        if missing:
+            _report_missing(missing)
+            print(f"✗  {args.output} not written.", file=sys.stderr)
+            return
+        over = check_budgets(outputs, args.max_bytes, args.max_tokens)
+        if over:
+            _report_budgets(over)
+            print(f"✗  {args.output} not written.", file=sys.stderr)
+            return
+        written = []
+        for path, content in _output_files(output_path, outputs).items():
+            if path not in last and path.exists():
+                last[path] = path.read_text(encoding="utf-8")
+            if content != last.get(path):
+                write_atomic(path, content)
+                last[path] = content
+                written.append(_display(path, root))
+        if not written:
+            print(f"·  {args.output} unchanged ({what}, {elapsed:.1f} ms).")
+            return
+        print(f"✓  Regenerated {', '.join(written)} ({what}, {elapsed:.1f} ms).")
+
+    rebuild(set())
+    run_watch(root, lambda p: is_input(p, root), rebuild, args.poll)
 
 
 if __name__ == "__main__":
@@ -8,10 +8,16 @@ The output is deterministic: identical docs.json inputs always produce
 identical output. <lastmod> is intentionally omitted so the committed file
 only becomes stale when navigation actually changes, not on every new day.
 
+The XML is rendered as a stream of chunks: --check compares it line by line
+against the committed file (output_check.py), stops at the first difference
+and prints a compact unified diff of it, and writing streams to a temporary
+file, so memory stays flat however many pages there are.
+
 Usage:
     python scripts/generate_sitemap.py
     python scripts/generate_sitemap.py --output path/to/sitemap.xml
-    python scripts/generate_sitemap.py --check   # exit 1 if file would change
+    python scripts/generate_sitemap.py --check   # exit 1 (with a diff) if file would change
+    python scripts/generate_sitemap.py --watch   # regenerate when docs.json changes
 
 Requirements:
     Python 3.8+, stdlib only
@@ -20,7 +26,13 @@ Requirements:
 import argparse
 import json
 import sys
+import time
 from pathlib import Path
+from typing import Iterator
+
+from atomic_write import write_atomic, write_atomic_chunks
+from output_check import compare_chunks
+from profiling import PROFILER, add_profile_arguments, profile_session
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -67,22 +79,24 @@ def collect_pages(docs_json: dict) -> list:
 # ---------------------------------------------------------------------------
 
 
-def build_sitemap(pages: list) -> str:
-    """Build a sitemap XML string from a list of page paths.
+def iter_sitemap(pages: list) -> Iterator[str]:
+    """Yield the sitemap XML for a list of page paths in chunks (one per URL).
 
     Emits <loc> only — no <lastmod> — so the output is fully deterministic
     and the committed file stays current until navigation actually changes.
     """
-    lines = [
-        '<?xml version="1.0" encoding="UTF-8"?>',
-        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
-    ]
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    )
     for page_path in pages:
-        lines.append("    <url>")
-        lines.append(f"        <loc>{BASE_URL}/{page_path}</loc>")
-        lines.append("    </url>")
-    lines.append("</urlset>")
-    return "\n".join(lines) + "\n"
+        yield f"    <url>\n        <loc>{BASE_URL}/{page_path}</loc>\n    </url>\n"
+    yield "</urlset>\n"
+
+
+def build_sitemap(pages: list) -> str:
+    """Build the sitemap XML as one string (see `iter_sitemap`)."""
+    return "".join(iter_sitemap(pages))
 
 
 # ---------------------------------------------------------------------------
@@ -105,28 +119,52 @@ def main() -> None:
         action="store_true",
         help="Exit 1 if the committed sitemap.xml does not match generated output (CI mode)",
     )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and regenerate whenever docs.json changes",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="With --watch, poll for changes instead of using inotify",
+    )
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
     root = Path(__file__).resolve().parent.parent
 
+    if args.watch:
+        if args.check:
+            parser.error("--watch cannot be combined with --check")
+        _watch(root, args.output, args.poll)
+        return
+
+    with profile_session(args, "generate_sitemap"):
+        _run(args, root)
+
+
+def _run(args, root: Path) -> None:
     docs_json_path = root / DOCS_JSON_PATH
     if not docs_json_path.exists():
         print(f"Error: {DOCS_JSON_PATH} not found at {root}", file=sys.stderr)
         sys.exit(1)
 
     try:
-        docs_json = json.loads(docs_json_path.read_text(encoding="utf-8"))
+        with PROFILER.phase("load docs.json"):
+            docs_json = json.loads(PROFILER.read_text(docs_json_path))
     except json.JSONDecodeError as exc:
         print(f"Error: {DOCS_JSON_PATH} is not valid JSON: {exc}", file=sys.stderr)
         sys.exit(1)
 
-    pages = collect_pages(docs_json)
+    with PROFILER.phase("collect pages"):
+        pages = collect_pages(docs_json)
+    PROFILER.count("pages", len(pages))
 
     if not pages:
         print("Error: no pages found in docs.json navigation", file=sys.stderr)
         sys.exit(1)
 
-    sitemap = build_sitemap(pages)
     output_path = root / args.output
 
     if args.check:
@@ -137,23 +175,56 @@ def main() -> None:
                 file=sys.stderr,
             )
             sys.exit(1)
-        existing = output_path.read_text(encoding="utf-8")
-        if existing != sitemap:
+        with PROFILER.phase("render and compare"):
+            diff = compare_chunks(output_path, iter_sitemap(pages))
+        if diff is not None:
             print(
-                f"\n✗  {args.output} is out of date.",
+                f"\n✗  {args.output} is out of date (- committed, + generated):\n",
                 file=sys.stderr,
             )
+            for line in diff:
+                print(f"   {line}", file=sys.stderr)
             print(
-                "Run 'python scripts/generate_sitemap.py' locally and commit the updated file.",
+                "\nRun 'python scripts/generate_sitemap.py' locally and commit the updated file.",
                 file=sys.stderr,
             )
             sys.exit(1)
         print(f"✓  {args.output} is up to date.")
         return
 
-    output_path.write_text(sitemap, encoding="utf-8")
+    with PROFILER.phase("render and write"):
+        write_atomic_chunks(output_path, iter_sitemap(pages))
     print(f"✓  Generated {args.output} ({len(pages)} URLs).")
 
 
+def _watch(root: Path, output: str, polling: bool) -> None:
+    """Regenerate the sitemap whenever docs.json changes."""
+    from watcher import run_watch
+
+    docs_json_path = root / DOCS_JSON_PATH
+    output_path = root / output
+    last = output_path.read_text(encoding="utf-8") if output_path.exists() else None
+
+    def rebuild(changed) -> None:
+        nonlocal last
+        started = time.perf_counter()
+        try:
+            pages = collect_pages(json.loads(docs_json_path.read_text(encoding="utf-8")))
+        except (OSError, json.JSONDecodeError) as exc:
+            print(f"✗  {DOCS_JSON_PATH} is not usable yet: {exc}", file=sys.stderr)
+            return
+        sitemap = build_sitemap(pages)
+        elapsed = (time.perf_counter() - started) * 1000
+        if sitemap == last:
+            print(f"·  {output} unchanged ({elapsed:.1f} ms).")
+            return
+        write_atomic(output_path, sitemap)
+        last = sitemap
+        print(f"✓  Regenerated {output} ({len(pages)} URLs, {elapsed:.1f} ms).")
+
+    rebuild(set())
+    run_watch(root, lambda p: p == docs_json_path, rebuild, polling)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""Resolve `$ref`s in the OpenAPI specs and bundle reachable components.
+
+Consumers built on the OAS files (llms.txt, search indexing, example
+extraction) need operations with their parameters, request bodies and
+schemas inlined.  This module resolves local `$ref`s (`#/components/...`)
+lazily and memoises each expansion, so every component is expanded at most
+once and shared structurally wherever it is referenced.  Recursive schemas
+are detected: the inner reference back to a component that is still being
+expanded is left as a `$ref` and recorded in `Resolver.circular`.
+
+The optional bundle output keeps `$ref`s but drops every component that is
+not reachable from `paths` (or `webhooks`), producing the smallest
+self-contained spec.
+
+Usage:
+    python scripts/oas_deref.py news-api-v3 --stats
+    python scripts/oas_deref.py news-api-v3 --output /tmp/news-api-v3.json
+    python scripts/oas_deref.py catch-all-api --bundle --output /tmp/catch-all.yml
+    python scripts/oas_deref.py web-search-api/api-reference/fastapi-openapi.yml --stats
+
+Requirements:
+    pip install pyyaml
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from build_cache import BUILD_CACHE, add_cache_arguments, apply_cache_arguments
+from generate_llms_txt import OAS_SPECS, SPEC_CACHE_VERSION
+
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
+# Component sections that may be pruned by `bundle`.  Others (for example
+# securitySchemes, referenced by name rather than `$ref`) are always kept.
+PRUNABLE_COMPONENTS = (
+    "schemas",
+    "responses",
+    "parameters",
+    "examples",
+    "requestBodies",
+    "headers",
+    "links",
+    "callbacks",
+    "pathItems",
+)
+
+# ---------------------------------------------------------------------------
+# Loading
+# ---------------------------------------------------------------------------
+
+
+def spec_path(spec: str, root: Path) -> Path:
+    """Map a spec name from OAS_SPECS (or a repo-relative path) to a file."""
+    if spec in OAS_SPECS:
+        return root / OAS_SPECS[spec]
+    return root / spec
+
+
+def _yaml():
+    """Import PyYAML on first use (modules that only need HTTP_METHODS skip it)."""
+    try:
+        import yaml
+    except ImportError:
+        print("Error: pyyaml is required.  Run: pip install pyyaml", file=sys.stderr)
+        sys.exit(1)
+    return yaml
+
+
+def load_spec(path: Path) -> dict:
+    """Parse an OAS YAML (or JSON) file, reusing the build cache's parse of it."""
+    raw = path.read_bytes()
+    return BUILD_CACHE.memo_json("oas-spec", SPEC_CACHE_VERSION, raw, lambda: _parse_spec(raw))
+
+
+def _parse_spec(raw: bytes) -> dict:
+    yaml = _yaml()
+    # libyaml-backed loader when available; the pure-Python fallback
+    # produces identical data, only slower.
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(raw.decode("utf-8"), Loader=loader) or {}
+
+
+# ---------------------------------------------------------------------------
+# Dereferencing
+# ---------------------------------------------------------------------------
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+class Resolver:
+    """Lazily dereference local `$ref`s in one OAS document."""
+
+    def __init__(self, spec: dict):
+        self.spec = spec
+        self._memo: dict[str, object] = {}
+        self._in_progress: set[str] = set()
+        self.circular: set[str] = set()
+        self.expansions = 0
+
+    def pointer(self, ref: str):
+        """Return the raw (unresolved) node a local `$ref` points at."""
+        if not ref.startswith("#"):
+            raise ValueError(f"Only local $refs are supported: {ref}")
+        node = self.spec
+        for token in ref[1:].split("/")[1:]:
+            token = _unescape(token)
+            node = node[int(token)] if isinstance(node, list) else node[token]
+        return node
+
+    def resolve(self, node):
+        """Return `node` with every reachable `$ref` expanded."""
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                target = self._expand(ref)
+                if len(node) == 1:
+                    return target
+                # OAS 3.1 allows siblings next to $ref (e.g. description);
+                # they override the target, so the result cannot be shared.
+                merged = dict(target) if isinstance(target, dict) else {}
+                merged.update((k, self.resolve(v)) for k, v in node.items() if k != "$ref")
+                return merged
+            return {k: self.resolve(v) for k, v in node.items()}
+        if isinstance(node, list):
+            return [self.resolve(v) for v in node]
+        return node
+
+    def _expand(self, ref: str):
+        if ref in self._memo:
+            return self._memo[ref]
+        if ref in self._in_progress:
+            self.circular.add(ref)
+            return {"$ref": ref}
+        self._in_progress.add(ref)
+        try:
+            result = self.resolve(self.pointer(ref))
+        finally:
+            self._in_progress.discard(ref)
+        self._memo[ref] = result
+        self.expansions += 1
+        return result
+
+    def operation(self, method: str, path: str) -> dict | None:
+        """Resolve a single operation on demand, or None if it does not exist."""
+        try:
+            op = self.spec["paths"][path][method.lower()]
+        except (KeyError, TypeError):
+            return None
+        return self.resolve(op)
+
+    def operations(self):
+        """Yield (method, path, resolved operation) for every operation."""
+        for path, item in (self.spec.get("paths") or {}).items():
+            if not isinstance(item, dict):
+                continue
+            for method in HTTP_METHODS:
+                if method in item:
+                    yield method, path, self.resolve(item[method])
+
+    def dereference(self) -> dict:
+        """Return the whole document with every `$ref` expanded."""
+        return self.resolve(self.spec)
+
+
+# ---------------------------------------------------------------------------
+# Bundling
+# ---------------------------------------------------------------------------
+
+
+def _collect_refs(node, found: list[str]) -> None:
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                found.append(ref)
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+def reachable_refs(spec: dict) -> set[str]:
+    """Return every `$ref` transitively reachable from paths and webhooks."""
+    resolver = Resolver(spec)
+    pending: list[str] = []
+    _collect_refs(spec.get("paths") or {}, pending)
+    _collect_refs(spec.get("webhooks") or {}, pending)
+    seen: set[str] = set()
+    while pending:
+        ref = pending.pop()
+        if ref in seen or not ref.startswith("#"):
+            continue
+        seen.add(ref)
+        try:
+            _collect_refs(resolver.pointer(ref), pending)
+        except (KeyError, IndexError, ValueError):
+            continue
+    return seen
+
+
+def bundle(spec: dict) -> dict:
+    """Return a copy of `spec` keeping only components reachable from its paths."""
+    reachable = reachable_refs(spec)
+    components = spec.get("components") or {}
+    kept: dict = {}
+    for section, entries in components.items():
+        if section not in PRUNABLE_COMPONENTS or not isinstance(entries, dict):
+            kept[section] = entries
+            continue
+        prefix = f"#/components/{section}/"
+        filtered = {
+            name: value
+            for name, value in entries.items()
+            if prefix + name.replace("~", "~0").replace("/", "~1") in reachable
+        }
+        if filtered:
+            kept[section] = filtered
+
+    bundled = {k: v for k, v in spec.items() if k != "components"}
+    if kept:
+        bundled["components"] = kept
+    return bundled
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def _count_refs(node) -> int:
+    found: list[str] = []
+    _collect_refs(node, found)
+    return len(found)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Dereference or bundle an OpenAPI spec.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument(
+        "spec",
+        help=f"Spec name ({', '.join(OAS_SPECS)}) or repo-relative YAML path",
+    )
+    parser.add_argument(
+        "--bundle",
+        action="store_true",
+        help="Keep $refs but drop components unreachable from paths",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="FILE",
+        help="Write the result to FILE (.json or .yml); omit to print stats only",
+    )
+    parser.add_argument("--stats", action="store_true", help="Print resolution statistics")
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+    apply_cache_arguments(args)
+
+    root = Path(__file__).resolve().parent.parent
+    path = spec_path(args.spec, root)
+    if not path.exists():
+        print(f"Error: spec not found: {path}", file=sys.stderr)
+        sys.exit(1)
+
+    started = time.perf_counter()
+    spec = load_spec(path)
+    loaded = time.perf_counter()
+
+    if args.bundle:
+        result = bundle(spec)
+        circular: set[str] = set()
+        expansions = 0
+    else:
+        resolver = Resolver(spec)
+        result = resolver.dereference()
+        circular = resolver.circular
+        expansions = resolver.expansions
+    resolved = time.perf_counter()
+
+    if args.stats or not args.output:
+        print(f"Spec:               {path.relative_to(root)}")
+        print(f"$refs in source:    {_count_refs(spec)}")
+        if args.bundle:
+            before = sum(len(v) for v in (spec.get("components") or {}).values())
+            after = sum(len(v) for v in (result.get("components") or {}).values())
+            print(f"Components kept:    {after} of {before}")
+        else:
+            print(f"Components expanded: {expansions}")
+            print(f"Circular $refs:     {len(circular)}")
+            for ref in sorted(circular):
+                print(f"  - {ref}")
+        print(f"Load time:          {(loaded - started) * 1000:.1f} ms")
+        print(f"Resolve time:       {(resolved - loaded) * 1000:.1f} ms")
+
+    if args.output:
+        out = Path(args.output)
+        with out.open("w", encoding="utf-8") as fh:
+            if out.suffix == ".json":
+                # Shared subtrees are serialised once per occurrence; YAML
+                # timestamps in examples are written as ISO strings
+                json.dump(result, fh, indent=2, ensure_ascii=False, default=str)
+                fh.write("\n")
+            else:
+                # Aliases are disabled so shared subtrees are written inline
+                yaml = _yaml()
+                base = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+                dumper = type("NoAliasDumper", (base,), {})
+                dumper.ignore_aliases = lambda self, data: True
+                yaml.dump(result, fh, Dumper=dumper, sort_keys=False, allow_unicode=True)
+        print(f"✓  Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Operation index for the active OpenAPI specs and the pages that use them.
+
+Two indexes shared by the endpoint tooling:
+
+- `build_operation_index` lists every operation (method, path, summary,
+  tags, operationId) in each spec from OAS_SPECS.  The operations of each
+  spec are kept in the build cache (build_cache.py), keyed by the content
+  of the YAML file, so repeated runs skip YAML parsing entirely.
+- `scan_openapi_pages` reads the frontmatter of every MDX page once and
+  returns each `openapi:` / `api:` reference it finds.
+
+Requirements:
+    pip install pyyaml
+"""
+
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from build_cache import BUILD_CACHE, cache_key
+from generate_llms_txt import OAS_SPECS, parse_frontmatter
+from oas_deref import HTTP_METHODS, load_spec
+from profiling import PROFILER
+
+# Build cache namespace of each spec's operations; bump the version when
+# spec_operations changes.
+CACHE_NAMESPACE = "oas-operations"
+INDEX_VERSION = 1
+
+# Directories that never contain pages.
+SKIP_DIRS = {"node_modules", "snippets", "scripts", "exported-api-markdown"}
+
+# ---------------------------------------------------------------------------
+# Operation index
+# ---------------------------------------------------------------------------
+
+
+def spec_operations(spec: dict) -> list[dict]:
+    """Return every operation of a loaded spec in document order."""
+    operations = []
+    for path, item in (spec.get("paths") or {}).items():
+        if not isinstance(item, dict):
+            continue
+        for method in HTTP_METHODS:
+            op = item.get(method)
+            if not isinstance(op, dict):
+                continue
+            operations.append(
+                {
+                    "method": method,
+                    "path": path,
+                    "summary": op.get("summary") or "",
+                    "tags": list(op.get("tags") or []),
+                    "operationId": op.get("operationId") or "",
+                }
+            )
+    return operations
+
+
+def build_operation_index(root: Path, use_cache: bool = True) -> dict[str, dict]:
+    """
+    Return {spec name: {"file", "sha256", "operations"}} for OAS_SPECS.
+
+    Specs whose file is missing are indexed with no operations.
+    """
+    index: dict[str, dict] = {}
+    for name, rel_path in OAS_SPECS.items():
+        spec_file = root / rel_path
+        if not spec_file.exists():
+            index[name] = {"file": rel_path, "sha256": None, "operations": []}
+            continue
+        raw = PROFILER.read_bytes(spec_file)
+        key = cache_key(CACHE_NAMESPACE, INDEX_VERSION, raw)
+        operations = BUILD_CACHE.get_json(CACHE_NAMESPACE, key) if use_cache else None
+        if operations is not None:
+            PROFILER.count("operation index cache hits")
+        else:
+            PROFILER.count("operation index cache misses")
+            with PROFILER.phase(f"load spec {name}"):
+                PROFILER.count("yaml parses")
+                operations = spec_operations(load_spec(spec_file))
+            if use_cache:
+                BUILD_CACHE.put_json(CACHE_NAMESPACE, key, operations)
+        index[name] = {
+            "file": rel_path,
+            "sha256": hashlib.sha256(raw).hexdigest(),
+            "operations": operations,
+        }
+    return index
+
+
+def operation_keys(index: dict[str, dict]) -> dict[str, set[tuple[str, str]]]:
+    """Return {spec name: {(method, path), ...}} for constant-time lookups."""
+    return {
+        name: {(op["method"], op["path"]) for op in entry["operations"]}
+        for name, entry in index.items()
+    }
+
+
+# ---------------------------------------------------------------------------
+# Page references
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class PageRef:
+    """One `openapi:` / `api:` frontmatter reference."""
+
+    page: str  # page path without extension, as used in docs.json
+    field: str  # "openapi" or "api"
+    raw: str  # the frontmatter value as written
+    spec: str
+    method: str
+    path: str
+
+
+def iter_mdx_files(root: Path):
+    """Yield every .mdx/.md file under `root`, skipping hidden and tool dirs."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(
+            d for d in dirnames if not d.startswith(".") and d not in SKIP_DIRS
+        )
+        for filename in sorted(filenames):
+            if filename.endswith((".mdx", ".md")) and filename != "README.md":
+                yield Path(dirpath) / filename
+
+
+def parse_openapi_field(value: str) -> tuple[str, str, str]:
+    """Split "<spec> <method> <path>" into its parts ('' for missing parts)."""
+    parts = str(value).strip().split(None, 2)
+    parts += [""] * (3 - len(parts))
+    return parts[0], parts[1].lower(), parts[2].strip()
+
+
+def scan_openapi_pages(root: Path) -> list[PageRef]:
+    """Return every `openapi:` / `api:` reference across all MDX pages."""
+    refs = []
+    for file in iter_mdx_files(root):
+        text = PROFILER.read_text(file)
+        if not text.startswith("---"):
+            continue
+        fm = parse_frontmatter(text)
+        page = file.relative_to(root).with_suffix("").as_posix()
+        for field in ("openapi", "api"):
+            value = fm.get(field)
+            if value:
+                spec, method, path = parse_openapi_field(value)
+                refs.append(PageRef(page, field, str(value), spec, method, path))
+    return refs
@@ -0,0 +1,601 @@
+#!/usr/bin/env python3
+"""Render the OpenAPI specs as compact per-operation Markdown.
+
+The raw YAML specs are 70-200 KB each and expensive for an agent to fetch
+and parse just to call one endpoint.  This renderer walks every spec in
+OAS_SPECS and writes one small Markdown file per operation:
+
+- method, path, base URL, operationId, tags and security schemes
+- a parameter table (path-level and operation-level parameters merged)
+- the request body and each response, with their schemas flattened from
+  `$ref`s into nested field lists: types, required flags, enums, defaults
+  and descriptions
+
+Nesting stops at --max-depth; deeper objects are shown by type name only.
+Recursive schemas are cut at the first repeat.  Schema rendering is
+memoised per (component, remaining depth), so a component shared by many
+operations (error responses, the article model) is rendered once per spec.
+Operations are written as they are rendered, one file each:
+
+    exported-api-markdown/index.md                         # every spec
+    exported-api-markdown/news-api-v3/index.md             # every operation
+    exported-api-markdown/news-api-v3/post-api-search.md   # one operation
+
+The output is committed, and the `## API Specifications` section of llms.txt
+links each spec's index.md next to its YAML.  Files of operations that no
+longer exist are removed; --check fails (as CI does) when the committed
+files differ from what the specs render to.
+
+Usage:
+    python scripts/oas_markdown.py                          # every spec
+    python scripts/oas_markdown.py --check
+    python scripts/oas_markdown.py news-api-v3 --max-depth 2
+    python scripts/oas_markdown.py news-api-v3 --operation "POST /api/search"
+    python scripts/oas_markdown.py --output /tmp/api-md --stats
+
+Requirements:
+    pip install pyyaml
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+from build_cache import add_cache_arguments, apply_cache_arguments
+from generate_llms_txt import API_MARKDOWN_DIR, OAS_SPECS
+from oas_deref import HTTP_METHODS, Resolver, load_spec, spec_path
+from profiling import PROFILER, add_profile_arguments, profile_session
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+OUTPUT_DIR = API_MARKDOWN_DIR
+
+# Levels of nested object fields rendered below a request or response body.
+DEFAULT_MAX_DEPTH = 3
+
+# Enum values listed per field before the rest are summarised.
+MAX_ENUM_VALUES = 25
+
+# ---------------------------------------------------------------------------
+# Schema rendering
+# ---------------------------------------------------------------------------
+
+
+def _one_line(text) -> str:
+    return " ".join(str(text).split())
+
+
+def _code(value) -> str:
+    if isinstance(value, bool):
+        value = "true" if value else "false"
+    elif value is None:
+        value = "null"
+    return f"`{value}`"
+
+
+def _cell(text: str) -> str:
+    return text.replace("|", "\\|")
+
+
+def _component_name(ref: str) -> str:
+    return ref.rsplit("/", 1)[-1]
+
+
+class MarkdownRenderer:
+    """Render the operations of one spec, memoising shared schema blocks."""
+
+    def __init__(self, spec: dict, max_depth: int = DEFAULT_MAX_DEPTH):
+        self.spec = spec
+        self.resolver = Resolver(spec)
+        self.max_depth = max_depth
+        # (ref, remaining depth) -> rendered field lines, unindented.
+        self._memo: dict[tuple[str, int], list[str]] = {}
+        self._in_progress: set[str] = set()
+        self.rendered = 0
+        self.reused = 0
+
+    # -- references --------------------------------------------------------
+
+    def deref(self, node) -> tuple[dict, str | None]:
+        """
+        Follow `$ref`s to the target node; return (node, component name).
+
+        Siblings next to a `$ref` (OAS 3.1) override the target's keys.
+        """
+        name = None
+        seen: set[str] = set()
+        while isinstance(node, dict) and isinstance(node.get("$ref"), str):
+            ref = node["$ref"]
+            if ref in seen:
+                break
+            seen.add(ref)
+            try:
+                target = self.resolver.pointer(ref)
+            except (KeyError, IndexError, ValueError):
+                return {}, _component_name(ref)
+            name = name or _component_name(ref)
+            if len(node) > 1 and isinstance(target, dict):
+                target = {**target, **{k: v for k, v in node.items() if k != "$ref"}}
+            node = target
+        return (node if isinstance(node, dict) else {}), name
+
+    # -- types -------------------------------------------------------------
+
+    def _variants(self, schema: dict) -> tuple[list, bool]:
+        """Return the non-null oneOf/anyOf members and whether null is allowed."""
+        members = schema.get("oneOf") or schema.get("anyOf") or []
+        variants, nullable = [], False
+        for member in members:
+            target, _ = self.deref(member)
+            if target.get("type") == "null":
+                nullable = True
+            else:
+                variants.append(member)
+        return variants, nullable
+
+    def type_label(self, node) -> str:
+        """Short type description, e.g. `string (date-time) | null` or `array of Article`."""
+        schema, name = self.deref(node)
+        types = schema.get("type")
+        types = list(types) if isinstance(types, list) else [types] if types else []
+        nullable = "null" in types or schema.get("nullable") is True
+        types = [t for t in types if t != "null"]
+
+        if not types:
+            variants, null_variant = self._variants(schema)
+            nullable = nullable or null_variant
+            if variants:
+                label = " | ".join(dict.fromkeys(self.type_label(v) for v in variants))
+                if name and len(variants) > 1:
+                    label = f"{name} ({label})"
+            elif len(schema.get("allOf") or ()) == 1:
+                label = self.type_label(schema["allOf"][0])
+            elif name:
+                label = name
+            elif schema.get("properties") or schema.get("allOf"):
+                label = "object"
+            else:
+                label = "any"
+        else:
+            labels = []
+            for t in types:
+                if t == "array":
+                    labels.append(f"array of {self.type_label(schema.get('items') or {})}")
+                elif t == "object" and name:
+                    labels.append(name)
+                else:
+                    labels.append(t)
+            label = " | ".join(labels)
+            if schema.get("format"):
+                label += f" ({schema['format']})"
+        return f"{label} | null" if nullable and not label.endswith("| null") else label
+
+    def _annotations(self, node, description_first: bool = True) -> str:
+        """Description, enum, default and constraints of a schema, as one line."""
+        schema, _ = self.deref(node)
+        parts = []
+        if schema.get("description") and description_first:
+            parts.append(_one_line(schema["description"]))
+        values = schema.get("enum")
+        if values is None and "const" in schema:
+            values = [schema["const"]]
+        if values is None:
+            # Enums commonly sit on the non-null member of a nullable anyOf.
+            variants, _ = self._variants(schema)
+            if len(variants) == 1:
+                values = self.deref(variants[0])[0].get("enum")
+        if values:
+            shown = ", ".join(_code(v) for v in values[:MAX_ENUM_VALUES])
+            more = len(values) - MAX_ENUM_VALUES
+            parts.append(f"One of: {shown}" + (f" (+{more} more)" if more > 0 else "") + ".")
+        if "default" in schema:
+            parts.append(f"Default: {_code(schema['default'])}.")
+        limits = [
+            f"{label} {schema[key]}"
+            for key, label in (
+                ("minimum", "min"),
+                ("maximum", "max"),
+                ("minLength", "min length"),
+                ("maxLength", "max length"),
+                ("minItems", "min items"),
+                ("maxItems", "max items"),
+            )
+            if key in schema
+        ]
+        if limits:
+            parts.append(f"Limits: {', '.join(limits)}.")
+        if schema.get("deprecated"):
+            parts.append("Deprecated.")
+        return " ".join(parts)
+
+    def field_line(self, name: str, node, required: bool) -> str:
+        flags = ", required" if required else ""
+        line = f"- `{name}` ({self.type_label(node)}{flags})"
+        notes = self._annotations(node)
+        return f"{line}: {notes}" if notes else line
+
+    # -- fields ------------------------------------------------------------
+
+    def field_lines(self, node, depth: int = 0) -> list[str]:
+        """
+        Nested Markdown list of the fields below a schema.
+
+        The result for a `$ref` is memoised by (ref, remaining depth) and
+        shared between callers, so it must not be mutated.
+        """
+        if isinstance(node, dict) and isinstance(node.get("$ref"), str):
+            ref = node["$ref"]
+            key = (ref, self.max_depth - depth)
+            if key in self._memo:
+                self.reused += 1
+                return self._memo[key]
+            if ref in self._in_progress:
+                return [f"- _(recursive: {_component_name(ref)})_"]
+            self._in_progress.add(ref)
+            try:
+                lines = self._field_lines(self.deref({"$ref": ref})[0], depth)
+            finally:
+                self._in_progress.discard(ref)
+            self._memo[key] = lines
+            self.rendered += 1
+            return lines
+        return self._field_lines(node if isinstance(node, dict) else {}, depth)
+
+    def _properties(self, schema: dict) -> tuple[dict, set[str]]:
+        """Properties and required names of a schema, with `allOf` members merged."""
+        properties = dict(schema.get("properties") or {})
+        required = set(schema.get("required") or ())
+        for part in schema.get("allOf") or ():
+            target, _ = self.deref(part)
+            part_properties, part_required = self._properties(target)
+            for key, value in part_properties.items():
+                properties.setdefault(key, value)
+            required |= part_required
+        return properties, required
+
+    def _field_lines(self, schema: dict, depth: int) -> list[str]:
+        if depth >= self.max_depth:
+            return []
+        lines: list[str] = []
+
+        items = schema.get("items")
+        if isinstance(items, dict):
+            lines.extend(self.field_lines(items, depth))
+
+        properties, required = self._properties(schema)
+        for name, child in properties.items():
+            lines.append(self.field_line(name, child, name in required))
+            lines.extend("  " + line for line in self.field_lines(child, depth + 1))
+
+        extra = schema.get("additionalProperties")
+        if isinstance(extra, dict) and extra:
+            lines.append(f"- _any key_ ({self.type_label(extra)})")
+            lines.extend("  " + line for line in self.field_lines(extra, depth + 1))
+
+        variants, _ = self._variants(schema)
+        if len(variants) == 1:
+            lines.extend(self.field_lines(variants[0], depth))
+        elif variants:
+            # Scalar unions (string | array of string) are covered by the type label.
+            options = [self.field_lines(variant, depth + 1) for variant in variants]
+            if any(options):
+                discriminator = (schema.get("discriminator") or {}).get("propertyName")
+                if discriminator:
+                    lines.append(f"- Variant selected by `{discriminator}`:")
+                for n, (variant, fields) in enumerate(zip(variants, options), 1):
+                    lines.append(f"- Option {n}: {self.type_label(variant)}")
+                    lines.extend("  " + line for line in fields)
+        return lines
+
+    def schema_block(self, node) -> list[str]:
+        """Type line plus the field list of a request or response body."""
+        lines = [f"Type: {self.type_label(node)}"]
+        notes = self._annotations(node)
+        if notes:
+            lines.append("")
+            lines.append(notes)
+        fields = self.field_lines(node)
+        if fields:
+            lines.append("")
+            lines.extend(fields)
+        return lines
+
+    # -- operations --------------------------------------------------------
+
+    def _security(self, op: dict) -> list[str]:
+        requirements = op.get("security", self.spec.get("security")) or []
+        schemes = (self.spec.get("components") or {}).get("securitySchemes") or {}
+        labels = []
+        for requirement in requirements:
+            for name in requirement or {}:
+                scheme, _ = self.deref(schemes.get(name) or {})
+                if scheme.get("type") == "apiKey":
+                    labels.append(f"{name} ({scheme.get('in')} `{scheme.get('name')}`)")
+                elif scheme.get("type") == "http":
+                    labels.append(f"{name} (HTTP {scheme.get('scheme')})")
+                else:
+                    labels.append(name)
+        return list(dict.fromkeys(labels))
+
+    def _parameters(self, item: dict, op: dict) -> list[dict]:
+        merged: dict[tuple, dict] = {}
+        for raw in list(item.get("parameters") or ()) + list(op.get("parameters") or ()):
+            param, _ = self.deref(raw)
+            if param.get("name"):
+                merged[(param["name"], param.get("in"))] = param
+        return list(merged.values())
+
+    def _content(self, heading: str, container: dict, label: str, seen: dict) -> list[str]:
+        """
+        Render each media type of a body.  A schema `$ref` already shown for
+        an earlier body of the same operation (`seen`: ref -> label) points
+        back to it instead of repeating its fields.
+        """
+        lines = []
+        for media_type, media in (container.get("content") or {}).items():
+            lines += ["", f"{heading} (`{media_type}`)"]
+            schema = (media or {}).get("schema")
+            if not schema:
+                continue
+            ref = schema.get("$ref") if isinstance(schema, dict) else None
+            if ref in seen:
+                lines += ["", f"Type: {self.type_label(schema)} (fields as in {seen[ref]})"]
+                continue
+            if ref:
+                seen[ref] = label
+            lines += [""] + self.schema_block(schema)
+        return lines
+
+    def render_operation(self, spec_name: str, method: str, path: str) -> str:
+        item = self.spec["paths"][path]
+        op = item[method]
+        title = op.get("summary") or op.get("operationId") or f"{method.upper()} {path}"
+        lines = [f"# {_one_line(title)}", "", f"`{method.upper()} {path}`", ""]
+
+        servers = op.get("servers") or item.get("servers") or self.spec.get("servers") or []
+        facts = [f"Spec: {spec_name}"]
+        if servers and servers[0].get("url"):
+            facts.append(f"Base URL: {servers[0]['url']}")
+        if op.get("operationId"):
+            facts.append(f"Operation ID: `{op['operationId']}`")
+        if op.get("tags"):
+            facts.append(f"Tags: {', '.join(op['tags'])}")
+        security = self._security(op)
+        if security:
+            facts.append(f"Auth: {', '.join(security)}")
+        lines += [f"- {fact}" for fact in facts]
+        if op.get("deprecated"):
+            lines += ["", "**Deprecated.**"]
+        if op.get("description"):
+            lines += ["", str(op["description"]).strip()]
+
+        seen: dict[str, str] = {}
+        parameters = self._parameters(item, op)
+        if parameters:
+            lines += [
+                "",
+                "## Parameters",
+                "",
+                "| Name | In | Type | Required | Description |",
+                "| --- | --- | --- | --- | --- |",
+            ]
+            for param in parameters:
+                schema = param.get("schema") or {}
+                notes = " ".join(
+                    part
+                    for part in (
+                        _one_line(param.get("description") or ""),
+                        self._annotations(schema, description_first=not param.get("description")),
+                    )
+                    if part
+                )
+                lines.append(
+                    f"| `{param['name']}` | {param.get('in', '')} "
+                    f"| {_cell(self.type_label(schema))} "
+                    f"| {'yes' if param.get('required') else 'no'} | {_cell(notes)} |"
+                )
+
+        if op.get("requestBody"):
+            body, _ = self.deref(op["requestBody"])
+            lines += ["", "## Request body"]
+            if body.get("required"):
+                lines += ["", "Required."]
+            if body.get("description"):
+                lines += ["", _one_line(body["description"])]
+            lines += self._content("Content", body, "the request body", seen)
+
+        responses = op.get("responses") or {}
+        if responses:
+            lines += ["", "## Responses"]
+            for status, raw in responses.items():
+                response, _ = self.deref(raw)
+                description = _one_line(response.get("description") or "")
+                lines += ["", f"### {status}" + (f": {description}" if description else "")]
+                lines += self._content("Body", response, status, seen)
+        return "\n".join(lines) + "\n"
+
+    def operations(self):
+        """Yield (method, path, operation) in document order."""
+        for path, item in (self.spec.get("paths") or {}).items():
+            if not isinstance(item, dict):
+                continue
+            for method in HTTP_METHODS:
+                if isinstance(item.get(method), dict):
+                    yield method, path, item[method]
+
+
+def operation_slug(method: str, path: str) -> str:
+    """File stem of an operation: POST /api/search/{id} -> post-api-search-id."""
+    return f"{method}-" + (re.sub(r"[^a-z0-9]+", "-", path.lower()).strip("-") or "root")
+
+
+def iter_spec_markdown(spec_name: str, spec: dict, max_depth: int = DEFAULT_MAX_DEPTH):
+    """
+    Yield (file name, Markdown) for each operation of a spec, then its index.
+
+    Operations are rendered lazily, one at a time, so callers can write each
+    file as soon as it is ready.
+    """
+    renderer = MarkdownRenderer(spec, max_depth)
+    info = spec.get("info") or {}
+    index = [f"# {info.get('title') or spec_name}: API reference", ""]
+    if info.get("version"):
+        index += [f"Version {info['version']}. One file per operation.", ""]
+    used: set[str] = set()
+    for method, path, op in renderer.operations():
+        slug = operation_slug(method, path)
+        while slug in used:
+            slug += "-"
+        used.add(slug)
+        with PROFILER.phase("render operation"):
+            markdown = renderer.render_operation(spec_name, method, path)
+        summary = _one_line(op.get("summary") or "")
+        index.append(
+            f"- [{method.upper()} {path}]({slug}.md)" + (f": {summary}" if summary else "")
+        )
+        yield f"{slug}.md", markdown
+    PROFILER.count("schema blocks rendered", renderer.rendered)
+    PROFILER.count("schema blocks reused", renderer.reused)
+    yield "index.md", "\n".join(index) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def _write(path: Path, text: str, check: bool = False) -> bool:
+    """
+    Write `text` unless the file already holds it; return True if it did not.
+
+    With `check`, only compare.
+    """
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return False
+    except OSError:
+        pass
+    if not check:
+        path.write_text(text, encoding="utf-8")
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Render the OpenAPI specs as per-operation Markdown.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument(
+        "specs",
+        nargs="*",
+        metavar="SPEC",
+        help=f"Spec names ({', '.join(OAS_SPECS)}); default: all",
+    )
+    parser.add_argument(
+        "--output", default=OUTPUT_DIR, help=f"Output directory (default: {OUTPUT_DIR})"
+    )
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        default=DEFAULT_MAX_DEPTH,
+        help=f"Levels of nested fields to expand (default: {DEFAULT_MAX_DEPTH})",
+    )
+    parser.add_argument(
+        "--operation",
+        metavar='"METHOD PATH"',
+        help="Print one operation to stdout instead of writing files",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Validate that the output is up to date without writing it; exit 1 if not",
+    )
+    parser.add_argument("--stats", action="store_true", help="Print per-spec statistics")
+    add_cache_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    apply_cache_arguments(args)
+
+    root = Path(__file__).resolve().parent.parent
+    specs = args.specs or list(OAS_SPECS)
+    for spec_name in specs:
+        if spec_name not in OAS_SPECS:
+            print(f"Error: unknown spec {spec_name!r}", file=sys.stderr)
+            sys.exit(1)
+
+    with profile_session(args, "oas_markdown"):
+        if args.operation:
+            if len(specs) != 1:
+                print("Error: --operation needs exactly one SPEC", file=sys.stderr)
+                sys.exit(1)
+            method, _, path = args.operation.strip().partition(" ")
+            method, path = method.lower(), path.strip()
+            spec = load_spec(spec_path(specs[0], root))
+            item = (spec.get("paths") or {}).get(path)
+            if not isinstance(item, dict) or not isinstance(item.get(method), dict):
+                print(f"Error: {args.operation} is not in {specs[0]}", file=sys.stderr)
+                sys.exit(1)
+            renderer = MarkdownRenderer(spec, args.max_depth)
+            sys.stdout.write(renderer.render_operation(specs[0], method, path))
+            return
+
+        output = root / args.output
+        shown = output.relative_to(root) if output.is_relative_to(root) else output
+        index = ["# API reference", "", "One Markdown file per operation, by spec:", ""]
+        changed: list[Path] = []
+        for spec_name in specs:
+            started = time.perf_counter()
+            with PROFILER.phase("load spec"):
+                spec = load_spec(spec_path(spec_name, root))
+            spec_dir = output / spec_name
+            if not args.check:
+                spec_dir.mkdir(parents=True, exist_ok=True)
+            count = written = size = 0
+            filenames = set()
+            for filename, markdown in iter_spec_markdown(spec_name, spec, args.max_depth):
+                filenames.add(filename)
+                if _write(spec_dir / filename, markdown, args.check):
+                    changed.append(spec_dir / filename)
+                    written += 1
+                count += 1
+                size += len(markdown.encode("utf-8"))
+            # Operations removed from the spec leave their old files behind.
+            for orphan in sorted(spec_dir.glob("*.md")):
+                if orphan.name not in filenames:
+                    changed.append(orphan)
+                    written += 1
+                    if not args.check:
+                        orphan.unlink()
+            title = (spec.get("info") or {}).get("title") or spec_name
+            index.append(f"- [{title}]({spec_name}/index.md)")
+            if not args.check:
+                print(f"✓ {spec_name}: {count - 1} operations → {shown}/{spec_name}/")
+            if args.stats:
+                print(
+                    f"    {size / 1024:.1f} KB in {count} files, {written} changed, "
+                    f"{(time.perf_counter() - started) * 1000:.0f} ms"
+                )
+        if not args.specs:
+            if _write(output / "index.md", "\n".join(index) + "\n", args.check):
+                changed.append(output / "index.md")
+
+        if args.check:
+            if changed:
+                print(f"✗ {len(changed)} file(s) in {shown}/ are out of date:", file=sys.stderr)
+                for path in changed:
+                    print(f"   {path.relative_to(output)}", file=sys.stderr)
+                print(
+                    "   Run: python scripts/oas_markdown.py  and commit the result.",
+                    file=sys.stderr,
+                )
+                sys.exit(1)
+            print(f"✓ {shown}/ is up to date ({len(specs)} spec(s)).")
+
+
+if __name__ == "__main__":
+    main()
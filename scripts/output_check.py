@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Streaming comparison of generated output against a committed file.
+
+The --check modes of the generators hand their output over as an iterable
+of text chunks.  `compare_chunks` re-joins the chunks into blocks of about
+BLOCK_SIZE characters (ending at a line break) and reads the same amount of
+the committed file for each, so neither side is held in memory, most of the
+work is plain string comparison, and the comparison stops in the first block
+that differs.  Only that block is compared line by line.
+
+On a mismatch it reads a bounded window past that line from both sides and
+returns a compact unified diff of just the differing sections:
+
+    @@ -58,7 +58,7 @@
+             <loc>https://www.newscatcherapi.com/docs/.../get-job-results</loc>
+         </url>
+         <url>
+    -        <loc>https://www.newscatcherapi.com/doc/.../continue-job</loc>
+    +        <loc>https://www.newscatcherapi.com/docs/.../continue-job</loc>
+         </url>
+         <url>
+             <loc>https://www.newscatcherapi.com/docs/.../list-user-jobs</loc>
+
+Line numbers are those of the whole files.  Differences beyond the window
+are not read; the diff says so.
+
+Writing the same chunks goes through atomic_write.write_atomic_chunks.
+
+Requirements:
+    Python 3.8+, stdlib only
+"""
+
+from collections import deque
+from itertools import chain, islice, zip_longest
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from profiling import PROFILER
+
+# Unchanged lines shown around each change.
+CONTEXT_LINES = 3
+
+# Characters compared at a time before falling back to lines.
+BLOCK_SIZE = 64 * 1024
+
+# Lines read from each side past the first difference.
+DIFF_WINDOW = 200
+
+# Diff lines returned at most; the rest is summarized.
+MAX_DIFF_LINES = 60
+
+# ---------------------------------------------------------------------------
+# Comparison
+# ---------------------------------------------------------------------------
+
+
+def iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Re-split text chunks into lines, each keeping its "\\n"."""
+    pending = ""
+    for chunk in chunks:
+        pending += chunk
+        if "\n" not in chunk:
+            continue
+        *complete, pending = pending.split("\n")
+        for line in complete:
+            yield line + "\n"
+    if pending:
+        yield pending
+
+
+def iter_blocks(chunks: Iterable[str]) -> Iterator[str]:
+    """Re-join text chunks into blocks of about BLOCK_SIZE characters ending in "\\n"."""
+    pending: List[str] = []
+    size = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        size += len(chunk)
+        if size < BLOCK_SIZE:
+            continue
+        text = "".join(pending)
+        cut = text.rfind("\n") + 1
+        if cut:
+            yield text[:cut]
+            text = text[cut:]
+        pending, size = [text], len(text)
+    text = "".join(pending)
+    if text:
+        yield text
+
+
+def _last_lines(block: str) -> List[str]:
+    """The last CONTEXT_LINES lines of a block that ends in "\\n"."""
+    parts = block.rsplit("\n", CONTEXT_LINES + 1)
+    if len(parts) > CONTEXT_LINES + 1:
+        del parts[0]  # Everything before them, as one string
+    return [line + "\n" for line in parts[:-1]]
+
+
+def _window(lines: Iterator[str], first: Optional[str]) -> Tuple[List[str], bool]:
+    """Return (first + up to DIFF_WINDOW more lines, whether more lines follow)."""
+    if first is None:
+        return [], False
+    window = [first, *islice(lines, DIFF_WINDOW)]
+    return window, next(lines, None) is not None
+
+
+def _range(start: int, count: int) -> str:
+    # Unified diff convention: an empty range names the line before it.
+    if count == 1:
+        return str(start + 1)
+    return f"{start + 1 if count else start},{count}"
+
+
+def _diff_line(tag: str, line: str) -> List[str]:
+    if line.endswith("\n"):
+        return [tag + line[:-1]]
+    return [tag + line, "\\ No newline at end of file"]
+
+
+def _unified_diff(
+    old: List[str], new: List[str], offset: int, old_more: bool, new_more: bool
+) -> List[str]:
+    """Unified diff hunks of two windows that start at line `offset` (0-based)."""
+    # Imported here: the generators import this module, but only a failing
+    # check builds a diff.
+    from difflib import SequenceMatcher
+
+    groups = list(
+        SequenceMatcher(None, old, new, autojunk=False).get_grouped_opcodes(CONTEXT_LINES)
+    )
+    if len(groups) > 1 and (old_more or new_more):
+        # The windows end at arbitrary points of a longer file, so a change
+        # touching their ends may only be where the windows were cut.
+        last = groups[-1][-1]
+        if last[2] == len(old) or last[4] == len(new):
+            groups.pop()
+    lines: List[str] = []
+    for group in groups:
+        i1, i2, j1, j2 = group[0][1], group[-1][2], group[0][3], group[-1][4]
+        lines.append(
+            f"@@ -{_range(offset + i1, i2 - i1)} +{_range(offset + j1, j2 - j1)} @@"
+        )
+        for tag, a1, a2, b1, b2 in group:
+            if tag == "equal":
+                for line in old[a1:a2]:
+                    lines.extend(_diff_line(" ", line))
+                continue
+            for line in old[a1:a2]:
+                lines.extend(_diff_line("-", line))
+            for line in new[b1:b2]:
+                lines.extend(_diff_line("+", line))
+    return lines
+
+
+def compare_chunks(path: Path, chunks: Iterable[str]) -> Optional[List[str]]:
+    """
+    Compare the generated `chunks` with the file at `path`.
+
+    Returns None when they are identical, otherwise the lines of a compact
+    unified diff (committed file as "-", generated output as "+").  Raises
+    OSError if the file cannot be read.
+    """
+    before: deque = deque(maxlen=CONTEXT_LINES)
+    lineno = 0
+    blocks = iter_blocks(chunks)
+    # Default newline handling: a checkout with CRLF line endings (for
+    # example core.autocrlf) reads as "\n" and compares equal.
+    with open(path, encoding="utf-8") as fh:
+        # Whole blocks first; lines only from the block that differs.
+        for block in blocks:
+            committed = fh.read(len(block))
+            if committed == block and block.endswith("\n"):
+                lineno += block.count("\n")
+                before.extend(_last_lines(block))
+                continue
+            if committed and not committed.endswith("\n"):
+                committed += fh.readline()
+            old_lines = chain(iter_lines([committed]), fh)
+            new_lines = chain(iter_lines([block]), iter_lines(blocks))
+            break
+        else:
+            old_lines, new_lines = iter(fh), iter(())
+
+        for old, new in zip_longest(old_lines, new_lines):
+            if old != new:
+                break
+            before.append(old)
+            lineno += 1
+        else:
+            PROFILER.count("lines compared", lineno)
+            return None
+        PROFILER.count("lines compared", lineno + 1)
+        old_window, old_more = _window(old_lines, old)
+        new_window, new_more = _window(new_lines, new)
+
+    diff = _unified_diff(
+        [*before, *old_window],
+        [*before, *new_window],
+        lineno - len(before),
+        old_more,
+        new_more,
+    )
+    if len(diff) > MAX_DIFF_LINES:
+        hidden = len(diff) - MAX_DIFF_LINES
+        diff = [*diff[:MAX_DIFF_LINES], f"… {hidden} more diff line(s)"]
+    if old_more or new_more:
+        diff.append(f"… differences past line {lineno + DIFF_WINDOW + 1} not compared")
+    return diff
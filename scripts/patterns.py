@@ -0,0 +1,56 @@
+"""Regular expressions shared by the scripts, compiled on first use.
+
+Attributes are compiled lazily (PEP 562 module `__getattr__`) and then
+cached in the module namespace, so importing this module costs nothing and
+each pattern is compiled at most once per process no matter how many
+scripts use it:
+
+    import patterns
+
+    match = patterns.FRONTMATTER.match(text)
+"""
+
+import re
+
+_SOURCES: dict[str, tuple[str, int]] = {
+    # YAML frontmatter at the start of an MDX file; group 1 is the YAML body.
+    "FRONTMATTER": (r"^---[ \t]*\n(.*?)\n---", re.DOTALL),
+    # Text up to the first full stop followed by a space.
+    "FIRST_SENTENCE": (r"^(.+?\.)\ ", 0),
+    # The whole frontmatter block including delimiters, for stripping it.
+    "FRONTMATTER_BLOCK": (r"\A---[ \t]*\n.*?\n---[ \t]*\n?", re.DOTALL),
+    # MDX `import` / `export` statements (one line each).
+    "MDX_IMPORT_EXPORT": (r"^(?:import|export)\s.*$", re.MULTILINE),
+    # Opening or closing JSX tag.
+    "JSX_TAG": (r"</?[A-Za-z][^>]*>", 0),
+    # MDX import of another MDX file (snippet); group 1 is the import path.
+    "MDX_INCLUDE": (r"""^import\s+.+?\s+from\s+["']([^"']+\.mdx?)["'];?\s*$""", 0),
+    # A whole line starting with `import`, for finding MDX_INCLUDE in a file.
+    "IMPORT_LINE": (r"^import\s[^\n]*", re.MULTILINE),
+    # Markdown link or image (preceded by "!"); group 1 is the URL.  The link
+    # text may wrap onto following lines, but not across a blank line.  The
+    # patterns below start with a literal so whole files scan quickly.
+    "MARKDOWN_LINK": (r"\[[^\]\n]*(?:\n(?![ \t]*\n)[^\]\n]*)*\]\(\s*<?([^)\s>]+)", 0),
+    # JSX `href` attribute; group 1 is the URL.  Not anchored to a word start.
+    "HREF_ATTR": (r"""href=["']([^"'\n]+)["']""", 0),
+    # YAML `url:` field; group 1 is the URL.  Not anchored to a word start.
+    "YAML_URL": (r"""url:[ \t]*["']?([^\s"']+)""", 0),
+    # Unit of the rough LLM token estimate: a word run or one punctuation mark.
+    "TOKEN_ESTIMATE": (r"\w+|[^\w\s]", 0),
+    # Opening or closing code fence (``` or ~~~).
+    "CODE_FENCE": (r"^\s*(```|~~~)", 0),
+}
+
+
+def __getattr__(name: str) -> re.Pattern:
+    try:
+        source, flags = _SOURCES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    compiled = re.compile(source, flags)
+    globals()[name] = compiled
+    return compiled
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_SOURCES))
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""Local preview server for the generated artifacts and redirects.
+
+Serves what the docs deploy publishes, without deploying to Mintlify:
+
+- /llms.txt, /sitemap.xml and /docs-index.jsonl (also under /docs/), and
+  per-product /<tab>/llms.txt shards when they have been generated
+- /exported-redirects/<file>, the output of export_redirects.py
+- /exported-api-markdown/<spec>/<operation>.md, the output of oas_markdown.py
+- /docs/<page> for every page in docs.json, as the raw MDX text
+- every source in redirect-map.json, answered with the rule's status code
+  and destination
+
+Redirects follow the same semantics as the exported rules (nginx
+`location =`, Netlify, Vercel): the request path must equal the source
+exactly, one rule is applied per request (chains are followed by the
+client, hop by hop), and the query string is carried over unless the rule
+sets `preserve_query: false`.  Duplicate sources resolve to the first rule,
+as in the compiled snapshot.
+
+Files are cached in memory; missing paths are not, so requests for
+arbitrary URLs do not grow the cache.  A poll loop stats every served file
+and reloads only the ones whose mtime or size changed; a change to redirect-map.json
+reloads the redirect table and a change to docs.json reloads the page list.
+
+The server speaks HTTP/1.1 with keep-alive, so it can take load-test traffic
+directly.  `--bench` starts the server in-process and measures redirect
+latency and throughput over keep-alive connections.
+
+Usage:
+    python scripts/preview_server.py                      # http://127.0.0.1:8765
+    python scripts/preview_server.py --port 9000 --access-log
+    python scripts/preview_server.py --bench 20000 --concurrency 32
+
+Requirements:
+    Python 3.10+, stdlib only
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from email.utils import formatdate
+from pathlib import Path
+
+from generate_sitemap import collect_pages
+from redirect_snapshot import RedirectTable, load_redirect_table
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+DOCS_JSON_PATH = "docs.json"
+REDIRECT_MAP_PATH = "redirect-map.json"
+EXPORT_DIR = "exported-redirects"
+API_MARKDOWN_DIR = "exported-api-markdown"
+DOCS_PREFIX = "/docs"
+
+# URL path -> (repo path, content type) for the generated artifacts.
+ARTIFACTS = {
+    "/llms.txt": ("llms.txt", "text/plain; charset=utf-8"),
+    "/sitemap.xml": ("sitemap.xml", "application/xml; charset=utf-8"),
+    "/docs-index.jsonl": ("docs-index.jsonl", "application/x-ndjson; charset=utf-8"),
+}
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+POLL_INTERVAL = 0.5
+
+# Requests with a header block larger than this are rejected.
+MAX_HEADER_BYTES = 16 * 1024
+
+_REASONS = {
+    200: "OK",
+    301: "Moved Permanently",
+    302: "Found",
+    303: "See Other",
+    307: "Temporary Redirect",
+    308: "Permanent Redirect",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    431: "Request Header Fields Too Large",
+}
+
+# ---------------------------------------------------------------------------
+# File cache with change detection
+# ---------------------------------------------------------------------------
+
+
+class FileCache:
+    """In-memory file contents, refreshed only when a file changes on disk.
+
+    Only files that exist are cached, so requests for arbitrary missing paths
+    do not grow it; a cached file that is later deleted stays tracked until
+    it reappears.  Inputs the server reloads from are tracked even while
+    missing (`track_missing`), so refresh() notices when they are created.
+    """
+
+    def __init__(self):
+        self._entries: dict[Path, tuple[tuple[int, int] | None, bytes | None]] = {}
+
+    @staticmethod
+    def _stamp(path: Path) -> tuple[int, int] | None:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def get(self, path: Path, track_missing: bool = False) -> bytes | None:
+        """Return the cached body of `path` (None if missing), loading it once."""
+        entry = self._entries.get(path)
+        if entry is None:
+            entry = self._load(path)
+            if entry[1] is None and not track_missing:
+                return None
+            self._entries[path] = entry
+        return entry[1]
+
+    def _load(self, path: Path) -> tuple[tuple[int, int] | None, bytes | None]:
+        stamp = self._stamp(path)
+        body = None
+        if stamp is not None:
+            try:
+                body = path.read_bytes()
+            except OSError:
+                stamp = None
+        return stamp, body
+
+    def refresh(self) -> list[Path]:
+        """Reload every tracked file whose mtime or size changed; return them."""
+        changed = []
+        for path, (stamp, _) in list(self._entries.items()):
+            if self._stamp(path) != stamp:
+                self._entries[path] = self._load(path)
+                changed.append(path)
+        return changed
+
+
+# ---------------------------------------------------------------------------
+# Site state
+# ---------------------------------------------------------------------------
+
+
+class Site:
+    """Routing tables and cached content for the preview server."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.files = FileCache()
+        self.redirects: RedirectTable | None = None
+        self.pages: dict[str, Path] = {}
+        self.reload_redirects()
+        self.reload_pages()
+
+    def reload_redirects(self) -> None:
+        path = self.root / REDIRECT_MAP_PATH
+        self.files.get(path, track_missing=True)
+        try:
+            table = load_redirect_table(path)
+        except (OSError, ValueError) as e:
+            print(f"✗ Keeping previous redirects: {e}", file=sys.stderr)
+            return
+        self.redirects = table
+
+    def reload_pages(self) -> None:
+        raw = self.files.get(self.root / DOCS_JSON_PATH, track_missing=True)
+        try:
+            pages = collect_pages(json.loads(raw or b"{}"))
+        except ValueError as e:
+            print(f"✗ Keeping previous page list: {e}", file=sys.stderr)
+            return
+        self.pages = {}
+        for page in pages:
+            for ext in (".mdx", ".md"):
+                if (self.root / f"{page}{ext}").exists():
+                    self.pages[f"{DOCS_PREFIX}/{page}"] = self.root / f"{page}{ext}"
+                    break
+
+    def refresh(self) -> list[Path]:
+        """Reload changed files and anything derived from them."""
+        changed = self.files.refresh()
+        for path in changed:
+            if path == self.root / REDIRECT_MAP_PATH:
+                self.reload_redirects()
+            elif path == self.root / DOCS_JSON_PATH:
+                self.reload_pages()
+        return changed
+
+    def route(self, method: str, target: str) -> tuple[int, list[tuple[str, str]], bytes]:
+        """Return (status, headers, body) for a request."""
+        if method not in ("GET", "HEAD"):
+            return 405, [("Allow", "GET, HEAD")], b""
+
+        path, _, query = target.partition("?")
+        path = path.split("#", 1)[0]
+
+        rule = self.redirects.find_rule(path) if self.redirects else None
+        if rule is not None:
+            destination = rule["destination"]
+            if query and rule.get("preserve_query", True):
+                destination += ("&" if "?" in destination else "?") + query
+            return rule["status_code"], [("Location", destination)], b""
+
+        served = path[len(DOCS_PREFIX) :] if path.startswith(DOCS_PREFIX + "/") else path
+        if served in ARTIFACTS:
+            rel_path, content_type = ARTIFACTS[served]
+            body = self.files.get(self.root / rel_path)
+            if body is not None:
+                return 200, [("Content-Type", content_type)], body
+
+        # Per-product llms.txt shards (generate_llms_txt.py --shards).
+        if served.endswith("/llms.txt") and "/.." not in served:
+            body = self.files.get(self.root / served.lstrip("/"))
+            if body is not None:
+                return 200, [("Content-Type", ARTIFACTS["/llms.txt"][1])], body
+
+        if served.startswith(f"/{EXPORT_DIR}/") and "/.." not in served:
+            body = self.files.get(self.root / served.lstrip("/"))
+            if body is not None:
+                return 200, [("Content-Type", "text/plain; charset=utf-8")], body
+
+        if served.startswith(f"/{API_MARKDOWN_DIR}/") and "/.." not in served:
+            body = self.files.get(self.root / served.lstrip("/"))
+            if body is not None:
+                return 200, [("Content-Type", "text/markdown; charset=utf-8")], body
+
+        page_file = self.pages.get(path.rstrip("/") or "/")
+        if page_file is not None:
+            body = self.files.get(page_file)
+            if body is not None:
+                return 200, [("Content-Type", "text/markdown; charset=utf-8")], body
+
+        return 404, [("Content-Type", "text/plain; charset=utf-8")], b"Not Found\n"
+
+
+# ---------------------------------------------------------------------------
+# HTTP/1.1 server
+# ---------------------------------------------------------------------------
+
+
+def _response(status: int, headers: list[tuple[str, str]], body: bytes, head: bool, close: bool):
+    lines = [f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}"]
+    lines += [f"{name}: {value}" for name, value in headers]
+    lines.append(f"Content-Length: {len(body)}")
+    lines.append(f"Date: {formatdate(usegmt=True)}")
+    if close:
+        lines.append("Connection: close")
+    payload = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    return payload if head else payload + body
+
+
+async def handle_connection(site: Site, reader, writer, access_log: bool) -> None:
+    try:
+        while True:
+            try:
+                block = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.IncompleteReadError:
+                break
+            except asyncio.LimitOverrunError:
+                writer.write(_response(431, [], b"", False, True))
+                break
+
+            lines = block.decode("latin-1").split("\r\n")
+            parts = lines[0].split()
+            if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+                writer.write(_response(400, [], b"", False, True))
+                break
+            method, target, version = parts
+            headers = {}
+            for line in lines[1:]:
+                name, sep, value = line.partition(":")
+                if sep:
+                    headers[name.strip().lower()] = value.strip()
+
+            # Request bodies are not used, but must be consumed to keep the
+            # connection in sync.  A length that is not a plain non-negative
+            # integer ("-1", "abc", "1_0") leaves the stream unusable.
+            length = headers.get("content-length", "") or "0"
+            if not (length.isascii() and length.isdigit()):
+                writer.write(_response(400, [], b"", False, True))
+                break
+            length = int(length)
+            if length:
+                await reader.readexactly(length)
+
+            connection = headers.get("connection", "").lower()
+            close = connection == "close" or (version == "HTTP/1.0" and connection != "keep-alive")
+
+            status, out_headers, body = site.route(method, target)
+            writer.write(_response(status, out_headers, body, method == "HEAD", close))
+            if access_log:
+                print(f"{method} {target} {status} {len(body)}")
+            await writer.drain()
+            if close:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def watch(site: Site, interval: float) -> None:
+    """Poll served files and reload the ones that changed."""
+    while True:
+        await asyncio.sleep(interval)
+        for path in site.refresh():
+            print(f"↻ Reloaded {path.relative_to(site.root)}")
+
+
+async def start_server(site: Site, host: str, port: int, access_log: bool = False):
+    return await asyncio.start_server(
+        lambda r, w: handle_connection(site, r, w, access_log),
+        host,
+        port,
+        limit=MAX_HEADER_BYTES,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Load test
+# ---------------------------------------------------------------------------
+
+
+async def _bench_worker(host, port, targets, count, latencies, statuses) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(count):
+            target = targets[i % len(targets)]
+            request = f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1")
+            started = time.perf_counter()
+            writer.write(request)
+            block = await reader.readuntil(b"\r\n\r\n")
+            status_line, _, rest = block.partition(b"\r\n")
+            length = 0
+            for line in rest.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            if length:
+                await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+            status = int(status_line.split()[1])
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def bench(site: Site, host: str, requests: int, concurrency: int) -> None:
+    """Replay every redirect source against an in-process server."""
+    server = await start_server(site, host, 0)
+    port = server.sockets[0].getsockname()[1]
+    targets = [rule["source"] for rule in site.redirects] if site.redirects else []
+    if not targets:
+        print("Error: no redirect rules to benchmark", file=sys.stderr)
+        sys.exit(1)
+
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    per_worker = [requests // concurrency] * concurrency
+    for i in range(requests % concurrency):
+        per_worker[i] += 1
+
+    started = time.perf_counter()
+    async with server:
+        await asyncio.gather(
+            *(
+                _bench_worker(host, port, targets[i:] + targets[:i], n, latencies, statuses)
+                for i, n in enumerate(per_worker)
+                if n
+            )
+        )
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def pct(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+    print(f"Requests:     {len(latencies)} over {concurrency} keep-alive connection(s)")
+    print(f"Throughput:   {len(latencies) / elapsed:,.0f} req/s")
+    print(f"Latency p50:  {pct(0.50):.3f} ms")
+    print(f"Latency p99:  {pct(0.99):.3f} ms")
+    print(f"Latency max:  {latencies[-1] * 1000:.3f} ms")
+    print("Statuses:     " + ", ".join(f"{k}×{v}" for k, v in sorted(statuses.items())))
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+async def serve(site: Site, host: str, port: int, interval: float, access_log: bool) -> None:
+    server = await start_server(site, host, port, access_log)
+    print(f"✓ Serving {site.root} at http://{host}:{port}/")
+    print(f"  {len(site.pages)} pages, {len(site.redirects or ())} redirects")
+    print(f"  Watching for changes every {interval}s (Ctrl+C to stop)")
+    async with server:
+        await asyncio.gather(server.serve_forever(), watch(site, interval))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Serve the generated artifacts and redirects locally.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"(default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"(default: {DEFAULT_PORT})")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=POLL_INTERVAL,
+        help=f"Seconds between change checks (default: {POLL_INTERVAL})",
+    )
+    parser.add_argument("--access-log", action="store_true", help="Print one line per request")
+    parser.add_argument(
+        "--bench",
+        type=int,
+        metavar="N",
+        help="Send N requests for the redirect sources to an in-process server and exit",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=16,
+        help="Keep-alive connections used by --bench (default: 16)",
+    )
+    args = parser.parse_args()
+
+    root = Path(__file__).resolve().parent.parent
+    for required in (DOCS_JSON_PATH, REDIRECT_MAP_PATH):
+        if not (root / required).exists():
+            print(f"Error: {required} not found at {root}", file=sys.stderr)
+            sys.exit(1)
+
+    site = Site(root)
+    try:
+        if args.bench:
+            asyncio.run(bench(site, args.host, args.bench, max(1, args.concurrency)))
+        else:
+            asyncio.run(serve(site, args.host, args.port, args.interval, args.access_log))
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
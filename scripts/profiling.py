@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Timing and counter instrumentation shared by the scripts.
+
+Scripts record phases and counters on the module-level `PROFILER`:
+
+    from profiling import PROFILER
+
+    with PROFILER.phase("load docs.json"):
+        ...
+    PROFILER.count("files read")
+    PROFILER.count("bytes read", len(data))
+
+Recording is a no-op until a script enables it with the `--profile` family of
+flags (see `add_profile_arguments` / `profile_session`):
+
+    --profile              print a human summary to stderr on exit
+    --profile-json FILE    write the report as JSON (for CI trend tracking)
+    --cprofile FILE        also run under cProfile and dump pstats to FILE
+
+Phases may nest; each phase name accumulates its own wall time and call
+count, so nested phases are included in their parent's total.
+
+Requirements:
+    Python 3.10+, stdlib only
+"""
+
+import contextlib
+import sys
+import time
+from pathlib import Path
+
+REPORT_VERSION = 1
+
+
+class Profiler:
+    """Accumulates per-phase wall time and named counters."""
+
+    def __init__(self):
+        self.enabled = False
+        self.phases: dict[str, list[float]] = {}  # name -> [seconds, calls]
+        self.counters: dict[str, int] = {}
+        self._started = time.perf_counter()
+
+    def reset(self) -> None:
+        self.phases.clear()
+        self.counters.clear()
+        self._started = time.perf_counter()
+
+    @contextlib.contextmanager
+    def _timed(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.phases.setdefault(name, [0.0, 0])
+            entry[0] += time.perf_counter() - started
+            entry[1] += 1
+
+    def phase(self, name: str):
+        """Context manager timing one occurrence of phase `name`."""
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._timed(name)
+
+    def count(self, name: str, n: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def read_bytes(self, path: Path) -> bytes:
+        """Read a file, counting it under "files read" / "bytes read"."""
+        data = path.read_bytes()
+        if self.enabled:
+            self.count("files read")
+            self.count("bytes read", len(data))
+        return data
+
+    def read_text(self, path: Path) -> str:
+        return self.read_bytes(path).decode("utf-8")
+
+    def report(self, script: str) -> dict:
+        # Imported here: profiling is imported by every instrumented script,
+        # but reports are only built when profiling is enabled.
+        import platform
+        from datetime import datetime, timezone
+
+        return {
+            "version": REPORT_VERSION,
+            "script": script,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "wall_seconds": round(time.perf_counter() - self._started, 6),
+            "phases": {
+                name: {"seconds": round(seconds, 6), "calls": calls}
+                for name, (seconds, calls) in self.phases.items()
+            },
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def summary(self, script: str) -> str:
+        report = self.report(script)
+        lines = [f"Profile: {script} ({report['wall_seconds'] * 1000:.1f} ms wall)"]
+        if report["phases"]:
+            width = max(len(name) for name in report["phases"])
+            lines.append("  Phases:")
+            for name, entry in sorted(
+                report["phases"].items(), key=lambda item: -item[1]["seconds"]
+            ):
+                lines.append(
+                    f"    {name:<{width}}  {entry['seconds'] * 1000:9.1f} ms"
+                    f"  ×{entry['calls']}"
+                )
+        if report["counters"]:
+            width = max(len(name) for name in report["counters"])
+            lines.append("  Counters:")
+            for name, value in report["counters"].items():
+                lines.append(f"    {name:<{width}}  {value:>9}")
+        return "\n".join(lines)
+
+
+PROFILER = Profiler()
+
+
+def add_profile_arguments(parser) -> None:
+    """Add --profile, --profile-json and --cprofile to an argparse parser."""
+    group = parser.add_argument_group("profiling")
+    group.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print per-phase timings and counters to stderr",
+    )
+    group.add_argument(
+        "--profile-json",
+        metavar="FILE",
+        help="Write the timing report as JSON to FILE",
+    )
+    group.add_argument(
+        "--cprofile",
+        metavar="FILE",
+        help="Also run under cProfile and write pstats data to FILE",
+    )
+
+
+@contextlib.contextmanager
+def profile_session(args, script: str):
+    """
+    Enable PROFILER for the duration of the block when any profiling flag
+    is set, and emit the requested reports on exit (including sys.exit).
+    """
+    wanted = args.profile or args.profile_json or args.cprofile
+    if not wanted:
+        yield
+        return
+
+    PROFILER.enabled = True
+    PROFILER.reset()
+    cprofiler = None
+    if args.cprofile:
+        import cProfile
+
+        cprofiler = cProfile.Profile()
+        cprofiler.enable()
+    try:
+        yield
+    finally:
+        if cprofiler is not None:
+            cprofiler.disable()
+            cprofiler.dump_stats(args.cprofile)
+        if args.profile:
+            print(PROFILER.summary(script), file=sys.stderr)
+            if args.cprofile:
+                print(f"  cProfile data: {args.cprofile}", file=sys.stderr)
+        if args.profile_json:
+            import json
+
+            path = Path(args.profile_json)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(PROFILER.report(script), indent=2) + "\n", encoding="utf-8")
+        PROFILER.enabled = False
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Redirect Map Snapshot
+
+Compiles redirect-map.json into a binary snapshot that loads in near-constant
+time and is shared by the scripts that read the map (update_links.py,
+export_redirects.py).  redirect-map.json stays the editable source of truth;
+the snapshot is a derived artifact in .cache/ and is rebuilt automatically
+whenever the SHA-256 of the JSON file no longer matches the hash recorded in
+the snapshot header.
+
+Snapshot layout (little-endian):
+
+    header   magic "NCRMAP01" | sha256 of JSON (32 bytes) | rule count (u32)
+    records  one 20-byte record per rule, sorted by source:
+             source offset, source length, destination offset,
+             destination length (u32 each) | status code (u16) | flags (u8) | pad
+    order    rule count x u32 record index, in redirect-map.json order
+    strings  UTF-8 string blob referenced by the record offsets
+
+The file is memory-mapped; lookups binary-search the sorted records and only
+decode the strings they touch.
+
+Usage:
+    python redirect_snapshot.py redirect-map.json
+    python redirect_snapshot.py redirect-map.json --lookup /docs/v3/catch-all/overview/introduction
+
+Author: Documentation Team
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from atomic_write import write_atomic
+
+CACHE_DIR = ".cache"
+MAGIC = b"NCRMAP01"
+
+_HEADER = struct.Struct("<8s32sI")
+_RECORD = struct.Struct("<IIIIHBx")
+_INDEX = struct.Struct("<I")
+
+# Redirect type <-> 2-bit code stored in the flags byte.
+_TYPE_CODES = {None: 0, "permanent": 1, "temporary": 2}
+_TYPE_NAMES = {code: name for name, code in _TYPE_CODES.items()}
+
+# Optional boolean fields <-> 2-bit codes (0 = field absent).
+_BOOL_CODES = {None: 0, False: 1, True: 2}
+_BOOL_NAMES = {code: value for value, code in _BOOL_CODES.items()}
+
+
+# ---------------------------------------------------------------------------
+# Compilation
+# ---------------------------------------------------------------------------
+
+
+def snapshot_path_for(json_file: Path) -> Path:
+    """Return the snapshot location for a redirect map JSON file."""
+    json_file = Path(json_file).resolve()
+    return json_file.parent / CACHE_DIR / f"{json_file.stem}.snapshot"
+
+
+def _encode_flags(redirect: Dict, index: int) -> int:
+    redirect_type = redirect.get("type")
+    preserve_query = redirect.get("preserve_query")
+    preserve_fragment = redirect.get("preserve_fragment")
+    if redirect_type not in _TYPE_CODES:
+        raise ValueError(
+            f"Redirect #{index+1}: cannot snapshot type {redirect_type!r} "
+            "(run validate_redirects.py)"
+        )
+    for value in (preserve_query, preserve_fragment):
+        if value not in _BOOL_CODES:
+            raise ValueError(
+                f"Redirect #{index+1}: cannot snapshot non-boolean preserve flag {value!r}"
+            )
+    return (
+        _TYPE_CODES[redirect_type]
+        | _BOOL_CODES[preserve_query] << 2
+        | _BOOL_CODES[preserve_fragment] << 4
+    )
+
+
+def compile_snapshot(raw_json: bytes) -> bytes:
+    """Compile the bytes of a redirect map JSON file into snapshot bytes."""
+    data = json.loads(raw_json)
+    redirects = data.get("redirects", [])
+
+    blob = bytearray()
+    offsets: Dict[str, int] = {}
+
+    def intern(text: str) -> tuple:
+        encoded = text.encode("utf-8")
+        if text not in offsets:
+            offsets[text] = len(blob)
+            blob.extend(encoded)
+        return offsets[text], len(encoded)
+
+    entries = []
+    for i, redirect in enumerate(redirects):
+        source = redirect.get("source")
+        destination = redirect.get("destination")
+        status = redirect.get("status_code")
+        if not isinstance(source, str) or not isinstance(destination, str):
+            raise ValueError(
+                f"Redirect #{i+1}: source and destination must be strings "
+                "(run validate_redirects.py)"
+            )
+        if not isinstance(status, int) or not 0 <= status <= 0xFFFF:
+            raise ValueError(
+                f"Redirect #{i+1}: cannot snapshot status code {status!r} "
+                "(run validate_redirects.py)"
+            )
+        src_off, src_len = intern(source)
+        dst_off, dst_len = intern(destination)
+        entries.append(
+            (
+                source.encode("utf-8"),
+                i,
+                _RECORD.pack(
+                    src_off, src_len, dst_off, dst_len, status, _encode_flags(redirect, i)
+                ),
+            )
+        )
+
+    # Sort by encoded source so lookups can compare raw bytes; the file
+    # position breaks ties so the first of any duplicate sources wins.
+    entries.sort(key=lambda e: (e[0], e[1]))
+    order = [0] * len(entries)
+    for record_index, (_, position, _) in enumerate(entries):
+        order[position] = record_index
+
+    out = bytearray(_HEADER.pack(MAGIC, hashlib.sha256(raw_json).digest(), len(entries)))
+    for _, _, record in entries:
+        out += record
+    for record_index in order:
+        out += _INDEX.pack(record_index)
+    out += blob
+    return bytes(out)
+
+
+# ---------------------------------------------------------------------------
+# Loading
+# ---------------------------------------------------------------------------
+
+
+class RedirectTable:
+    """Read-only, memory-mapped view of a compiled redirect map."""
+
+    def __init__(self, buf):
+        self._buf = buf
+        magic, self.sha256, self._count = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a redirect map snapshot")
+        self._records_at = _HEADER.size
+        self._order_at = self._records_at + self._count * _RECORD.size
+        self._strings_at = self._order_at + self._count * _INDEX.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _string(self, offset: int, length: int) -> bytes:
+        start = self._strings_at + offset
+        return self._buf[start : start + length]
+
+    def _record(self, record_index: int) -> tuple:
+        return _RECORD.unpack_from(self._buf, self._records_at + record_index * _RECORD.size)
+
+    def _find(self, source: str) -> Optional[tuple]:
+        key = source.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            record = self._record(mid)
+            if self._string(record[0], record[1]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count:
+            record = self._record(lo)
+            if self._string(record[0], record[1]) == key:
+                return record
+        return None
+
+    def get(self, source: str) -> Optional[str]:
+        """Return the destination for `source`, or None if there is no rule."""
+        record = self._find(source)
+        if record is None:
+            return None
+        return self._string(record[2], record[3]).decode("utf-8")
+
+    def find_rule(self, source: str) -> Optional[Dict]:
+        """Return the full rule for `source` as a dict, or None."""
+        record = self._find(source)
+        return None if record is None else self._rule(record)
+
+    def __contains__(self, source: str) -> bool:
+        return self._find(source) is not None
+
+    def _rule(self, record: tuple) -> Dict:
+        src_off, src_len, dst_off, dst_len, status, flags = record
+        rule = {
+            "source": self._string(src_off, src_len).decode("utf-8"),
+            "destination": self._string(dst_off, dst_len).decode("utf-8"),
+        }
+        redirect_type = _TYPE_NAMES[flags & 0b11]
+        if redirect_type is not None:
+            rule["type"] = redirect_type
+        rule["status_code"] = status
+        for shift, field in ((2, "preserve_query"), (4, "preserve_fragment")):
+            value = _BOOL_NAMES[(flags >> shift) & 0b11]
+            if value is not None:
+                rule[field] = value
+        return rule
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Yield rules as dicts in redirect-map.json order."""
+        for position in range(self._count):
+            (record_index,) = _INDEX.unpack_from(
+                self._buf, self._order_at + position * _INDEX.size
+            )
+            yield self._rule(self._record(record_index))
+
+
+def _map_file(path: Path):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def load_redirect_table(json_file, rebuild: bool = False) -> RedirectTable:
+    """
+    Return a RedirectTable for `json_file`, compiling the snapshot if needed.
+
+    The snapshot is reused only when the SHA-256 recorded in its header
+    matches the current JSON file.  Raises json.JSONDecodeError for invalid
+    JSON and ValueError for rules that cannot be represented.
+    """
+    json_file = Path(json_file)
+    raw_json = json_file.read_bytes()
+    digest = hashlib.sha256(raw_json).digest()
+    snapshot = snapshot_path_for(json_file)
+
+    if not rebuild and snapshot.exists():
+        try:
+            table = RedirectTable(_map_file(snapshot))
+            if table.sha256 == digest:
+                return table
+        except (ValueError, struct.error):
+            pass  # Corrupt or foreign file: recompile below
+
+    write_atomic(snapshot, compile_snapshot(raw_json))
+    return RedirectTable(_map_file(snapshot))
+
+
+def main():
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent if script_dir.name == "scripts" else script_dir
+    os.chdir(project_root)
+
+    if len(sys.argv) < 2:
+        print("Usage: python redirect_snapshot.py redirect-map.json [--lookup SOURCE] [--rebuild]")
+        sys.exit(1)
+
+    json_file = sys.argv[1]
+    if not Path(json_file).exists():
+        print(f"Error: File not found: {json_file}")
+        sys.exit(1)
+
+    try:
+        table = load_redirect_table(json_file, rebuild="--rebuild" in sys.argv)
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON in {json_file}")
+        print(f"  {e}")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    snapshot = snapshot_path_for(Path(json_file))
+    print(f"✓ Snapshot: {snapshot.relative_to(project_root)}")
+    print(f"  Rules: {len(table)}")
+    print(f"  Size: {snapshot.stat().st_size} bytes")
+    print(f"  Source SHA-256: {table.sha256.hex()}")
+
+    if "--lookup" in sys.argv:
+        lookup_idx = sys.argv.index("--lookup")
+        if lookup_idx + 1 < len(sys.argv):
+            source = sys.argv[lookup_idx + 1]
+            destination = table.get(source)
+            print()
+            if destination is None:
+                print(f"✗ No rule for {source}")
+                sys.exit(1)
+            print(f"{source} -> {destination}")
+
+
+if __name__ == "__main__":
+    main()
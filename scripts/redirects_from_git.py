@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Propose redirect rules for pages renamed or deleted between two git refs.
+
+Runs one `git diff --find-renames --name-status` between BASE and HEAD and
+maps page files to URL paths with the generate_sitemap.py convention
+(news-api/how-to/x.mdx -> /docs/news-api/how-to/x).  Then:
+
+- each renamed page gets a permanent redirect from its old URL to its new
+  one, merged into redirect-map.json: identical rules are skipped, rules that
+  pointed at the old URL are retargeted so no chain forms, and conflicting
+  rules are reported
+- each deleted page must already be covered by a redirect rule (or a
+  wildcard rule); otherwise the check fails
+- rules whose destination is a deleted page are reported, since they would
+  now lead to a 404
+
+Snippets are not pages and are ignored.  Merging is linear in the size of
+the diff plus the size of the map.
+
+Without --write, the command fails when any proposed rule is missing from
+the map, so CI catches renames that nobody added a redirect for.
+
+Usage:
+    python scripts/redirects_from_git.py --base origin/main          # check
+    python scripts/redirects_from_git.py --base origin/main --write  # add the rules
+    python scripts/redirects_from_git.py --base v1.2.0 --head v1.3.0 --json
+
+Requirements:
+    Python 3.10+, stdlib only; git
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from backlinks import PAGE_SUFFIXES
+from generate_sitemap import BASE_URL
+from restructure_plan import (
+    REDIRECT_MAP_PATH,
+    Move,
+    update_redirect_map,
+    validate_redirect_text,
+)
+from snippet_graph import is_snippet
+
+# URL path prefix of every page, e.g. "/docs" for BASE_URL .../docs.
+URL_PREFIX = urlsplit(BASE_URL).path.rstrip("/")
+
+# ---------------------------------------------------------------------------
+# Git
+# ---------------------------------------------------------------------------
+
+
+def page_of(path: str) -> str | None:
+    """Page path of a repo file (no extension), or None if it is not a page."""
+    if is_snippet(path) or path.rsplit("/", 1)[-1] == "README.md":
+        return None
+    for suffix in PAGE_SUFFIXES:
+        if path.endswith(suffix):
+            return path[: -len(suffix)]
+    return None
+
+
+def page_url(page: str) -> str:
+    return f"{URL_PREFIX}/{page}"
+
+
+def changed_pages(root: Path, base: str, head: str) -> tuple[list[Move], list[str]]:
+    """
+    Return (renamed pages, deleted pages) between `base` and `head`.
+
+    Uses the merge base of the two refs, like a pull request diff.  A page
+    renamed to something that is not a page counts as deleted.
+    """
+    result = subprocess.run(
+        [
+            "git",
+            "diff",
+            "--find-renames",
+            "--name-status",
+            "--diff-filter=RD",
+            "-z",
+            f"{base}...{head}",
+        ],
+        cwd=root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    fields = result.stdout.split("\0")
+    renames: list[Move] = []
+    deleted: list[str] = []
+    i = 0
+    while i < len(fields) - 1:
+        status = fields[i]
+        if status.startswith("R"):
+            old, new = fields[i + 1], fields[i + 2]
+            i += 3
+            old_page, new_page = page_of(old), page_of(new)
+            if old_page is None:
+                continue
+            if new_page is None:
+                deleted.append(old_page)
+            elif new_page != old_page:
+                renames.append(Move(old_page, new_page, old[len(old_page) :]))
+        else:
+            path = fields[i + 1]
+            i += 2
+            page = page_of(path)
+            if page is not None:
+                deleted.append(page)
+    return renames, deleted
+
+
+# ---------------------------------------------------------------------------
+# Checks
+# ---------------------------------------------------------------------------
+
+
+def _wildcard_prefixes(redirect_map: dict) -> list[str]:
+    return [
+        rule["pattern"][:-1]
+        for rule in redirect_map.get("wildcard_rules", [])
+        if rule.get("pattern", "").endswith("*")
+    ]
+
+
+def check_deleted(redirect_map: dict, deleted: list[str]) -> list[str]:
+    """Return one error per deleted page that no rule covers, or that a rule targets."""
+    sources = {rule.get("source") for rule in redirect_map.get("redirects", [])}
+    prefixes = _wildcard_prefixes(redirect_map)
+    deleted_urls = {page_url(page): page for page in deleted}
+
+    errors = []
+    for url, page in deleted_urls.items():
+        if url not in sources and not any(url.startswith(p) for p in prefixes):
+            errors.append(f"{url}: page deleted with no redirect ({page})")
+    for rule in redirect_map.get("redirects", []):
+        destination = rule.get("destination", "").split("#", 1)[0].split("?", 1)[0]
+        if destination.rstrip("/") in deleted_urls:
+            errors.append(f"{rule.get('source')}: redirects to deleted page {destination}")
+    return errors
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Propose redirect rules for pages renamed or deleted in git.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("--base", required=True, help="Base git ref (e.g. origin/main)")
+    parser.add_argument("--head", default="HEAD", help="Head git ref (default: HEAD)")
+    parser.add_argument(
+        "--write", action="store_true", help="Merge the proposed rules into redirect-map.json"
+    )
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args()
+
+    root = Path(__file__).resolve().parent.parent
+    try:
+        renames, deleted = changed_pages(root, args.base, args.head)
+    except subprocess.CalledProcessError as exc:
+        print(f"Error: git diff failed: {exc.stderr.strip()}", file=sys.stderr)
+        sys.exit(1)
+
+    map_path = root / REDIRECT_MAP_PATH
+    redirect_map = json.loads(map_path.read_text(encoding="utf-8"))
+    # Merge errors block --write; deleted-page errors only fail the check.
+    merge_errors: list[str] = []
+    added, retargeted = update_redirect_map(redirect_map, renames, merge_errors)
+    new_text = json.dumps(redirect_map, indent=2, ensure_ascii=False) + "\n"
+    pending = bool(added or retargeted)
+    if pending:
+        validate_redirect_text(root, new_text, merge_errors)
+    errors = merge_errors + check_deleted(redirect_map, deleted)
+
+    if args.json:
+        json.dump(
+            {
+                "renamed": [[page_url(m.source), page_url(m.destination)] for m in renames],
+                "deleted": [page_url(page) for page in deleted],
+                "added": added,
+                "retargeted": retargeted,
+                "errors": errors,
+            },
+            sys.stdout,
+            indent=2,
+        )
+        sys.stdout.write("\n")
+    else:
+        print(
+            f"Compared {args.base}...{args.head}: {len(renames)} renamed page(s), "
+            f"{len(deleted)} deleted page(s)."
+        )
+        for rule in added:
+            print(f"  + {rule['source']} → {rule['destination']}")
+        if retargeted:
+            print(f"  ↻ {retargeted} existing rule(s) retargeted to the new URLs")
+        for error in errors:
+            print(f"✗  {error}")
+
+    if args.write and pending and not merge_errors:
+        map_path.write_text(new_text, encoding="utf-8")
+        pending = False
+        if not args.json:
+            print(f"✓  Updated {REDIRECT_MAP_PATH} ({len(added)} added, {retargeted} retargeted).")
+
+    if errors:
+        sys.exit(1)
+    if pending:
+        if not args.json:
+            print(f"✗  {REDIRECT_MAP_PATH} is missing these rules. Run with --write to add them.")
+        sys.exit(1)
+    if not args.json:
+        print("✓  Every renamed or deleted page has a redirect.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""Replay CDN/nginx access logs against the redirect map and navigation.
+
+Streams one or more access logs in combined log format (plain or gzipped)
+line by line and reports, for every rule in redirect-map.json:
+
+- how many requests hit the rule
+- how many redirect hops a client needs to reach the final destination
+- whether the final destination is a page listed in docs.json
+
+It also reports traffic per navigation page, the most requested 404 paths
+that match neither a page nor a redirect source, and dead rules that saw no
+traffic at all.
+
+Memory stays constant regardless of log size: counters are keyed by rule and
+page (both bounded by the repo), and unmatched 404 paths are tracked with a
+fixed-size heavy-hitters counter.
+
+--workers parallelizes across files only: each file is replayed by a single
+process, so one large log gets no speedup.  Split it first (for example with
+`split -n l/4`) or rely on the rotated files a CDN already produces.
+
+Usage:
+    python scripts/replay_access_log.py access.log.gz
+    python scripts/replay_access_log.py logs/*.gz --workers 4
+    python scripts/replay_access_log.py logs/*.gz --json replay-report.json
+
+Requirements:
+    Python 3.8+, stdlib only
+"""
+
+import argparse
+import gzip
+import heapq
+import json
+import re
+import sys
+from multiprocessing import Pool
+from pathlib import Path
+
+from generate_sitemap import collect_pages
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+DOCS_JSON_PATH = "docs.json"
+REDIRECT_MAP_PATH = "redirect-map.json"
+DOCS_PREFIX = "/docs"
+
+# Redirect chains longer than this are treated as loops when counting hops.
+MAX_HOPS = 20
+
+# Number of distinct unmatched 404 paths tracked at once.
+TOP_404_CAPACITY = 1000
+
+# Combined log format:
+#   host ident user [time] "METHOD target PROTO" status bytes "referer" "agent"
+_LINE_RE = re.compile(
+    rb'^\S+ \S+ \S+ \[[^\]]*\] "(?P<method>[A-Z]+) (?P<target>\S+)[^"]*" '
+    rb"(?P<status>\d{3}) "
+)
+
+# ---------------------------------------------------------------------------
+# Lookup tables
+# ---------------------------------------------------------------------------
+
+
+def normalize_path(target: str) -> str:
+    """Strip query string, fragment and trailing slash from a request target."""
+    path = target.split("?", 1)[0].split("#", 1)[0]
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+    return path
+
+
+def load_tables(root: Path) -> tuple[dict[str, str], set[str]]:
+    """Return (source -> destination, set of page URL paths)."""
+    redirect_map = json.loads((root / REDIRECT_MAP_PATH).read_text(encoding="utf-8"))
+    redirects = {
+        normalize_path(r["source"]): normalize_path(r["destination"])
+        for r in redirect_map.get("redirects", [])
+    }
+    docs_json = json.loads((root / DOCS_JSON_PATH).read_text(encoding="utf-8"))
+    pages = {f"{DOCS_PREFIX}/{p}" for p in collect_pages(docs_json)}
+    return redirects, pages
+
+
+def follow_chain(source: str, redirects: dict[str, str]) -> tuple[int, str]:
+    """Return (hop count, final destination) for a redirect source.
+
+    A chain that revisits a path or exceeds MAX_HOPS is reported with a hop
+    count of -1 so that loops stand out in the report.
+    """
+    seen = {source}
+    current = source
+    hops = 0
+    while current in redirects:
+        current = redirects[current]
+        hops += 1
+        if current in seen or hops > MAX_HOPS:
+            return -1, current
+        seen.add(current)
+    return hops, current
+
+
+# ---------------------------------------------------------------------------
+# Bounded heavy-hitters counter
+# ---------------------------------------------------------------------------
+
+
+class TopCounter:
+    """Space-saving counter: approximate top-k counts in fixed memory.
+
+    Keeps at most `capacity` keys.  When a new key arrives at capacity, the
+    key with the smallest count is evicted and the newcomer inherits its
+    count (plus one), which bounds the over-estimate of any reported count by
+    the evicted minimum.
+
+    The minimum is found through a heap holding one (count, key) entry per
+    key.  Increments do not touch the heap, so an entry may be stale (below
+    the key's count); eviction re-pushes stale entries until the top one is
+    current.  Each new key costs O(log capacity) amortized.
+    """
+
+    def __init__(self, capacity: int = TOP_404_CAPACITY):
+        self.capacity = capacity
+        self.counts: dict[str, int] = {}
+        self._heap: list[tuple[int, str]] = []
+
+    def add(self, key: str, amount: int = 1) -> None:
+        if key in self.counts:
+            self.counts[key] += amount
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[key] = amount
+            heapq.heappush(self._heap, (amount, key))
+            return
+        while True:
+            floor, victim = self._heap[0]
+            current = self.counts[victim]
+            if current == floor:
+                break
+            heapq.heapreplace(self._heap, (current, victim))
+        del self.counts[victim]
+        self.counts[key] = floor + amount
+        heapq.heapreplace(self._heap, (floor + amount, key))
+
+    def merge(self, other: "TopCounter") -> None:
+        for key, amount in other.counts.items():
+            self.add(key, amount)
+
+    def most_common(self, n: int) -> list[tuple[str, int]]:
+        return sorted(self.counts.items(), key=lambda kv: (-kv[1], kv[0]))[:n]
+
+
+# ---------------------------------------------------------------------------
+# Log replay
+# ---------------------------------------------------------------------------
+
+
+class ReplayStats:
+    """Counters accumulated while replaying one or more log files."""
+
+    def __init__(self):
+        self.lines = 0
+        self.unparsed = 0
+        self.rule_hits: dict[str, int] = {}
+        self.page_hits: dict[str, int] = {}
+        self.unmatched_404 = TopCounter()
+        self.unmatched_404_total = 0
+
+    def merge(self, other: "ReplayStats") -> None:
+        self.lines += other.lines
+        self.unparsed += other.unparsed
+        for key, value in other.rule_hits.items():
+            self.rule_hits[key] = self.rule_hits.get(key, 0) + value
+        for key, value in other.page_hits.items():
+            self.page_hits[key] = self.page_hits.get(key, 0) + value
+        self.unmatched_404.merge(other.unmatched_404)
+        self.unmatched_404_total += other.unmatched_404_total
+
+
+def _open_log(path: Path):
+    """Open a log file in binary mode, transparently handling gzip."""
+    with path.open("rb") as fh:
+        magic = fh.read(2)
+    if magic == b"\x1f\x8b":
+        return gzip.open(path, "rb")
+    return path.open("rb")
+
+
+def replay_file(
+    path: Path, redirects: dict[str, str], pages: set[str]
+) -> ReplayStats:
+    """Stream one log file and return its counters."""
+    stats = ReplayStats()
+    rule_hits = stats.rule_hits
+    page_hits = stats.page_hits
+    match_line = _LINE_RE.match
+
+    with _open_log(path) as fh:
+        for raw in fh:
+            stats.lines += 1
+            match = match_line(raw)
+            if not match:
+                stats.unparsed += 1
+                continue
+            target = normalize_path(match.group("target").decode("latin-1"))
+            if target in redirects:
+                rule_hits[target] = rule_hits.get(target, 0) + 1
+            elif target in pages:
+                page_hits[target] = page_hits.get(target, 0) + 1
+            elif match.group("status") == b"404":
+                stats.unmatched_404.add(target)
+                stats.unmatched_404_total += 1
+    return stats
+
+
+# Worker state is installed once per process so the tables are not pickled
+# for every file.
+_worker_tables: tuple[dict[str, str], set[str]] = ({}, set())
+
+
+def _init_worker(redirects: dict[str, str], pages: set[str]) -> None:
+    global _worker_tables
+    _worker_tables = (redirects, pages)
+
+
+def _replay_in_worker(path: Path) -> ReplayStats:
+    return replay_file(path, *_worker_tables)
+
+
+def replay(
+    paths: list[Path], redirects: dict[str, str], pages: set[str], workers: int = 1
+) -> ReplayStats:
+    """Replay all log files, optionally one file per worker process.
+
+    Parallelism is per file; a single file is always replayed by one process.
+    """
+    total = ReplayStats()
+    if workers > 1 and len(paths) > 1:
+        with Pool(workers, initializer=_init_worker, initargs=(redirects, pages)) as pool:
+            for stats in pool.imap_unordered(_replay_in_worker, paths):
+                total.merge(stats)
+    else:
+        for path in paths:
+            total.merge(replay_file(path, redirects, pages))
+    return total
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+
+def build_report(
+    stats: ReplayStats, redirects: dict[str, str], pages: set[str], top: int
+) -> dict:
+    """Assemble the JSON-serialisable report."""
+    rules = []
+    for source, destination in redirects.items():
+        hops, final = follow_chain(source, redirects)
+        rules.append(
+            {
+                "source": source,
+                "destination": destination,
+                "hits": stats.rule_hits.get(source, 0),
+                "hops": hops,
+                "final_destination": final,
+                "final_is_page": final in pages,
+            }
+        )
+    rules.sort(key=lambda r: (-r["hits"], r["source"]))
+
+    return {
+        "lines": stats.lines,
+        "unparsed_lines": stats.unparsed,
+        "redirect_hits": sum(stats.rule_hits.values()),
+        "page_hits": sum(stats.page_hits.values()),
+        "unmatched_404_hits": stats.unmatched_404_total,
+        "rules": rules,
+        "dead_rules": sorted(r["source"] for r in rules if r["hits"] == 0),
+        "top_pages": sorted(
+            stats.page_hits.items(), key=lambda kv: (-kv[1], kv[0])
+        )[:top],
+        "top_unmatched_404": stats.unmatched_404.most_common(top),
+    }
+
+
+def print_report(report: dict, top: int) -> None:
+    print("=" * 70)
+    print("Access Log Replay")
+    print("=" * 70)
+    print(f"Lines read:          {report['lines']}")
+    print(f"Unparsed lines:      {report['unparsed_lines']}")
+    print(f"Redirect hits:       {report['redirect_hits']}")
+    print(f"Page hits:           {report['page_hits']}")
+    print(f"Unmatched 404 hits:  {report['unmatched_404_hits']}")
+    print()
+
+    print(f"Top {top} redirect rules:")
+    for rule in report["rules"][:top]:
+        if rule["hits"] == 0:
+            break
+        hops = "loop" if rule["hops"] < 0 else f"{rule['hops']} hop(s)"
+        marker = "" if rule["final_is_page"] else "  ⚠ final destination is not a page"
+        print(f"  {rule['hits']:>8}  {rule['source']}  ({hops}){marker}")
+    print()
+
+    multi_hop = [r for r in report["rules"] if r["hits"] and r["hops"] != 1]
+    if multi_hop:
+        print(f"⚠ {len(multi_hop)} rule(s) with traffic need more than one hop:")
+        for rule in multi_hop[:top]:
+            hops = "loop" if rule["hops"] < 0 else f"{rule['hops']} hops"
+            print(f"  {rule['hits']:>8}  {rule['source']} -> {rule['final_destination']} ({hops})")
+        print()
+
+    print(f"Top {top} unmatched 404 paths:")
+    for path, hits in report["top_unmatched_404"]:
+        print(f"  {hits:>8}  {path}")
+    print()
+
+    dead = report["dead_rules"]
+    print(f"Dead rules (zero traffic): {len(dead)} of {len(report['rules'])}")
+    for source in dead[:top]:
+        print(f"  - {source}")
+    if len(dead) > top:
+        print(f"  ... and {len(dead) - top} more (see --json output)")
+    print()
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Replay access logs against redirect-map.json and docs.json.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("logs", nargs="+", metavar="LOG", help="Access log file(s), plain or .gz")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Replay up to N files in parallel processes, one file each (default: 1)",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=20,
+        metavar="N",
+        help="Number of entries shown per section (default: 20)",
+    )
+    parser.add_argument("--json", metavar="FILE", help="Write the full report as JSON")
+    args = parser.parse_args()
+
+    root = Path(__file__).resolve().parent.parent
+
+    paths = [Path(p) for p in args.logs]
+    missing = [str(p) for p in paths if not p.is_file()]
+    if missing:
+        print(f"Error: log file(s) not found: {', '.join(missing)}", file=sys.stderr)
+        sys.exit(1)
+
+    redirects, pages = load_tables(root)
+    stats = replay(paths, redirects, pages, workers=args.workers)
+    report = build_report(stats, redirects, pages, args.top)
+    print_report(report, args.top)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"✓  Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
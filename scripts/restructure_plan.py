@@ -0,0 +1,612 @@
+#!/usr/bin/env python3
+"""Apply a declarative restructure plan in one transactional pass.
+
+Replaces the historical restructure.sh -> update_links.py -> hand-edited
+redirect-map.json flow.  A plan lists old -> new page paths:
+
+    {
+      "moves": [
+        {"from": "news-api/how-to/old-page", "to": "news-api/guides/new-page"},
+        {"from": "news-api/troubleshooting", "to": "news-api/support"}
+      ]
+    }
+
+Paths are page paths as they appear in docs.json (no extension, no leading
+slash); a directory moves every page below it.  Snippets can be moved too.
+
+In one pass, with every file read once and written at most once:
+
+1. Expand and check the plan (sources exist, no two moves collide, no
+   destination overwrites a page that stays)
+2. Rewrite links to moved pages in every page, snippet and YAML file, with
+   the same link detection and normalization as backlinks.py: Markdown
+   links, `href` attributes, snippet imports, YAML `url:` fields and full
+   newscatcherapi.com/docs URLs; anchors and query strings are kept
+3. Update docs.json navigation entries and URLs
+4. Append a permanent redirect per moved page to redirect-map.json and
+   retarget existing rules that pointed at a moved page, so no chain forms
+5. Validate the result in memory: the redirect map (schema, duplicates,
+   cycles), every docs.json page has a file, no link still points at a
+   moved page
+
+Nothing is written unless validation passes.  With --write, the original
+content of every touched file is saved to a journal in .cache/restructure/
+first; if a write fails, the files already written are restored.
+`--rollback` reverts the last applied plan.
+
+Afterwards, regenerate llms.txt and sitemap.xml (`npm run llms:generate`,
+`npm run sitemap:generate`).
+
+Usage:
+    python scripts/restructure_plan.py plan.json              # summary, dry run
+    python scripts/restructure_plan.py plan.json --diff       # unified diff, dry run
+    python scripts/restructure_plan.py plan.json --write
+    python scripts/restructure_plan.py --move news-api/how-to/a news-api/how-to/b --write
+    python scripts/restructure_plan.py --rollback
+
+Requirements:
+    Python 3.10+, stdlib only
+"""
+
+import argparse
+import contextlib
+import difflib
+import hashlib
+import io
+import json
+import re
+import sys
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from atomic_write import write_atomic
+from backlinks import (
+    DOCS_PREFIX,
+    PAGE_SUFFIXES,
+    iter_link_sources,
+    line_starts,
+    normalize_target,
+    text_links,
+)
+from docs_nav import DOCS_JSON_PATH, dump_docs_json
+from generate_sitemap import collect_pages
+from snippet_graph import is_snippet
+from validate_redirects import DEFAULT_SCHEMA, StreamingRedirectValidator
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+REDIRECT_MAP_PATH = "redirect-map.json"
+JOURNAL_DIR = ".cache/restructure"
+JOURNAL_VERSION = 1
+
+# ---------------------------------------------------------------------------
+# Plan
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Move:
+    source: str  # page path, e.g. news-api/how-to/old-page
+    destination: str
+    suffix: str  # file extension of the source page
+
+    @property
+    def source_file(self) -> str:
+        return self.source + self.suffix
+
+    @property
+    def destination_file(self) -> str:
+        return self.destination + self.suffix
+
+
+def normalize_page(value: str) -> str:
+    """Accept a page path, site path, /docs URL path or file; return the page path."""
+    value = value.strip().strip("/")
+    if value.startswith("docs/"):
+        value = value[len("docs/") :]
+    for suffix in PAGE_SUFFIXES:
+        if value.endswith(suffix):
+            return value[: -len(suffix)]
+    return value
+
+
+def load_plan(path: Path) -> list[tuple[str, str]]:
+    """Read (from, to) pairs from a plan file ({"moves": [...]} or a bare list)."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    moves = data.get("moves", []) if isinstance(data, dict) else data
+    pairs = []
+    for item in moves:
+        if isinstance(item, dict):
+            pairs.append((item["from"], item["to"]))
+        else:
+            source, destination = item
+            pairs.append((source, destination))
+    return pairs
+
+
+def _page_file(root: Path, page: str) -> str | None:
+    for suffix in PAGE_SUFFIXES:
+        if (root / (page + suffix)).is_file():
+            return page + suffix
+    return None
+
+
+def expand_moves(
+    root: Path, pairs: list[tuple[str, str]], sources: list[str], errors: list[str]
+) -> list[Move]:
+    """
+    Turn plan pairs into one Move per page file and check them.
+
+    `sources` lists every page, snippet and YAML file in the repo.
+    """
+    moves: list[Move] = []
+    for raw_source, raw_destination in pairs:
+        source, destination = normalize_page(raw_source), normalize_page(raw_destination)
+        if not source or not destination:
+            errors.append(f"{raw_source} -> {raw_destination}: empty path")
+            continue
+        if source == destination:
+            errors.append(f"{source}: source and destination are the same")
+            continue
+        if (root / source).is_dir():
+            below = [
+                rel
+                for rel in sources
+                if rel.startswith(source + "/") and rel.endswith(PAGE_SUFFIXES)
+            ]
+            if not below:
+                errors.append(f"{source}/: directory contains no pages")
+            for rel in below:
+                page = normalize_page(rel)
+                suffix = rel[len(page) :]
+                moves.append(Move(page, destination + page[len(source) :], suffix))
+            continue
+        file = _page_file(root, source)
+        if file is None:
+            errors.append(f"{source}: no such page (.mdx or .md)")
+            continue
+        moves.append(Move(source, destination, file[len(source) :]))
+
+    by_source: dict[str, Move] = {}
+    by_destination: dict[str, Move] = {}
+    for move in moves:
+        if move.source in by_source:
+            errors.append(f"{move.source}: moved more than once")
+        by_source[move.source] = move
+        if move.destination in by_destination:
+            errors.append(
+                f"{move.destination}: destination of both {by_destination[move.destination].source} "
+                f"and {move.source}"
+            )
+        by_destination[move.destination] = move
+
+    for move in moves:
+        if move.destination in by_source:
+            continue  # the page there is moved away by the same plan
+        existing = _page_file(root, move.destination)
+        if existing is not None:
+            errors.append(f"{move.source} -> {move.destination}: {existing} already exists")
+    return moves
+
+
+# ---------------------------------------------------------------------------
+# Rewriting
+# ---------------------------------------------------------------------------
+
+
+def retarget_url(url: str, new_path: str) -> str:
+    """Point `url` at site path `new_path`, keeping its form, anchor and query."""
+    base = re.split(r"[?#]", url, maxsplit=1)[0]
+    tail = url[len(base) :]
+    parts = urlsplit(base)
+    extension = next((s for s in PAGE_SUFFIXES if base.endswith(s)), "")
+    if parts.netloc:
+        scheme = f"{parts.scheme}:" if parts.scheme else ""
+        prefix = f"{scheme}//{parts.netloc}{DOCS_PREFIX}"
+    elif base.startswith(DOCS_PREFIX + "/"):
+        prefix = DOCS_PREFIX
+    else:
+        prefix = ""
+    trailing = "/" if base.endswith("/") and len(base) > 1 else ""
+    return f"{prefix}{new_path}{extension}{trailing}{tail}"
+
+
+def rewrite_links(
+    rel: str, text: str, url_map: dict[str, str], live: set[str], stale: list[str]
+) -> tuple[str, int]:
+    """
+    Rewrite links in one file; return (new text, links rewritten).
+
+    Links that still point at a moved page afterwards (a target in `url_map`
+    that is not `live` again) are appended to `stale` as "file:line".
+    """
+    out = []
+    count = 0
+    at = 0
+    # Whole-file scan: Markdown link text may wrap onto the next line.
+    for url, _, _, url_at in text_links(rel, text):
+        if url_at < at:
+            continue  # Same URL matched by two patterns
+        target = normalize_target(url, rel)
+        if target in url_map:
+            out.append(text[at:url_at])
+            out.append(retarget_url(url, url_map[target]))
+            at = url_at + len(url)
+            count += 1
+    if not count:
+        return text, 0
+    out.append(text[at:])
+    text = "".join(out)
+
+    starts = None
+    for url, _, link_at, _ in text_links(rel, text):
+        target = normalize_target(url, rel)
+        if target in url_map and target not in live:
+            if starts is None:
+                starts = line_starts(text)
+            stale.append(f"{rel}:{bisect_right(starts, link_at)}")
+    return text, count
+
+
+def rewrite_docs_json(node, page_map: dict[str, str], url_map: dict[str, str]):
+    """Return (copy of `node` with moved pages and URLs updated, changes)."""
+    if isinstance(node, dict):
+        changes = 0
+        result = {}
+        for key, value in node.items():
+            result[key], n = rewrite_docs_json(value, page_map, url_map)
+            changes += n
+        return result, changes
+    if isinstance(node, list):
+        changes = 0
+        result = []
+        for value in node:
+            item, n = rewrite_docs_json(value, page_map, url_map)
+            result.append(item)
+            changes += n
+        return result, changes
+    if isinstance(node, str):
+        if node in page_map:
+            return page_map[node], 1
+        if node.startswith(("/", "http://", "https://")):
+            target = normalize_target(node)
+            if target in url_map:
+                return retarget_url(node, url_map[target]), 1
+    return node, 0
+
+
+def update_redirect_map(
+    redirect_map: dict, moves: list[Move], errors: list[str]
+) -> tuple[list[dict], int]:
+    """
+    Add a redirect per moved page and retarget rules pointing at moved pages.
+
+    Updates `redirect_map` in place; returns (added rules, retargeted count).
+    """
+    page_moves = [m for m in moves if not is_snippet(m.source)]
+    url_map = {f"{DOCS_PREFIX}/{m.source}": f"{DOCS_PREFIX}/{m.destination}" for m in page_moves}
+    live = {f"{DOCS_PREFIX}/{m.destination}" for m in page_moves}
+    redirects = redirect_map.setdefault("redirects", [])
+
+    retargeted = 0
+    existing: dict[str, str] = {}
+    for rule in redirects:
+        destination = rule.get("destination", "")
+        base = re.split(r"[?#]", destination, maxsplit=1)[0].rstrip("/")
+        if base in url_map:
+            rule["destination"] = url_map[base] + destination[len(base) :].lstrip("/")
+            retargeted += 1
+        if rule.get("source") in live:
+            errors.append(
+                f"redirect-map.json: rule {rule['source']} -> {rule.get('destination')} "
+                f"would hide the page moved there"
+            )
+        existing[rule.get("source")] = rule.get("destination")
+
+    added = []
+    for source, destination in url_map.items():
+        if source in live:
+            continue  # another page moves into this path
+        if source in existing:
+            if existing[source] != destination:
+                errors.append(
+                    f"redirect-map.json: {source} already redirects to {existing[source]}"
+                )
+            continue  # an identical rule is already present
+        added.append(
+            {"source": source, "destination": destination, "type": "permanent", "status_code": 301}
+        )
+    redirects.extend(added)
+    metadata = redirect_map.get("metadata")
+    if isinstance(metadata, dict) and "total_redirects" in metadata:
+        metadata["total_redirects"] = len(redirects)
+    return added, retargeted
+
+
+def validate_redirect_text(root: Path, text: str, errors: list[str]) -> None:
+    """Run the streaming redirect validator on the new map, quietly."""
+    schema = json.loads((root / DEFAULT_SCHEMA).read_text(encoding="utf-8"))
+    validator = StreamingRedirectValidator(text, schema)
+    with contextlib.redirect_stdout(io.StringIO()):
+        validator.validate_all()
+    errors.extend(f"redirect-map.json: {error}" for error in validator.errors)
+
+
+# ---------------------------------------------------------------------------
+# Transaction
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class Change:
+    path: str
+    before: str | None  # None: file is created
+    after: str | None  # None: file is deleted
+    links: int = 0
+    moved_from: str | None = None
+    base: str | None = None  # content the diff is shown against, if not `before`
+
+
+def plan_changes(
+    root: Path, pairs: list[tuple[str, str]], errors: list[str]
+) -> tuple[list[Move], list[Change], dict]:
+    """Compute every file change of a plan in memory; return (moves, changes, stats)."""
+    sources = list(iter_link_sources(root))
+    moves = expand_moves(root, pairs, sources, errors)
+    if errors:
+        return moves, [], {}
+
+    url_map = {"/" + m.source: "/" + m.destination for m in moves}
+    live = {"/" + m.destination for m in moves}
+    moved = {m.source_file for m in moves}
+    stale: list[str] = []
+
+    # Each file is read once; only changed and moved files are kept.
+    contents: dict[str, tuple[str, str, int]] = {}  # path -> (before, after, links)
+    for rel in sources:
+        text = (root / rel).read_bytes().decode("utf-8")
+        new_text, links = rewrite_links(rel, text, url_map, live, stale)
+        if new_text != text or rel in moved:
+            contents[rel] = (text, new_text, links)
+
+    changes: dict[str, Change] = {
+        rel: Change(rel, before, after, links)
+        for rel, (before, after, links) in contents.items()
+        if rel not in moved
+    }
+    destinations = {m.destination_file for m in moves}
+    for move in moves:
+        before, after, links = contents[move.source_file]
+        # A destination that exists is a page moved away by the same plan.
+        existing = contents.get(move.destination_file, (None,))[0]
+        changes[move.destination_file] = Change(
+            move.destination_file, existing, after, links, moved_from=move.source_file, base=before
+        )
+        if move.source_file not in destinations:
+            changes[move.source_file] = Change(move.source_file, before, None)
+
+    stats = {"moves": len(moves), "links": sum(c.links for c in changes.values())}
+    errors.extend(f"{where}: link still points at a moved page" for where in stale)
+
+    # docs.json
+    docs_text = (root / DOCS_JSON_PATH).read_text(encoding="utf-8")
+    docs_json = json.loads(docs_text)
+    page_map = {m.source: m.destination for m in moves}
+    new_docs, stats["docs_json"] = rewrite_docs_json(docs_json, page_map, url_map)
+    new_docs_text = dump_docs_json(new_docs)
+    if new_docs_text != docs_text:
+        changes[DOCS_JSON_PATH] = Change(DOCS_JSON_PATH, docs_text, new_docs_text)
+
+    final_files = (set(sources) | {c.path for c in changes.values() if c.after is not None}) - {
+        c.path for c in changes.values() if c.after is None
+    }
+    before_missing = {p for p in collect_pages(docs_json) if _page_file(root, p) is None}
+    for page in collect_pages(new_docs):
+        has_file = any(page + suffix in final_files for suffix in PAGE_SUFFIXES)
+        if not has_file and page not in before_missing:
+            errors.append(f"docs.json: page {page} would have no file")
+
+    # redirect-map.json
+    redirect_text = (root / REDIRECT_MAP_PATH).read_text(encoding="utf-8")
+    redirect_map = json.loads(redirect_text)
+    added, stats["retargeted"] = update_redirect_map(redirect_map, moves, errors)
+    stats["redirects"] = len(added)
+    new_redirect_text = json.dumps(redirect_map, indent=2, ensure_ascii=False) + "\n"
+    if new_redirect_text != redirect_text:
+        validate_redirect_text(root, new_redirect_text, errors)
+        changes[REDIRECT_MAP_PATH] = Change(REDIRECT_MAP_PATH, redirect_text, new_redirect_text)
+
+    return moves, sorted(changes.values(), key=lambda c: c.path), stats
+
+
+def _sha256(text: str | None) -> str | None:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest() if text is not None else None
+
+
+def _set_file(root: Path, rel: str, text: str | None) -> None:
+    """Write (or, for None, delete) one file atomically, pruning empty dirs."""
+    path = root / rel
+    if text is None:
+        path.unlink(missing_ok=True)
+        parent = path.parent
+        while parent != root and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+        return
+    write_atomic(path, text)
+
+
+def _restore(root: Path, changes: list[Change]) -> None:
+    # Recreate files before deleting, so a moved page is never lost.
+    for change in sorted(changes, key=lambda c: c.before is None):
+        _set_file(root, change.path, change.before)
+
+
+def apply_changes(root: Path, moves: list[Move], changes: list[Change]) -> Path:
+    """Journal, then write every change; restore the originals on failure."""
+    journal_dir = root / JOURNAL_DIR
+    journal_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    journal_path = journal_dir / f"{stamp}.json"
+    journal = {
+        "version": JOURNAL_VERSION,
+        "moves": [[m.source, m.destination] for m in moves],
+        "files": [
+            {"path": c.path, "before": c.before, "after_sha256": _sha256(c.after)}
+            for c in changes
+        ],
+    }
+    journal_path.write_text(json.dumps(journal) + "\n", encoding="utf-8")
+
+    done: list[Change] = []
+    try:
+        # Writes first, deletions last: an interrupted run never loses content.
+        for change in sorted(changes, key=lambda c: c.after is None):
+            _set_file(root, change.path, change.after)
+            done.append(change)
+    except OSError:
+        _restore(root, done)
+        journal_path.unlink()
+        raise
+    return journal_path
+
+
+def rollback(root: Path, force: bool = False) -> tuple[Path, list[str]]:
+    """
+    Revert the most recent applied plan; return (journal, conflicting files).
+
+    Files edited since the plan was applied are reported as conflicts and
+    nothing is restored, unless `force` is set.
+    """
+    journals = sorted((root / JOURNAL_DIR).glob("*Z.json"))
+    if not journals:
+        raise FileNotFoundError(f"no journal in {JOURNAL_DIR}")
+    journal_path = journals[-1]
+    journal = json.loads(journal_path.read_text(encoding="utf-8"))
+    changes = [Change(f["path"], f["before"], None) for f in journal["files"]]
+
+    conflicts = []
+    for entry in journal["files"]:
+        path = root / entry["path"]
+        current = path.read_text(encoding="utf-8") if path.exists() else None
+        if _sha256(current) != entry["after_sha256"]:
+            conflicts.append(entry["path"])
+    if conflicts and not force:
+        return journal_path, conflicts
+
+    _restore(root, changes)
+    journal_path.rename(journal_path.with_suffix(".rolled-back.json"))
+    return journal_path, conflicts
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def _print_diff(changes: list[Change]) -> None:
+    moved = {c.moved_from for c in changes if c.moved_from}
+    for change in changes:
+        if change.after is None and change.path in moved:
+            continue  # shown with its destination
+        old_name = change.moved_from or change.path
+        base = change.base if change.moved_from else change.before
+        if change.moved_from:
+            print(f"rename {change.moved_from} → {change.path}")
+        sys.stdout.writelines(
+            difflib.unified_diff(
+                (base or "").splitlines(keepends=True),
+                (change.after or "").splitlines(keepends=True),
+                fromfile=f"a/{old_name}" if base is not None else "/dev/null",
+                tofile=f"b/{change.path}" if change.after is not None else "/dev/null",
+            )
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Move pages and update links, docs.json and redirects in one pass.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("plan", nargs="?", type=Path, help="Plan file (JSON)")
+    parser.add_argument(
+        "--move",
+        nargs=2,
+        action="append",
+        default=[],
+        metavar=("FROM", "TO"),
+        help="Add a move to the plan (repeatable)",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--write", action="store_true", help="Apply the plan")
+    mode.add_argument("--diff", action="store_true", help="Print a unified diff (dry run)")
+    mode.add_argument("--rollback", action="store_true", help="Revert the last applied plan")
+    parser.add_argument(
+        "--force", action="store_true", help="Roll back even over files edited since"
+    )
+    args = parser.parse_args()
+
+    root = Path(__file__).resolve().parent.parent
+
+    if args.rollback:
+        try:
+            journal, conflicts = rollback(root, force=args.force)
+        except FileNotFoundError as exc:
+            print(f"✗  {exc}", file=sys.stderr)
+            sys.exit(1)
+        if conflicts and not args.force:
+            print(f"✗  {len(conflicts)} file(s) changed since {journal.name} was applied:")
+            for path in conflicts:
+                print(f"     {path}")
+            print("   Re-run with --force to restore them anyway.")
+            sys.exit(1)
+        print(f"✓  Rolled back {journal.name}.")
+        return
+
+    pairs = load_plan(args.plan) if args.plan else []
+    pairs += [tuple(move) for move in args.move]
+    if not pairs:
+        parser.error("give a plan file or at least one --move")
+
+    errors: list[str] = []
+    moves, changes, stats = plan_changes(root, pairs, errors)
+    if errors:
+        for error in errors:
+            print(f"✗  {error}")
+        print(f"\n✗  Plan rejected ({len(errors)} error(s)); nothing was written.")
+        sys.exit(1)
+
+    if args.diff:
+        _print_diff(changes)
+        print()
+
+    rewritten = [c for c in changes if c.after is not None and not c.moved_from and c.before is not None]
+    print(
+        f"Plan: {stats['moves']} page(s) moved, {stats['links']} link(s) rewritten "
+        f"in {len(rewritten)} file(s), {stats['docs_json']} docs.json change(s), "
+        f"{stats['redirects']} redirect(s) added, {stats['retargeted']} retargeted."
+    )
+    if not args.diff:
+        for move in moves:
+            print(f"  rename {move.source_file} → {move.destination_file}")
+        for change in rewritten:
+            detail = f" ({change.links} link(s))" if change.links else ""
+            print(f"  update {change.path}{detail}")
+
+    if not args.write:
+        print("\n✓  Validation passed. Dry run: re-run with --write to apply.")
+        return
+
+    journal = apply_changes(root, moves, changes)
+    print(f"\n✓  Applied {len(changes)} file change(s). Undo with --rollback ({journal.name}).")
+    print("   Next: npm run llms:generate && npm run sitemap:generate")
+
+
+if __name__ == "__main__":
+    main()
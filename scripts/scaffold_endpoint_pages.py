@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""Create missing endpoint pages from the OpenAPI specs.
+
+Every endpoint page is frontmatter only:
+
+    ---
+    openapi: news-api-v3 post /api/search
+    ---
+
+This script walks every operation of the specs in OAS_SPECS (via the cached
+operation index in oas_index.py), creates a page for each operation that no
+page references yet, and inserts the new pages into the product's
+"API Reference" group in docs.json.  It also reports stale pages whose
+`openapi:` target no longer exists in the spec.
+
+Placement follows the existing pages:
+
+- Pages go in `<product>/api-reference/<tag dir>/<slug>.mdx`, where the tag
+  directory is the one already used by pages with the same tag, or the tag
+  in kebab-case (`LatestHeadlines` -> `latest-headlines`).
+- The slug is the operation summary in kebab-case.  A `-get`/`-post` suffix
+  is added when the spec's existing pages use method suffixes or the slug is
+  already taken.
+- In docs.json, a page joins the subgroup that already lists pages from its
+  directory, or a new subgroup named after the tag.
+
+Operations are processed in spec order, so the result is deterministic.
+Nothing is written without --write.
+
+Usage:
+    python scripts/scaffold_endpoint_pages.py            # dry run
+    python scripts/scaffold_endpoint_pages.py --write    # create pages, update docs.json
+    python scripts/scaffold_endpoint_pages.py --check    # exit 1 if pages are missing or stale
+
+Requirements:
+    pip install pyyaml
+"""
+
+import argparse
+import re
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+from build_cache import add_cache_arguments, apply_cache_arguments
+from docs_nav import find_tab_for_prefix, load_docs_json, write_docs_json
+from generate_llms_txt import OAS_SPECS
+from generate_sitemap import iter_leaves
+from oas_index import build_operation_index, operation_keys, scan_openapi_pages
+
+API_REFERENCE_GROUP = "API Reference"
+
+# ---------------------------------------------------------------------------
+# Naming
+# ---------------------------------------------------------------------------
+
+
+def slugify(text: str) -> str:
+    """"Search articles by links or IDs" -> "search-articles-by-links-or-ids"."""
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def kebab_tag(tag: str) -> str:
+    """"LatestHeadlines" -> "latest-headlines"."""
+    return slugify(re.sub(r"(?<=[a-z0-9])(?=[A-Z])", " ", tag))
+
+
+def humanize_tag(tag: str) -> str:
+    """"LatestHeadlines" -> "Latest headlines" (the sidebar group style)."""
+    words = re.sub(r"(?<=[a-z0-9])(?=[A-Z])", " ", tag).split()
+    if not words:
+        return tag
+    return " ".join([words[0]] + [w if w.isupper() else w.lower() for w in words[1:]])
+
+
+def product_dir(spec_name: str) -> str:
+    """Top-level docs directory a spec belongs to."""
+    return OAS_SPECS[spec_name].split("/", 1)[0]
+
+
+# ---------------------------------------------------------------------------
+# Planning
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class NewPage:
+    spec: str
+    method: str
+    path: str
+    tag: str
+    page: str  # page path without extension
+
+
+def plan_pages(root: Path, index: dict, refs: list) -> list[NewPage]:
+    """Return a page for every operation that no existing page references."""
+    covered = {(r.spec, r.method, r.path) for r in refs}
+    taken = {r.page for r in refs}
+
+    # What the existing pages of each spec look like.
+    ops_by_key = {
+        (name, op["method"], op["path"]): op
+        for name, entry in index.items()
+        for op in entry["operations"]
+    }
+    tag_dirs: dict[tuple[str, str], str] = {}
+    suffixed: dict[str, list[bool]] = defaultdict(list)
+    for ref in refs:
+        op = ops_by_key.get((ref.spec, ref.method, ref.path))
+        if not op:
+            continue
+        parent, _, stem = ref.page.rpartition("/")
+        for tag in op["tags"][:1]:
+            tag_dirs.setdefault((ref.spec, tag), parent)
+        suffixed[ref.spec].append(stem.endswith("-" + ref.method))
+
+    planned = []
+    for name, entry in index.items():
+        # Follow the majority convention of the spec's existing pages.
+        flags = suffixed.get(name, [])
+        use_suffix = bool(flags) and sum(flags) * 2 > len(flags)
+        for op in entry["operations"]:
+            if (name, op["method"], op["path"]) in covered:
+                continue
+            tag = op["tags"][0] if op["tags"] else "Endpoints"
+            parent = tag_dirs.get((name, tag)) or (
+                f"{product_dir(name)}/api-reference/{kebab_tag(tag)}"
+            )
+            slug = slugify(op["summary"]) or slugify(f"{op['method']} {op['path']}")
+            candidates = [f"{slug}-{op['method']}"] if use_suffix else [slug, f"{slug}-{op['method']}"]
+            page = None
+            for stem in candidates:
+                candidate = f"{parent}/{stem}"
+                if candidate not in taken and not (root / f"{candidate}.mdx").exists():
+                    page = candidate
+                    break
+            n = 2
+            while page is None:
+                candidate = f"{parent}/{candidates[-1]}-{n}"
+                if candidate not in taken and not (root / f"{candidate}.mdx").exists():
+                    page = candidate
+                n += 1
+            taken.add(page)
+            planned.append(NewPage(name, op["method"], op["path"], tag, page))
+    return planned
+
+
+def find_stale(index: dict, refs: list) -> list:
+    """Return references to operations missing from their (active) spec."""
+    keys = operation_keys(index)
+    return [
+        ref
+        for ref in refs
+        if ref.spec in keys and (ref.method, ref.path) not in keys[ref.spec]
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Applying
+# ---------------------------------------------------------------------------
+
+
+def render_page(new: NewPage) -> str:
+    return f"---\nopenapi: {new.spec} {new.method} {new.path}\n---\n"
+
+
+def insert_into_nav(docs_json: dict, new: NewPage) -> str | None:
+    """
+    Insert `new.page` into docs.json; return the group it went into.
+
+    Returns None when the product has no tab with an API Reference group.
+    """
+    tab = find_tab_for_prefix(docs_json, product_dir(new.spec))
+    if tab is None:
+        return None
+    api_ref = next(
+        (g for g in tab.get("groups", []) if g.get("group") == API_REFERENCE_GROUP),
+        None,
+    )
+    if api_ref is None:
+        return None
+
+    # The page may already be listed (for example a deleted file that
+    # is being recreated).
+    for group in api_ref.get("pages", []):
+        if new.page in iter_leaves(group):
+            return group["group"] if isinstance(group, dict) else API_REFERENCE_GROUP
+
+    parent = new.page.rpartition("/")[0] + "/"
+    subgroups = [p for p in api_ref.setdefault("pages", []) if isinstance(p, dict)]
+    for group in subgroups:
+        if any(
+            page.rpartition("/")[0] + "/" == parent for page in iter_leaves(group)
+        ):
+            group.setdefault("pages", []).append(new.page)
+            return group["group"]
+
+    name = humanize_tag(new.tag)
+    for group in subgroups:
+        if group.get("group") == name:
+            group.setdefault("pages", []).append(new.page)
+            return name
+    api_ref["pages"].append({"group": name, "pages": [new.page]})
+    return name
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Create missing endpoint pages from the OpenAPI specs.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--write",
+        action="store_true",
+        help="Create the pages and update docs.json (default: dry run)",
+    )
+    mode.add_argument(
+        "--check",
+        action="store_true",
+        help="Exit 1 if any operation has no page or any page is stale (CI mode)",
+    )
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+    apply_cache_arguments(args)
+
+    root = Path(__file__).resolve().parent.parent
+    started = time.perf_counter()
+
+    index = build_operation_index(root, use_cache=not args.no_cache)
+    refs = scan_openapi_pages(root)
+    planned = plan_pages(root, index, refs)
+    stale = find_stale(index, refs)
+
+    total_ops = sum(len(entry["operations"]) for entry in index.values())
+    print(
+        f"Indexed {total_ops} operations in {len(index)} specs and "
+        f"{len(refs)} endpoint pages ({(time.perf_counter() - started) * 1000:.0f} ms)."
+    )
+
+    docs_json = load_docs_json(root)
+    if planned:
+        print(f"\n{'Creating' if args.write else 'Missing'} {len(planned)} page(s):")
+    for new in planned:
+        group = insert_into_nav(docs_json, new)
+        where = f"group '{group}'" if group else "no API Reference group, add to docs.json by hand"
+        print(f"  + {new.page}.mdx  ({new.method.upper()} {new.path}; {where})")
+        if args.write:
+            file = root / f"{new.page}.mdx"
+            file.parent.mkdir(parents=True, exist_ok=True)
+            file.write_text(render_page(new), encoding="utf-8")
+
+    if stale:
+        print(f"\nStale page(s) pointing at missing operations ({len(stale)}):")
+        for ref in stale:
+            print(f"  ! {ref.page}  ({ref.field}: {ref.raw})")
+
+    if args.write and planned:
+        write_docs_json(root, docs_json)
+        print(f"\n✓  Created {len(planned)} page(s) and updated docs.json.")
+    elif not planned and not stale:
+        print("✓  Every operation has a page.")
+
+    if args.check and (planned or stale):
+        print(
+            "\n✗  Run 'python scripts/scaffold_endpoint_pages.py --write' and "
+            "fix stale pages.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+JSON Schema Compiler
+
+Compiles a JSON Schema (the draft-07 subset used by redirect-map.schema.json)
+into nested Python closures once, so that validating each instance is a
+straight run of precomputed checks with no schema interpretation.  Unlike
+`jsonschema.validate`, a compiled validator collects every error instead of
+stopping at the first one.
+
+Also provides `iter_object_members`, which walks a top-level JSON object
+(a string or a text file, read in pieces) and yields the elements of one
+array member one at a time, so very large documents can be validated entry
+by entry as they are decoded without being loaded whole.
+
+Supported keywords: type, enum, const, pattern, format (date), minimum,
+maximum, minLength, maxLength, required, properties, additionalProperties,
+items, minItems, maxItems, allOf, anyOf, oneOf, and the OpenAPI 3.0
+`nullable`.  `oneOf` is checked like `anyOf` (a value must match at least one
+member), since OpenAPI specs often list overlapping members.  `$ref` is
+delegated to the caller's `resolve_ref`, which returns the compiled check of
+the target, so shared and recursive components compile once.  Annotation
+keywords (title, description, default, $schema, $id) are ignored.
+
+Author: Documentation Team
+"""
+
+import json
+import re
+from datetime import date
+from typing import Any, Callable, Iterator, List, Optional, TextIO, Tuple, Union
+
+# A compiled check appends (path, message) tuples for every failure.
+Errors = List[Tuple[str, str]]
+Check = Callable[[Any, str, Errors], None]
+# Maps a `$ref` string to the compiled check of its target.
+RefResolver = Callable[[str], Check]
+
+_TYPE_CHECKS = {
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "null": lambda v: v is None,
+}
+
+
+def _is_date(value: str) -> bool:
+    try:
+        date.fromisoformat(value)
+        return True
+    except ValueError:
+        return False
+
+
+_FORMAT_CHECKS = {"date": _is_date}
+
+
+def _accept(value, path, errors):
+    pass
+
+
+def compile_schema(schema: dict, resolve_ref: Optional[RefResolver] = None) -> Check:
+    """Compile `schema` into a single check function."""
+    if not isinstance(schema, dict):
+        return _accept
+    ref = schema.get("$ref")
+    if isinstance(ref, str):
+        if resolve_ref is None:
+            raise ValueError(f"Cannot compile $ref without a resolver: {ref}")
+        return resolve_ref(ref)
+
+    checks: List[Check] = []
+
+    expected_type = schema.get("type")
+    if expected_type is not None:
+        names = expected_type if isinstance(expected_type, list) else [expected_type]
+        if schema.get("nullable") is True and "null" not in names:
+            names = [*names, "null"]
+        label = " or ".join(names)
+        if len(names) == 1:
+            is_type = _TYPE_CHECKS[names[0]]
+        else:
+            type_checks = [_TYPE_CHECKS[name] for name in names]
+
+            def is_type(value):
+                return any(check(value) for check in type_checks)
+
+        def check_type(value, path, errors):
+            if not is_type(value):
+                errors.append((path, f"must be {label} - got: {value!r}"))
+
+        checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = schema["enum"]
+        # Key on (type, value) so that True does not satisfy an enum of 1
+        allowed_keys = {(type(a), a) for a in allowed if not isinstance(a, (dict, list))}
+
+        def check_enum(value, path, errors):
+            try:
+                ok = (type(value), value) in allowed_keys
+            except TypeError:
+                ok = value in allowed
+            if not ok:
+                errors.append((path, f"must be one of {allowed} - got: {value!r}"))
+
+        checks.append(check_enum)
+
+    if "const" in schema:
+        constant = schema["const"]
+
+        def check_const(value, path, errors):
+            if value != constant:
+                errors.append((path, f"must be {constant!r} - got: {value!r}"))
+
+        checks.append(check_const)
+
+    checks.extend(_compile_string(schema))
+    checks.extend(_compile_number(schema))
+    checks.extend(_compile_object(schema, resolve_ref))
+    checks.extend(_compile_array(schema, resolve_ref))
+    checks.extend(_compile_combinators(schema, resolve_ref))
+
+    if not checks:
+        return _accept
+    if len(checks) == 1:
+        check = checks[0]
+    else:
+
+        def check(value, path, errors):
+            for c in checks:
+                c(value, path, errors)
+
+    if schema.get("nullable") is True and expected_type is None:
+        inner = check
+
+        def check(value, path, errors):
+            if value is not None:
+                inner(value, path, errors)
+
+    return check
+
+
+def _compile_combinators(schema: dict, resolve_ref: Optional[RefResolver]) -> List[Check]:
+    checks: List[Check] = []
+    for member in schema.get("allOf") or ():
+        checks.append(compile_schema(member, resolve_ref))
+
+    members = [*(schema.get("anyOf") or ()), *(schema.get("oneOf") or ())]
+    if members:
+        alternatives = [compile_schema(member, resolve_ref) for member in members]
+
+        def check_any_of(value, path, errors):
+            best: Optional[Errors] = None
+            for alternative in alternatives:
+                found: Errors = []
+                alternative(value, path, found)
+                if not found:
+                    return
+                if best is None or len(found) < len(best):
+                    best = found
+            # Report the member that came closest to matching.
+            errors.extend(best or ())
+
+        checks.append(check_any_of)
+    return checks
+
+
+def _compile_string(schema: dict) -> List[Check]:
+    checks: List[Check] = []
+    if "pattern" in schema:
+        pattern = schema["pattern"]
+        search = re.compile(pattern).search
+
+        def check_pattern(value, path, errors):
+            if isinstance(value, str) and not search(value):
+                errors.append((path, f"must match pattern '{pattern}' - got: {value}"))
+
+        checks.append(check_pattern)
+
+    fmt = schema.get("format")
+    if fmt in _FORMAT_CHECKS:
+        valid_format = _FORMAT_CHECKS[fmt]
+
+        def check_format(value, path, errors):
+            if isinstance(value, str) and not valid_format(value):
+                errors.append((path, f"must be a valid {fmt} - got: {value}"))
+
+        checks.append(check_format)
+
+    if "minLength" in schema:
+        min_length = schema["minLength"]
+
+        def check_min_length(value, path, errors):
+            if isinstance(value, str) and len(value) < min_length:
+                errors.append((path, f"must be at least {min_length} characters"))
+
+        checks.append(check_min_length)
+
+    if "maxLength" in schema:
+        max_length = schema["maxLength"]
+
+        def check_max_length(value, path, errors):
+            if isinstance(value, str) and len(value) > max_length:
+                errors.append((path, f"must be at most {max_length} characters"))
+
+        checks.append(check_max_length)
+    return checks
+
+
+def _compile_number(schema: dict) -> List[Check]:
+    checks: List[Check] = []
+    is_number = _TYPE_CHECKS["number"]
+    if "minimum" in schema:
+        minimum = schema["minimum"]
+
+        def check_minimum(value, path, errors):
+            if is_number(value) and value < minimum:
+                errors.append((path, f"must be >= {minimum} - got: {value}"))
+
+        checks.append(check_minimum)
+
+    if "maximum" in schema:
+        maximum = schema["maximum"]
+
+        def check_maximum(value, path, errors):
+            if is_number(value) and value > maximum:
+                errors.append((path, f"must be <= {maximum} - got: {value}"))
+
+        checks.append(check_maximum)
+    return checks
+
+
+def _compile_object(schema: dict, resolve_ref: Optional[RefResolver] = None) -> List[Check]:
+    checks: List[Check] = []
+    required = schema.get("required", [])
+    if required:
+
+        def check_required(value, path, errors):
+            if isinstance(value, dict):
+                for field in required:
+                    if field not in value:
+                        errors.append((path, f"missing required field '{field}'"))
+
+        checks.append(check_required)
+
+    properties = {
+        name: compile_schema(sub, resolve_ref)
+        for name, sub in schema.get("properties", {}).items()
+    }
+    additional = schema.get("additionalProperties", True)
+    additional_check = (
+        compile_schema(additional, resolve_ref) if isinstance(additional, dict) else None
+    )
+
+    if properties or additional is not True:
+
+        def check_properties(value, path, errors):
+            if not isinstance(value, dict):
+                return
+            for name, item in value.items():
+                child = f"{path}.{name}" if path else name
+                check = properties.get(name)
+                if check is not None:
+                    check(item, child, errors)
+                elif additional is False:
+                    errors.append((path, f"unexpected field '{name}'"))
+                elif additional_check is not None:
+                    additional_check(item, child, errors)
+
+        checks.append(check_properties)
+    return checks
+
+
+def _compile_array(schema: dict, resolve_ref: Optional[RefResolver] = None) -> List[Check]:
+    checks: List[Check] = []
+    if "minItems" in schema:
+        min_items = schema["minItems"]
+
+        def check_min_items(value, path, errors):
+            if isinstance(value, list) and len(value) < min_items:
+                errors.append((path, f"must contain at least {min_items} item(s)"))
+
+        checks.append(check_min_items)
+
+    if "maxItems" in schema:
+        max_items = schema["maxItems"]
+
+        def check_max_items(value, path, errors):
+            if isinstance(value, list) and len(value) > max_items:
+                errors.append((path, f"must contain at most {max_items} item(s)"))
+
+        checks.append(check_max_items)
+
+    if isinstance(schema.get("items"), dict):
+        item_check = compile_schema(schema["items"], resolve_ref)
+
+        def check_items(value, path, errors):
+            if isinstance(value, list):
+                for i, item in enumerate(value):
+                    item_check(item, f"{path}[{i}]", errors)
+
+        checks.append(check_items)
+    return checks
+
+
+# ---------------------------------------------------------------------------
+# Streaming decode
+# ---------------------------------------------------------------------------
+
+_WS = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+# Characters read from a file at a time.
+READ_SIZE = 64 * 1024
+
+
+class _Buffer:
+    """
+    A window over JSON text that refills from a file as it is consumed.
+
+    Given a string, the window is the whole string.  Given a text file, only
+    the undecoded tail plus the current read is held; consumed text is
+    dropped on every refill.  Errors report positions in the whole document.
+    """
+
+    def __init__(self, source: Union[str, TextIO]):
+        if isinstance(source, str):
+            self.text, self.file, self.eof = source, None, True
+        else:
+            self.text, self.file, self.eof = "", source, False
+        self.pos = 0
+        # Characters, line breaks and first-line columns dropped so far.
+        self.offset = self.lines = self.column = 0
+
+    def _fill(self, size: int = READ_SIZE) -> None:
+        consumed = self.text[: self.pos]
+        newlines = consumed.count("\n")
+        if newlines:
+            self.lines += newlines
+            self.column = len(consumed) - consumed.rfind("\n") - 1
+        else:
+            self.column += len(consumed)
+        self.offset += self.pos
+        data = self.file.read(size)
+        self.text = self.text[self.pos :] + data
+        self.pos = 0
+        self.eof = not data
+
+    def error(self, message: str, pos: int) -> json.JSONDecodeError:
+        """A JSONDecodeError for buffer position `pos`, in document terms."""
+        err = json.JSONDecodeError(message, self.text, pos)
+        if err.lineno == 1:
+            err.colno += self.column
+        err.lineno += self.lines
+        err.pos += self.offset
+        err.args = (f"{message}: line {err.lineno} column {err.colno} (char {err.pos})",)
+        return err
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ("" at the end)."""
+        while True:
+            self.pos = _WS.match(self.text, self.pos).end()
+            if self.pos < len(self.text) or self.eof:
+                return self.text[self.pos : self.pos + 1]
+            self._fill()
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self.error(f"Expecting '{char}'", self.pos)
+        self.pos += 1
+
+    def decode(self) -> Any:
+        """Decode the value at the current position."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise self.error(e.msg, e.pos) from None
+            else:
+                # A number or literal ending with the window may continue.
+                if end < len(self.text) or self.eof:
+                    self.pos = end
+                    return value
+            # Read at least as much again, so a long value costs linear time.
+            self._fill(max(READ_SIZE, len(self.text) - self.pos))
+
+
+def iter_object_members(
+    source: Union[str, TextIO], stream_key: str
+) -> Iterator[Tuple[str, Any, Any]]:
+    """
+    Walk the top-level JSON object in `source`, a string or a text file.
+
+    Yields ("member", key, value) for every member except `stream_key`.  For
+    the `stream_key` array it yields ("array", key, None) once, then
+    ("item", index, value) for each element as it is decoded.  If
+    `stream_key` is not an array it is yielded as a member.  A file is read
+    in READ_SIZE pieces as the walk proceeds, so memory is bounded by the
+    largest single value rather than the document.
+    Raises json.JSONDecodeError on malformed input.
+    """
+    buf = _Buffer(source)
+    buf.expect("{")
+    if buf.peek() == "}":
+        buf.pos += 1
+    else:
+        while True:
+            key = buf.decode()
+            if not isinstance(key, str):
+                raise buf.error("Expecting property name", buf.pos)
+            buf.expect(":")
+
+            if key == stream_key and buf.peek() == "[":
+                yield "array", key, None
+                buf.pos += 1
+                index = 0
+                if buf.peek() == "]":
+                    buf.pos += 1
+                else:
+                    while True:
+                        yield "item", index, buf.decode()
+                        index += 1
+                        if buf.peek() == ",":
+                            buf.pos += 1
+                            continue
+                        buf.expect("]")
+                        break
+            else:
+                yield "member", key, buf.decode()
+
+            if buf.peek() == ",":
+                buf.pos += 1
+                continue
+            buf.expect("}")
+            break
+
+    if buf.peek():
+        raise buf.error("Extra data", buf.pos)
@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""Build and query an offline full-text search index of the docs.
+
+Indexes every navigation page in docs.json (frontmatter plus MDX body) and
+every operation in the specs listed in OAS_SPECS (summary, description,
+tags and parameters) into a compact inverted index scored with BM25.
+
+Index layout (.cache/search-index.bin, little-endian):
+
+    header    magic "NCSIDX01" | sha256 of the inputs (32 bytes) |
+              doc count, term count (u32) | average doc length (f64) |
+              docs, terms, postings and strings section offsets (u32)
+    docs      one 20-byte record per doc id: key offset, key length,
+              title offset, title length, doc length in tokens (u32 each)
+    terms     one 16-byte record per term, sorted by term: term offset (u32),
+              term length (u16), document frequency (u32), postings offset
+              (u32), item widths (u8), pad
+    postings  per term, the doc id deltas followed by the term frequencies,
+              each stored as a packed array of 1, 2 or 4-byte integers
+              (the narrowest width that fits)
+    strings   UTF-8 blob referenced by the doc and term records
+
+The file is memory-mapped.  A query binary-searches the term records,
+decodes only the posting arrays of its own terms, and scores with BM25.
+
+Rebuilds are incremental: the term frequencies of each page (and each spec)
+are kept in the build cache (build_cache.py) keyed by the source file's
+name and content, so only changed pages are re-tokenized before the index
+is reassembled.
+
+Usage:
+    python scripts/search_index.py                        # build or update
+    python scripts/search_index.py --query "source country filter"
+    python scripts/search_index.py --query "webhook retries" --top 5 --json
+    python scripts/search_index.py --no-cache --stats
+
+Requirements:
+    pip install pyyaml
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import re
+import struct
+import sys
+import time
+from array import array
+from itertools import accumulate
+from pathlib import Path
+
+import patterns
+from atomic_write import write_atomic
+from build_cache import BUILD_CACHE, add_cache_arguments, apply_cache_arguments, cache_key
+from generate_llms_txt import OAS_SPECS, parse_frontmatter
+from generate_sitemap import collect_pages
+from oas_deref import Resolver, load_spec
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+DOCS_JSON_PATH = "docs.json"
+INDEX_PATH = ".cache/search-index.bin"
+MAGIC = b"NCSIDX01"
+
+# Build cache namespace of each source's documents; bump the version when
+# tokenization changes so cached term frequencies are discarded.
+CACHE_NAMESPACE = "search-docs"
+TOKENIZER_VERSION = 1
+
+# BM25 parameters (the usual defaults).
+K1 = 1.2
+B = 0.75
+
+_HEADER = struct.Struct("<8s32sIIdIIII")
+_DOC = struct.Struct("<IIIII")
+_TERM = struct.Struct("<IHIIBx")
+
+# Packed array width (bytes) <-> typecode.
+_TYPECODES = {1: "B", 2: "H", 4: "I"}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_ATTR_TEXT_RE = re.compile(r'\b(?:title|description|label)="([^"]*)"')
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that "
+    "the this to was were will with you your".split()
+)
+
+# ---------------------------------------------------------------------------
+# Tokenization
+# ---------------------------------------------------------------------------
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-case alphanumeric tokens, without stopwords."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def _term_frequencies(tokens: list[str]) -> dict[str, int]:
+    tf: dict[str, int] = {}
+    for token in tokens:
+        tf[token] = tf.get(token, 0) + 1
+    return tf
+
+
+def page_document(page: str, text: str) -> dict:
+    """Return the cached form ({key, title, length, tf}) of one MDX page."""
+    fm = parse_frontmatter(text)
+    body = patterns.FRONTMATTER_BLOCK.sub("", text, count=1)
+    body = patterns.MDX_IMPORT_EXPORT.sub(" ", body)
+    # Keep human-readable attribute values (card and step titles) before
+    # dropping the JSX tags themselves.
+    attrs = " ".join(_ATTR_TEXT_RE.findall(body))
+    body = patterns.JSX_TAG.sub(" ", body)
+    fields = [fm.get("title"), fm.get("sidebarTitle"), fm.get("description")]
+    tokens = tokenize(" ".join(str(f) for f in fields if f) + " " + attrs + " " + body)
+    return {
+        "key": page,
+        "title": str(fm.get("title") or fm.get("sidebarTitle") or page),
+        "length": len(tokens),
+        "tf": _term_frequencies(tokens),
+    }
+
+
+def spec_documents(spec_name: str, spec: dict) -> list[dict]:
+    """Return the cached form of every operation in a spec."""
+    docs = []
+    for method, path, op in Resolver(spec).operations():
+        parts = [
+            op.get("summary"),
+            op.get("description"),
+            op.get("operationId"),
+            " ".join(op.get("tags") or []),
+            path,
+        ]
+        for param in op.get("parameters") or []:
+            if isinstance(param, dict):
+                parts += [param.get("name"), param.get("description")]
+        tokens = tokenize(" ".join(str(p) for p in parts if p))
+        docs.append(
+            {
+                "key": f"{spec_name} {method.upper()} {path}",
+                "title": str(op.get("summary") or f"{method.upper()} {path}"),
+                "length": len(tokens),
+                "tf": _term_frequencies(tokens),
+            }
+        )
+    return docs
+
+
+# ---------------------------------------------------------------------------
+# Building
+# ---------------------------------------------------------------------------
+
+
+def _sources(root: Path) -> list[tuple[str, Path | None]]:
+    """Return (source name, file) for every input, in doc id order."""
+    docs_json = json.loads((root / DOCS_JSON_PATH).read_text(encoding="utf-8"))
+    sources: list[tuple[str, Path | None]] = []
+    for page in collect_pages(docs_json):
+        file = next(
+            (
+                root / f"{page}{ext}"
+                for ext in (".mdx", ".md")
+                if (root / f"{page}{ext}").exists()
+            ),
+            None,
+        )
+        sources.append((page, file))
+    for name, rel_path in OAS_SPECS.items():
+        file = root / rel_path
+        sources.append((f"oas:{name}", file if file.exists() else None))
+    return sources
+
+
+def _pack(values: list[int]) -> tuple[int, bytes]:
+    """Pack integers into the narrowest array; return (width, bytes)."""
+    top = max(values) if values else 0
+    width = 1 if top < 1 << 8 else 2 if top < 1 << 16 else 4
+    packed = array(_TYPECODES[width], values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return width, packed.tobytes()
+
+
+def compile_index(documents: list[dict], inputs_sha256: bytes) -> bytes:
+    """Compile cached documents (in doc id order) into index bytes."""
+    blob = bytearray()
+
+    def intern(text: str) -> tuple[int, int]:
+        encoded = text.encode("utf-8")
+        offset = len(blob)
+        blob.extend(encoded)
+        return offset, len(encoded)
+
+    postings: dict[str, tuple[list[int], list[int]]] = {}
+    doc_records = bytearray()
+    total_length = 0
+    for doc_id, doc in enumerate(documents):
+        key_off, key_len = intern(doc["key"])
+        title_off, title_len = intern(doc["title"])
+        doc_records += _DOC.pack(key_off, key_len, title_off, title_len, doc["length"])
+        total_length += doc["length"]
+        for term, freq in doc["tf"].items():
+            ids, freqs = postings.setdefault(term, ([], []))
+            ids.append(doc_id)
+            freqs.append(freq)
+
+    term_records = bytearray()
+    posting_bytes = bytearray()
+    for term in sorted(postings, key=lambda t: t.encode("utf-8")):
+        ids, freqs = postings[term]
+        deltas = [ids[0]] + [b - a for a, b in zip(ids, ids[1:])]
+        delta_width, delta_bytes = _pack(deltas)
+        freq_width, freq_bytes = _pack(freqs)
+        term_off, term_len = intern(term)
+        term_records += _TERM.pack(
+            term_off, term_len, len(ids), len(posting_bytes), delta_width << 4 | freq_width
+        )
+        posting_bytes += delta_bytes + freq_bytes
+
+    avgdl = total_length / len(documents) if documents else 0.0
+    docs_at = _HEADER.size
+    terms_at = docs_at + len(doc_records)
+    postings_at = terms_at + len(term_records)
+    strings_at = postings_at + len(posting_bytes)
+    header = _HEADER.pack(
+        MAGIC,
+        inputs_sha256,
+        len(documents),
+        len(postings),
+        avgdl,
+        docs_at,
+        terms_at,
+        postings_at,
+        strings_at,
+    )
+    return header + bytes(doc_records) + bytes(term_records) + bytes(posting_bytes) + bytes(blob)
+
+
+def build_index(root: Path, rebuild: bool = False) -> tuple[Path, dict]:
+    """
+    Bring the index up to date; return (index path, build stats).
+
+    Unchanged sources reuse their cached term frequencies; when no source
+    changed at all the existing index file is kept as is.
+    """
+    index_file = root / INDEX_PATH
+
+    sources = []
+    manifest = hashlib.sha256(f"tokenizer:{TOKENIZER_VERSION}\n".encode())
+    for name, file in _sources(root):
+        raw = file.read_bytes() if file else b""
+        digest = hashlib.sha256(raw).hexdigest()
+        sources.append((name, raw, digest))
+        manifest.update(f"{name}\0{digest}\n".encode("utf-8"))
+    inputs_sha256 = manifest.digest()
+    stats = {"sources": len(sources), "retokenized": 0, "reused": 0, "written": False}
+
+    if not rebuild and index_file.exists():
+        try:
+            with open(index_file, "rb") as fh:
+                magic, recorded = _HEADER.unpack(fh.read(_HEADER.size))[:2]
+            if magic == MAGIC and recorded == inputs_sha256:
+                stats["reused"] = len(sources)
+                return index_file, stats
+        except struct.error:
+            pass  # Truncated or foreign file: rebuild below
+
+    documents: list[dict] = []
+    for name, raw, _ in sources:
+        key = cache_key(CACHE_NAMESPACE, TOKENIZER_VERSION, name, raw)
+        docs = None if rebuild else BUILD_CACHE.get_json(CACHE_NAMESPACE, key)
+        if docs is not None:
+            stats["reused"] += 1
+        else:
+            if not raw:
+                docs = []
+            elif name.startswith("oas:"):
+                docs = spec_documents(name[4:], load_spec(root / OAS_SPECS[name[4:]]))
+            else:
+                docs = [page_document(name, raw.decode("utf-8"))]
+            BUILD_CACHE.put_json(CACHE_NAMESPACE, key, docs, exact=False)
+            stats["retokenized"] += 1
+        documents.extend(docs)
+
+    write_atomic(index_file, compile_index(documents, inputs_sha256))
+    stats["written"] = True
+    return index_file, stats
+
+
+# ---------------------------------------------------------------------------
+# Querying
+# ---------------------------------------------------------------------------
+
+
+class SearchIndex:
+    """Read-only, memory-mapped view of a compiled search index."""
+
+    def __init__(self, buf):
+        self._buf = buf
+        (
+            magic,
+            self.sha256,
+            self.doc_count,
+            self.term_count,
+            self.avgdl,
+            self._docs_at,
+            self._terms_at,
+            self._postings_at,
+            self._strings_at,
+        ) = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a search index")
+        self._norms: list[float] | None = None
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings_at + offset
+        return self._buf[start : start + length].decode("utf-8")
+
+    def document(self, doc_id: int) -> tuple[str, str]:
+        """Return (key, title) for a doc id."""
+        key_off, key_len, title_off, title_len, _ = _DOC.unpack_from(
+            self._buf, self._docs_at + doc_id * _DOC.size
+        )
+        return self._string(key_off, key_len), self._string(title_off, title_len)
+
+    def _doc_norms(self) -> list[float]:
+        """Per-doc BM25 length normalisation, computed once per index."""
+        if self._norms is None:
+            records = array("I")
+            records.frombytes(self._buf[self._docs_at : self._terms_at])
+            if sys.byteorder == "big":
+                records.byteswap()
+            avgdl = self.avgdl or 1.0
+            self._norms = [K1 * (1 - B + B * length / avgdl) for length in records[4::5]]
+        return self._norms
+
+    def _find_term(self, term: str) -> tuple | None:
+        key = term.encode("utf-8")
+        lo, hi = 0, self.term_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            record = _TERM.unpack_from(self._buf, self._terms_at + mid * _TERM.size)
+            start = self._strings_at + record[0]
+            probe = self._buf[start : start + record[1]]
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                return record
+        return None
+
+    def postings(self, term: str) -> tuple[list[int], array]:
+        """Return (doc ids, term frequencies) for `term`."""
+        record = self._find_term(term)
+        if record is None:
+            return [], array("B")
+        _, _, df, offset, widths = record
+        delta_width, freq_width = widths >> 4, widths & 0x0F
+        start = self._postings_at + offset
+        deltas = array(_TYPECODES[delta_width])
+        deltas.frombytes(self._buf[start : start + df * delta_width])
+        start += df * delta_width
+        freqs = array(_TYPECODES[freq_width])
+        freqs.frombytes(self._buf[start : start + df * freq_width])
+        if sys.byteorder == "big":
+            deltas.byteswap()
+            freqs.byteswap()
+        return list(accumulate(deltas)), freqs
+
+    def search(self, query: str, top: int = 10) -> list[tuple[float, str, str]]:
+        """Return up to `top` (score, key, title) hits, best first."""
+        norms = self._doc_norms()
+        n = self.doc_count
+        scores: dict[int, float] = {}
+        for term in dict.fromkeys(tokenize(query)):
+            ids, freqs = self.postings(term)
+            if not ids:
+                continue
+            idf = math.log(1 + (n - len(ids) + 0.5) / (len(ids) + 0.5))
+            for doc_id, tf in zip(ids, freqs):
+                weight = idf * tf * (K1 + 1) / (tf + norms[doc_id])
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight
+        best = heapq.nlargest(top, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(score, *self.document(doc_id)) for doc_id, score in best]
+
+
+def open_index(path: Path) -> SearchIndex:
+    """Memory-map a compiled index file."""
+    with open(path, "rb") as fh:
+        return SearchIndex(mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def load_search_index(root: Path, rebuild: bool = False) -> SearchIndex:
+    """Update the index if any input changed, then open it."""
+    path, _ = build_index(root, rebuild=rebuild)
+    return open_index(path)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Build and query the offline docs search index.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("--query", "-q", metavar="TEXT", help="Search the index")
+    parser.add_argument("--top", type=int, default=10, help="Number of hits (default: 10)")
+    parser.add_argument("--json", action="store_true", help="Print hits as JSON")
+    add_cache_arguments(parser)
+    parser.add_argument(
+        "--rebuild", dest="no_cache", action="store_true", help="Alias of --no-cache"
+    )
+    parser.add_argument(
+        "--no-update",
+        action="store_true",
+        help="Query the existing index without checking inputs for changes",
+    )
+    parser.add_argument("--stats", action="store_true", help="Print index statistics")
+    args = parser.parse_args()
+    apply_cache_arguments(args)
+
+    root = Path(__file__).resolve().parent.parent
+    index_file = root / INDEX_PATH
+
+    if args.no_cache or not (args.no_update and index_file.exists()):
+        if not (root / DOCS_JSON_PATH).exists():
+            print(f"Error: {DOCS_JSON_PATH} not found at {root}", file=sys.stderr)
+            sys.exit(1)
+        started = time.perf_counter()
+        index_file, stats = build_index(root, rebuild=args.no_cache)
+        elapsed = (time.perf_counter() - started) * 1000
+        if not args.json:
+            if stats["written"]:
+                print(
+                    f"✓  Built {INDEX_PATH} in {elapsed:.0f} ms "
+                    f"({stats['retokenized']} source(s) tokenized, {stats['reused']} reused)."
+                )
+            else:
+                print(f"✓  {INDEX_PATH} is up to date ({elapsed:.0f} ms).")
+
+    index = open_index(index_file)
+    if args.stats and not args.json:
+        print(f"  Documents:      {index.doc_count}")
+        print(f"  Terms:          {index.term_count}")
+        print(f"  Avg doc length: {index.avgdl:.1f} tokens")
+        print(f"  Size:           {index_file.stat().st_size} bytes")
+
+    if args.query is None:
+        return
+
+    started = time.perf_counter()
+    hits = index.search(args.query, top=args.top)
+    elapsed_us = (time.perf_counter() - started) * 1e6
+
+    if args.json:
+        json.dump(
+            [{"score": round(score, 4), "key": key, "title": title} for score, key, title in hits],
+            sys.stdout,
+            indent=2,
+        )
+        sys.stdout.write("\n")
+        return
+
+    print(f"\n{len(hits)} hit(s) for {args.query!r} in {elapsed_us:.0f} µs:")
+    for score, key, title in hits:
+        print(f"  {score:7.3f}  {key}  — {title}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""Dependency graph of MDX snippet imports.
+
+Pages pull shared fragments from snippets/ with MDX imports:
+
+    import SearchRequestExample from "/snippets/news-api/search-request-example.mdx";
+
+One pass over every .mdx/.md file (snippets included, since snippets may
+import other snippets) records these edges.  Import paths are normalized to
+repo-relative file paths: absolute specifiers resolve from the repo root,
+relative ones from the importing file.  Imports inside code fences are
+example code, not includes, and are ignored.
+
+The import specifiers of each file are kept in the build cache
+(build_cache.py) keyed by the file's content, so only changed files are
+re-scanned.  From the edges:
+
+- `dependencies(path)`: every snippet a file includes, transitively
+- `dependents(path)`: every file that includes it, transitively
+- `affected_pages(changed)`: the pages to rebuild when files change
+- `unused_snippets()`: snippets no page reaches
+- `missing`: imports of files that do not exist
+
+Usage:
+    python scripts/snippet_graph.py                      # summary, unused and missing
+    python scripts/snippet_graph.py --strict             # exit 1 on unused snippets too
+    python scripts/snippet_graph.py --deps news-api/get-started/quickstart.mdx
+    python scripts/snippet_graph.py --affected snippets/news-api/search-request-example.mdx
+    git diff --name-only main | python scripts/snippet_graph.py --affected -
+    python scripts/snippet_graph.py --json
+
+Requirements:
+    Python 3.10+, stdlib only
+"""
+
+import argparse
+import json
+import os
+import posixpath
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import patterns
+from build_cache import BUILD_CACHE, add_cache_arguments, apply_cache_arguments, cache_key
+from profiling import PROFILER
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+SNIPPETS_DIR = "snippets"
+
+# Build cache namespace of each file's import specifiers; bump the version
+# when scanning rules change so cached imports are discarded.
+CACHE_NAMESPACE = "snippet-imports"
+GRAPH_VERSION = 1
+
+# Directories that never contain pages or snippets.
+SKIP_DIRS = {"node_modules", "scripts", "exported-api-markdown"}
+
+# ---------------------------------------------------------------------------
+# Scanning
+# ---------------------------------------------------------------------------
+
+
+def iter_sources(root: Path):
+    """Yield the repo-relative POSIX path of every .mdx/.md file."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(
+            d for d in dirnames if not d.startswith(".") and d not in SKIP_DIRS
+        )
+        rel_dir = Path(dirpath).relative_to(root).as_posix()
+        for filename in sorted(filenames):
+            if filename.endswith((".mdx", ".md")) and filename != "README.md":
+                yield filename if rel_dir == "." else f"{rel_dir}/{filename}"
+
+
+def scan_imports(text: str) -> list[str]:
+    """Return the MDX import specifiers in `text`, skipping code fences."""
+    specifiers = []
+    fence = None
+    for line in text.splitlines():
+        marker = patterns.CODE_FENCE.match(line)
+        if marker:
+            if fence is None:
+                fence = marker.group(1)
+            elif marker.group(1) == fence:
+                fence = None
+            continue
+        if fence is None and line.startswith("import"):
+            match = patterns.MDX_INCLUDE.match(line)
+            if match:
+                specifiers.append(match.group(1))
+    return specifiers
+
+
+def resolve_import(importer: str, specifier: str) -> str:
+    """Resolve an import specifier to a repo-relative path."""
+    if specifier.startswith("/"):
+        return posixpath.normpath(specifier.lstrip("/"))
+    return posixpath.normpath(posixpath.join(posixpath.dirname(importer), specifier))
+
+
+def normalize_path(root: Path, value: str) -> str:
+    """Accept a repo-relative, `/`-prefixed or absolute path; return it repo-relative."""
+    path = Path(value)
+    if path.is_absolute() and path.is_relative_to(root):
+        return path.relative_to(root).as_posix()
+    return posixpath.normpath(value.lstrip("/"))
+
+
+def is_snippet(path: str) -> bool:
+    return path.startswith(f"{SNIPPETS_DIR}/")
+
+
+# ---------------------------------------------------------------------------
+# Graph
+# ---------------------------------------------------------------------------
+
+
+def _closure(edges: dict[str, list[str]], start: str) -> set[str]:
+    seen: set[str] = set()
+    stack = list(edges.get(start, ()))
+    while stack:
+        node = stack.pop()
+        if node not in seen:
+            seen.add(node)
+            stack.extend(edges.get(node, ()))
+    seen.discard(start)
+    return seen
+
+
+@dataclass
+class SnippetGraph:
+    """Forward (file -> includes) and reverse (file -> includers) edges."""
+
+    files: list[str]
+    forward: dict[str, list[str]]
+    reverse: dict[str, list[str]] = field(default_factory=dict)
+    # (importer, target) for imports of files that do not exist.
+    missing: list[tuple[str, str]] = field(default_factory=list)
+
+    def __post_init__(self):
+        if not self.reverse:
+            for source, targets in self.forward.items():
+                for target in targets:
+                    self.reverse.setdefault(target, []).append(source)
+
+    @property
+    def snippets(self) -> list[str]:
+        return [path for path in self.files if is_snippet(path)]
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(targets) for targets in self.forward.values())
+
+    def dependencies(self, path: str) -> set[str]:
+        """Every file `path` includes, directly or through other snippets."""
+        return _closure(self.forward, path)
+
+    def dependents(self, path: str) -> set[str]:
+        """Every file that includes `path`, directly or through other snippets."""
+        return _closure(self.reverse, path)
+
+    def affected_pages(self, changed) -> set[str]:
+        """Pages whose rendered output depends on any of the `changed` files."""
+        files = set(self.files)
+        affected: set[str] = set()
+        for path in changed:
+            affected.add(path)
+            affected |= self.dependents(path)
+        return {path for path in affected if path in files and not is_snippet(path)}
+
+    def unused_snippets(self) -> list[str]:
+        """Snippets not reachable from any page."""
+        reachable: set[str] = set()
+        for path in self.files:
+            if not is_snippet(path):
+                reachable |= self.dependencies(path)
+        return [path for path in self.snippets if path not in reachable]
+
+
+def build_graph(root: Path, use_cache: bool = True) -> tuple[SnippetGraph, dict]:
+    """
+    Scan every MDX file once and return (graph, stats).
+
+    Files whose content is in the build cache reuse their recorded imports.
+    """
+    entries: dict[str, list[str]] = {}
+    stats = {"files": 0, "scanned": 0, "reused": 0}
+    for rel in iter_sources(root):
+        raw = PROFILER.read_bytes(root / rel)
+        key = cache_key(CACHE_NAMESPACE, GRAPH_VERSION, raw)
+        specifiers = BUILD_CACHE.get_json(CACHE_NAMESPACE, key) if use_cache else None
+        if specifiers is not None:
+            stats["reused"] += 1
+        else:
+            specifiers = scan_imports(raw.decode("utf-8"))
+            if use_cache:
+                BUILD_CACHE.put_json(CACHE_NAMESPACE, key, specifiers)
+            stats["scanned"] += 1
+        entries[rel] = [resolve_import(rel, spec) for spec in specifiers]
+    stats["files"] = len(entries)
+    PROFILER.count("snippet graph files scanned", stats["scanned"])
+
+    forward: dict[str, list[str]] = {}
+    missing: list[tuple[str, str]] = []
+    for rel, imports in entries.items():
+        for target in imports:
+            if target in entries:
+                forward.setdefault(rel, []).append(target)
+            else:
+                missing.append((rel, target))
+
+    return SnippetGraph(files=list(entries), forward=forward, missing=missing), stats
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def _read_paths(root: Path, values: list[str]) -> list[str]:
+    if values == ["-"]:
+        values = [line.strip() for line in sys.stdin if line.strip()]
+    return [normalize_path(root, value) for value in values]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Build the MDX snippet dependency graph.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    query = parser.add_mutually_exclusive_group()
+    query.add_argument(
+        "--deps", metavar="FILE", help="List the snippets FILE includes (transitively)"
+    )
+    query.add_argument(
+        "--affected",
+        nargs="+",
+        metavar="FILE",
+        help="List the pages to rebuild when FILE(s) change ('-' reads stdin)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the graph as JSON")
+    parser.add_argument(
+        "--strict", action="store_true", help="Exit 1 when a snippet is unused"
+    )
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+    apply_cache_arguments(args)
+
+    root = Path(__file__).resolve().parent.parent
+    graph, stats = build_graph(root, use_cache=not args.no_cache)
+
+    if args.deps:
+        path = normalize_path(root, args.deps)
+        if path not in graph.files:
+            print(f"Error: {path} is not an MDX file in this repo", file=sys.stderr)
+            sys.exit(1)
+        result = sorted(graph.dependencies(path))
+        print(json.dumps(result, indent=2) if args.json else "\n".join(result))
+        return
+
+    if args.affected:
+        result = sorted(graph.affected_pages(_read_paths(root, args.affected)))
+        print(json.dumps(result, indent=2) if args.json else "\n".join(result))
+        return
+
+    unused = graph.unused_snippets()
+    if args.json:
+        json.dump(
+            {
+                "forward": graph.forward,
+                "reverse": graph.reverse,
+                "unused": unused,
+                "missing": [{"page": page, "import": target} for page, target in graph.missing],
+            },
+            sys.stdout,
+            indent=2,
+            sort_keys=True,
+        )
+        sys.stdout.write("\n")
+    else:
+        print(
+            f"Scanned {stats['files']} files ({stats['scanned']} parsed, "
+            f"{stats['reused']} cached): {len(graph.snippets)} snippets, "
+            f"{graph.edge_count} imports."
+        )
+        for snippet in graph.snippets:
+            pages = sorted(graph.dependents(snippet))
+            print(f"  {snippet}  ← {len(pages)} file(s)")
+        for path in unused:
+            print(f"⚠  Unused snippet: {path}")
+        for page, target in graph.missing:
+            print(f"✗  {page}: imports missing file {target}")
+
+    if graph.missing or (args.strict and unused):
+        sys.exit(1)
+    if not args.json:
+        print("✓  All snippet imports resolve.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Regression tests for restructure_plan.py link rewriting.
+
+Run from the repository root:
+
+    python -m pytest scripts/tests
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import scripts  # noqa: F401  (puts the scripts folder on sys.path)
+from restructure_plan import plan_changes
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Link text wrapped onto the next line, as in configure-monitors.mdx.
+LINKING_PAGE = """---
+title: Configure monitors
+---
+
+For help, see [Troubleshoot
+monitors](/web-search-api/how-to/troubleshoot-monitors) for solutions.
+
+If webhooks fail, see [Webhook not
+firing](/web-search-api/how-to/troubleshoot-monitors#webhook-not-firing).
+
+- [Troubleshoot monitors](/web-search-api/how-to/troubleshoot-monitors)
+"""
+
+
+def _site(root: Path) -> None:
+    pages = [
+        "web-search-api/how-to/configure-monitors",
+        "web-search-api/how-to/troubleshoot-monitors",
+    ]
+    docs_json = {
+        "navigation": {
+            "tabs": [{"tab": "Web Search API", "groups": [{"group": "How-to", "pages": pages}]}]
+        }
+    }
+    (root / "docs.json").write_text(json.dumps(docs_json, indent=2) + "\n", encoding="utf-8")
+    redirect_map = {"version": "1.0.0", "redirects": []}
+    (root / "redirect-map.json").write_text(json.dumps(redirect_map, indent=2) + "\n")
+    shutil.copy(REPO_ROOT / "redirect-map.schema.json", root / "redirect-map.schema.json")
+    how_to = root / "web-search-api" / "how-to"
+    how_to.mkdir(parents=True)
+    (how_to / "configure-monitors.mdx").write_text(LINKING_PAGE, encoding="utf-8")
+    (how_to / "troubleshoot-monitors.mdx").write_text("---\ntitle: Troubleshoot\n---\n")
+
+
+def test_move_rewrites_wrapped_incoming_links(tmp_path):
+    _site(tmp_path)
+    errors: list[str] = []
+    source = "web-search-api/how-to/troubleshoot-monitors"
+    destination = "web-search-api/how-to/monitor-troubleshooting"
+    _, changes, stats = plan_changes(tmp_path, [(source, destination)], errors)
+
+    assert errors == []
+    change = next(c for c in changes if c.path == "web-search-api/how-to/configure-monitors.mdx")
+    assert change.links == 3
+    assert "/troubleshoot-monitors" not in change.after
+    assert change.after == LINKING_PAGE.replace("troubleshoot-monitors", "monitor-troubleshooting")
+    assert stats["links"] == 3
@@ -14,41 +14,42 @@ Author: Documentation Team
 import os
 import re
 import sys
-import json
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import List, Optional, Tuple
 
+from redirect_snapshot import RedirectTable, load_redirect_table
 
-def load_redirect_mapping(json_file: str) -> Dict[str, str]:
+
+def load_redirect_mapping(json_file: str) -> RedirectTable:
     """
     Load URL mappings from JSON file.
 
-    Returns dict of source -> destination
+    Returns the compiled redirect table; look paths up with lookup_redirect.
     """
-    with open(json_file, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    mappings = {}
+    # Read through the compiled snapshot (rebuilt when the JSON changes)
+    table = load_redirect_table(json_file)
 
-    # Load individual redirects
-    for redirect in data.get("redirects", []):
-        source = redirect["source"]
-        destination = redirect["destination"]
+    print(f"Loaded {len(table)} redirect rules")
 
-        # Store both with and without /docs prefix
-        mappings[source] = destination
+    return table
 
-        # Also handle paths without /docs prefix
-        if source.startswith("/docs/"):
-            mappings[source.replace("/docs/", "/")] = destination.replace("/docs/", "/")
 
-    print(f"Loaded {len(data.get('redirects', []))} redirect rules")
-    print(f"Total mappings (including variants): {len(mappings)}")
+def lookup_redirect(table: RedirectTable, path: str) -> Optional[str]:
+    """
+    Return the new path for `path`, or None if no rule matches.
 
-    return mappings
+    Sources carry the /docs prefix.  A path without it matches the /docs
+    rule too, and then gets the destination without the prefix.
+    """
+    destination = table.get(path)
+    if destination is None:
+        destination = table.get(f"/docs{path}")
+        if destination is not None:
+            destination = destination.replace("/docs/", "/")
+    return destination
 
 
-def update_markdown_links(content: str, mappings: Dict[str, str]) -> Tuple[str, int]:
+def update_markdown_links(content: str, table: RedirectTable) -> Tuple[str, int]:
     """
     Update markdown-style links: [text](/old/path) -> [text](/new/path)
 
@@ -74,16 +75,10 @@ def update_markdown_links(content: str, mappings: Dict[str, str]) -> Tuple[str,
             else ""
         )
 
-        # Try to find mapping
-        if base_url in mappings:
-            new_url = mappings[base_url] + anchor + query
-            replacements += 1
-            return f"[{text}]({new_url})"
-
-        # Try with /docs prefix if not found
-        docs_url = f"/docs{base_url}"
-        if docs_url in mappings:
-            new_url = mappings[docs_url] + anchor + query
+        # Try to find mapping (with or without the /docs prefix)
+        new_path = lookup_redirect(table, base_url)
+        if new_path is not None:
+            new_url = new_path + anchor + query
             replacements += 1
             return f"[{text}]({new_url})"
 
@@ -107,16 +102,10 @@ def update_markdown_links(content: str, mappings: Dict[str, str]) -> Tuple[str,
             else ""
         )
 
-        # Try to find mapping
-        if base_url in mappings:
-            new_url = mappings[base_url] + anchor + query
-            replacements += 1
-            return f"href={quote}{new_url}{quote}"
-
-        # Try with /docs prefix if not found
-        docs_url = f"/docs{base_url}"
-        if docs_url in mappings:
-            new_url = mappings[docs_url] + anchor + query
+        # Try to find mapping (with or without the /docs prefix)
+        new_path = lookup_redirect(table, base_url)
+        if new_path is not None:
+            new_url = new_path + anchor + query
             replacements += 1
             return f"href={quote}{new_url}{quote}"
 
@@ -130,7 +119,7 @@ def update_markdown_links(content: str, mappings: Dict[str, str]) -> Tuple[str,
     return updated, replacements
 
 
-def update_yaml_refs(content: str, mappings: Dict[str, str]) -> Tuple[str, int]:
+def update_yaml_refs(content: str, table: RedirectTable) -> Tuple[str, int]:
     """
     Update YAML references in OpenAPI specs.
 
@@ -174,8 +163,8 @@ def update_yaml_refs(content: str, mappings: Dict[str, str]) -> Tuple[str, int]:
         base_path = path.rstrip("/").split("#")[0].split("?")[0]
         anchor = "#" + path.split("#")[1] if "#" in path else ""
 
-        if base_path in mappings:
-            new_path = mappings[base_path]
+        new_path = lookup_redirect(table, base_path)
+        if new_path is not None:
             if "newscatcherapi.com" in url:
                 # Reconstruct full URL
                 base_url = url.split("/docs/")[0]
@@ -223,8 +212,8 @@ def update_yaml_refs(content: str, mappings: Dict[str, str]) -> Tuple[str, int]:
         base_path = path.rstrip("/").split("#")[0].split("?")[0]
         anchor = "#" + path.split("#")[1] if "#" in path else ""
 
-        if base_path in mappings:
-            new_path = mappings[base_path]
+        new_path = lookup_redirect(table, base_path)
+        if new_path is not None:
             if "newscatcherapi.com" in url:
                 # Reconstruct full URL
                 base_url = url.split("/docs/")[0]
@@ -245,7 +234,7 @@ def update_yaml_refs(content: str, mappings: Dict[str, str]) -> Tuple[str, int]:
 
 
 def process_file(
-    filepath: Path, mappings: Dict[str, str], dry_run: bool = False
+    filepath: Path, table: RedirectTable, dry_run: bool = False
 ) -> Tuple[bool, int]:
     """
     Process a single file to update links.
@@ -267,9 +256,9 @@ def process_file(
 
     # Update based on file type
     if filepath.suffix in [".md", ".mdx"]:
-        content, replacements = update_markdown_links(content, mappings)
+        content, replacements = update_markdown_links(content, table)
     elif filepath.suffix in [".yml", ".yaml"]:
-        content, replacements = update_yaml_refs(content, mappings)
+        content, replacements = update_yaml_refs(content, table)
     else:
         return False, 0
 
@@ -343,7 +332,7 @@ def main():
         print()
 
     # Load mappings
-    mappings = load_redirect_mapping(json_file)
+    table = load_redirect_mapping(json_file)
     print()
 
     # Find files to process
@@ -369,7 +358,7 @@ def main():
     total_replacements = 0
 
     for filepath in all_files:
-        modified, replacements = process_file(filepath, mappings, dry_run)
+        modified, replacements = process_file(filepath, table, dry_run)
 
         if modified:
             modified_files.append(filepath)
@@ -0,0 +1,624 @@
+#!/usr/bin/env python3
+"""Validate the request examples in the docs against the OpenAPI specs.
+
+Pages and snippets embed curl commands and JSON request bodies, and nothing
+ties them to the specs in OAS_SPECS, so examples go stale when the API
+changes.  This script scans every .mdx/.md file once, streaming its fenced
+code blocks, and checks two kinds of example:
+
+- curl commands (in any code block): the URL's host selects the spec (from
+  its `servers`) and the path and method select the operation.  The query
+  string is checked against the operation's query parameters and a JSON
+  `-d`/`--data` body against its request body schema.
+- bare JSON blocks: checked as a request body fragment (required fields are
+  not enforced) for the endpoint of the nearest curl command above them in
+  the same file, or the page's `openapi:` frontmatter.  Blocks whose keys
+  look like a response rather than a request are skipped.
+
+Reported problems:
+
+- unknown-endpoint: the path or method does not exist in the spec
+- unknown-field: a body field or query parameter the operation does not have
+- invalid: a value that fails the schema (type, enum, limits, required)
+- bad-json: a curl body that is not valid JSON
+
+Schemas are compiled into validators once per component (see
+schema_compiler.py) and shared by every operation and example that uses
+them.
+
+Usage:
+    python scripts/validate_examples.py
+    python scripts/validate_examples.py --spec news-api-v3
+    python scripts/validate_examples.py --json          # machine-readable report
+
+Exits 1 if any example is stale.
+
+Requirements:
+    pip install pyyaml
+"""
+
+import argparse
+import json
+import re
+import shlex
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+import patterns
+from build_cache import add_cache_arguments, apply_cache_arguments
+from generate_llms_txt import OAS_SPECS, parse_frontmatter
+from oas_deref import Resolver, load_spec, spec_path
+from oas_index import parse_openapi_field
+from profiling import PROFILER, add_profile_arguments, profile_session
+from schema_compiler import Check, compile_schema
+from snippet_graph import iter_sources
+
+# curl options that take an argument.
+CURL_ARG_OPTIONS = {
+    "-X", "--request", "-H", "--header", "-d", "--data", "--data-raw",
+    "--data-binary", "--data-urlencode", "--json", "-o", "--output", "-u",
+    "--user", "-F", "--form", "--url", "-A", "--user-agent", "-w",
+    "--write-out", "-m", "--max-time", "-b", "--cookie", "-e", "--referer",
+}  # fmt: skip
+CURL_DATA_OPTIONS = {"-d", "--data", "--data-raw", "--data-binary", "--json"}
+
+# ---------------------------------------------------------------------------
+# Extraction
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class CodeBlock:
+    line: int  # 1-based line of the opening fence
+    lang: str
+    text: str
+    group: int | None  # index of the enclosing <CodeGroup>, if any
+
+
+def iter_code_blocks(text: str):
+    """Yield the fenced code blocks of a page, dedented to their fence."""
+    fence = indent = group = None
+    groups = 0
+    lang, start, body = "", 0, []
+    for number, line in enumerate(text.splitlines(), 1):
+        marker = patterns.CODE_FENCE.match(line)
+        if fence is None:
+            if marker:
+                fence = marker.group(1)
+                indent = line[: len(line) - len(line.lstrip())]
+                info = line.strip()[len(fence) :].split()
+                lang, start, body = (info[0].lower() if info else ""), number, []
+            elif line.lstrip().startswith("<CodeGroup"):
+                groups += 1
+                group = groups
+            elif line.lstrip().startswith("</CodeGroup>"):
+                group = None
+        elif marker and marker.group(1) == fence:
+            yield CodeBlock(start, lang, "\n".join(body), group)
+            fence = None
+        else:
+            body.append(line[len(indent) :] if line.startswith(indent) else line.lstrip())
+
+
+def split_commands(text: str) -> list[str]:
+    """Split shell text into logical commands (quotes and `\\` continuations kept together)."""
+    commands, current, quote = [], [], None
+    i, n = 0, len(text)
+    while i < n:
+        ch = text[i]
+        if quote:
+            if ch == quote:
+                quote = None
+            elif ch == "\\" and quote == '"' and i + 1 < n:
+                current.append(ch)
+                i += 1
+                ch = text[i]
+        elif ch == "#" and not "".join(current).strip():
+            while i < n and text[i] != "\n":
+                i += 1
+            continue
+        elif ch in "'\"":
+            quote = ch
+        elif ch == "\\" and text[i + 1 : i + 2] == "\n":
+            current.append(" ")
+            i += 2
+            continue
+        elif ch == "\n":
+            commands.append("".join(current))
+            current = []
+            i += 1
+            continue
+        current.append(ch)
+        i += 1
+    commands.append("".join(current))
+    return [command.strip() for command in commands if command.strip()]
+
+
+@dataclass
+class CurlRequest:
+    method: str
+    url: str
+    body: str | None
+
+
+def parse_curl(command: str) -> CurlRequest | None:
+    """Return the method, URL and data of a curl command, or None if it is not one."""
+    try:
+        tokens = shlex.split(command)
+    except ValueError:
+        return None
+    if not tokens or tokens[0] != "curl":
+        return None
+    method = url = body = None
+    get = False
+    query: list[str] = []
+    i = 1
+    while i < len(tokens):
+        token = tokens[i]
+        if token in ("|", "&&", "||", ";", ">"):
+            break
+        value = tokens[i + 1] if i + 1 < len(tokens) else ""
+        if token in ("-X", "--request"):
+            method = value.upper()
+        elif token.startswith("-X") and len(token) > 2:
+            method = token[2:].upper()
+        elif token in ("-G", "--get"):
+            get = True
+        elif token == "--data-urlencode":
+            query.append(value)
+        elif token in CURL_DATA_OPTIONS:
+            body = value
+        elif token == "--url":
+            url = value
+        elif not token.startswith("-") and url is None:
+            url = token
+        if token in CURL_ARG_OPTIONS:
+            i += 1
+        i += 1
+    if url is None:
+        return None
+    if get and body is not None:
+        query.append(body)
+        body = None
+    if query:
+        url += ("&" if "?" in url else "?") + "&".join(query)
+    return CurlRequest(method or ("POST" if body is not None else "GET"), url, body)
+
+
+# ---------------------------------------------------------------------------
+# Operations
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class Operation:
+    spec: str
+    method: str
+    path: str
+    body: Check | None  # None if the operation takes no JSON body
+    body_required: bool
+    body_fields: set[str] | None  # None if any field is allowed
+    response_fields: set[str]
+    query: dict[str, tuple[dict, Check]]  # name -> (schema, check)
+    required_query: set[str]
+
+    @property
+    def label(self) -> str:
+        return f"{self.method.upper()} {self.path}"
+
+
+def _template_regex(path: str) -> re.Pattern:
+    parts = re.split(r"(\{[^}]+\})", path)
+    return re.compile(
+        "^" + "".join("[^/]+" if p.startswith("{") else re.escape(p) for p in parts) + "/?$"
+    )
+
+
+class SpecValidators:
+    """Route URLs to operations of one spec and compile their validators lazily."""
+
+    def __init__(self, name: str, spec: dict):
+        self.name = name
+        self.spec = spec
+        self.resolver = Resolver(spec)
+        self.hosts: dict[str, str] = {}  # host -> base path
+        for server in spec.get("servers") or ():
+            parts = urlsplit(str(server.get("url", "")))
+            if parts.netloc:
+                self.hosts[parts.netloc.lower()] = parts.path.rstrip("/")
+        # Literal paths first, so /monitors/create wins over /monitors/{id}.
+        self.routes = sorted(
+            ((path, _template_regex(path)) for path in spec.get("paths") or {}),
+            key=lambda route: route[0].count("{"),
+        )
+        self._compiled: dict[str, Check] = {}
+        self._operations: dict[tuple[str, str], Operation] = {}
+        self.compiled = 0
+
+    def _compile_ref(self, ref: str) -> Check:
+        """Compiled check of a component, built once and reused by every schema."""
+        check = self._compiled.get(ref)
+        if check is None:
+            slot: list[Check] = []
+
+            # Stands in for the component while it compiles (recursive schemas).
+            def deferred(value, path, errors):
+                slot[0](value, path, errors)
+
+            self._compiled[ref] = deferred
+            slot.append(compile_schema(self.resolver.pointer(ref), self._compile_ref))
+            check = self._compiled[ref] = slot[0]
+            self.compiled += 1
+        return check
+
+    def _target(self, node) -> dict:
+        """Follow `$ref`s to the raw node, leaving the refs inside it in place."""
+        while isinstance(node, dict) and isinstance(node.get("$ref"), str):
+            node = self.resolver.pointer(node["$ref"])
+        return node if isinstance(node, dict) else {}
+
+    def _fields(self, schema) -> set[str] | None:
+        """Top-level property names of a resolved schema, or None if open-ended."""
+        if not isinstance(schema, dict):
+            return None
+        members = [*(schema.get("anyOf") or ()), *(schema.get("oneOf") or ())]
+        names = set(schema.get("properties") or ())
+        for part in schema.get("allOf") or ():
+            part_names = self._fields(part)
+            if part_names is None:
+                return None
+            names |= part_names
+        for member in members:
+            if isinstance(member, dict) and member.get("type") in ("null", "string", "array"):
+                continue
+            member_names = self._fields(member)
+            if member_names is None:
+                return None
+            names |= member_names
+        if schema.get("additionalProperties") not in (None, False):
+            return None
+        if not names and not members and schema.get("type") != "object":
+            return None
+        return names
+
+    def match(self, url: str) -> tuple[str | None, bool]:
+        """Return (template path, host matched) for a URL."""
+        parts = urlsplit(url)
+        base = self.hosts.get(parts.netloc.lower())
+        if base is None:
+            return None, False
+        path = parts.path[len(base) :] if parts.path.startswith(base) else parts.path
+        for template, regex in self.routes:
+            if regex.match(path):
+                return template, True
+        return None, True
+
+    def operation(self, method: str, path: str) -> Operation | None:
+        key = (method, path)
+        if key in self._operations:
+            return self._operations[key]
+        item = (self.spec.get("paths") or {}).get(path) or {}
+        op = item.get(method)
+        if not isinstance(op, dict):
+            return None
+
+        body = body_fields = None
+        body_required = False
+        if op.get("requestBody"):
+            request = self.resolver.resolve(op["requestBody"])
+            media = (request.get("content") or {}).get("application/json") or {}
+            raw = (self._target(op["requestBody"]).get("content") or {}).get("application/json")
+            if "schema" in media:
+                body = compile_schema(raw["schema"], self._compile_ref)
+                body_fields = self._fields(media["schema"])
+                body_required = bool(request.get("required"))
+
+        response_fields: set[str] = set()
+        for status, response in (op.get("responses") or {}).items():
+            if str(status).startswith("2"):
+                content = (self.resolver.resolve(response).get("content") or {})
+                schema = (content.get("application/json") or {}).get("schema")
+                response_fields |= self._fields(schema) or set()
+
+        query: dict[str, tuple[dict, Check]] = {}
+        required_query: set[str] = set()
+        for raw in [*(item.get("parameters") or ()), *(op.get("parameters") or ())]:
+            param = self.resolver.resolve(raw)
+            if param.get("in") != "query":
+                continue
+            raw_schema = self._target(raw).get("schema") or {}
+            query[param["name"]] = (
+                param.get("schema") or {},
+                compile_schema(raw_schema, self._compile_ref),
+            )
+            if param.get("required"):
+                required_query.add(param["name"])
+
+        operation = Operation(
+            self.name, method, path, body, body_required, body_fields,
+            response_fields, query, required_query,
+        )  # fmt: skip
+        self._operations[key] = operation
+        return operation
+
+
+# ---------------------------------------------------------------------------
+# Validation
+# ---------------------------------------------------------------------------
+
+
+def _schema_types(schema: dict) -> set[str]:
+    types = schema.get("type")
+    found = set(types) if isinstance(types, list) else {types} if types else set()
+    for member in [*(schema.get("anyOf") or ()), *(schema.get("oneOf") or ())]:
+        if isinstance(member, dict):
+            found |= _schema_types(member)
+    return found
+
+
+def coerce_query_value(value: str, schema: dict):
+    """Convert a query string value to the JSON type its parameter schema expects."""
+    types = _schema_types(schema)
+    if types & {"integer", "number"} and re.fullmatch(r"-?\d+", value):
+        return int(value)
+    if "number" in types and re.fullmatch(r"-?\d*\.\d+", value):
+        return float(value)
+    if "boolean" in types and value in ("true", "false"):
+        return value == "true"
+    if "array" in types and "string" not in types:
+        return value.split(",")
+    return value
+
+
+def _known(name: str, fields) -> bool:
+    # Dynamic names such as `custom_tags.<taxonomy>` extend a documented field.
+    return name in fields or name.split(".", 1)[0] in fields
+
+
+class Report:
+    """Issues found in one file, tagged with where they occurred."""
+
+    def __init__(self, rel: str):
+        self.rel = rel
+        self.issues: list[dict] = []
+
+    def add(self, kind: str, line: int, operation: str, message: str) -> None:
+        self.issues.append(
+            {
+                "type": kind,
+                "where": f"{self.rel}:{line}",
+                "operation": operation,
+                "message": message,
+            }
+        )
+
+
+def check_body(report: Report, line: int, operation: Operation, body, fragment: bool) -> None:
+    """Validate a decoded request body; fragments skip the top-level required check."""
+    label = operation.label
+    if operation.body is None:
+        report.add("invalid", line, label, "operation takes no JSON body")
+        return
+    if isinstance(body, dict) and operation.body_fields is not None:
+        for name in body:
+            if not _known(name, operation.body_fields):
+                report.add("unknown-field", line, label, f"body field '{name}'")
+    errors: list = []
+    operation.body(body, "", errors)
+    for path, message in errors:
+        if not path and message.startswith("missing required field") and fragment:
+            continue
+        if not path and message.startswith("unexpected field"):
+            continue  # reported as unknown-field
+        report.add("invalid", line, label, f"{path or 'body'}: {message}")
+
+
+def check_query(
+    report: Report, line: int, operation: Operation, query: str, complete: bool
+) -> None:
+    """Validate a query string; `complete` also requires the required parameters."""
+    label = operation.label
+    seen = set()
+    for name, value in parse_qsl(query, keep_blank_values=True):
+        seen.add(name)
+        if name not in operation.query:
+            if not _known(name, operation.query):
+                report.add("unknown-field", line, label, f"query parameter '{name}'")
+            continue
+        schema, check = operation.query[name]
+        errors: list = []
+        check(coerce_query_value(value, schema), name, errors)
+        for path, message in errors:
+            report.add("invalid", line, label, f"{path}: {message}")
+    if complete:
+        for name in sorted(operation.required_query - seen):
+            report.add("invalid", line, label, f"missing required query parameter '{name}'")
+
+
+class ExampleChecker:
+    """One pass over the docs, checking each example as its code block streams by."""
+
+    def __init__(self, validators: list[SpecValidators]):
+        self.validators = validators
+        self.by_name = {v.name: v for v in validators}
+        self.stats = {"files": 0, "blocks": 0, "curl": 0, "json": 0, "skipped": 0}
+
+    def route(self, request: CurlRequest, report: Report, line: int) -> Operation | None:
+        """Return the operation a curl request targets (None if not one of ours)."""
+        for validators in self.validators:
+            path, host_matched = validators.match(request.url)
+            if not host_matched:
+                continue
+            label = f"{request.method} {urlsplit(request.url).path}"
+            if path is None:
+                report.add("unknown-endpoint", line, label, f"no such path in {validators.name}")
+                return None
+            operation = validators.operation(request.method.lower(), path)
+            if operation is None:
+                message = f"{request.method} not defined for {path}"
+                report.add("unknown-endpoint", line, label, message)
+            return operation
+        return None
+
+    def check_curl(self, report: Report, line: int, request: CurlRequest) -> Operation | None:
+        operation = self.route(request, report, line)
+        if operation is None:
+            return None
+        self.stats["curl"] += 1
+        query = urlsplit(request.url).query
+        # A command with no parameters at all only illustrates the endpoint
+        # (headers, auth), so required parameters are not enforced for it.
+        complete = bool(query or request.body)
+        check_query(report, line, operation, query, complete and operation.body is None)
+        if request.body is None:
+            if complete and operation.body_required:
+                report.add("invalid", line, operation.label, "missing request body")
+        elif not request.body.startswith("@"):
+            try:
+                body = json.loads(request.body)
+            except ValueError as exc:
+                report.add("bad-json", line, operation.label, str(exc))
+            else:
+                check_body(report, line, operation, body, fragment=False)
+        return operation
+
+    def check_json(self, report: Report, block: CodeBlock, operation: Operation | None) -> None:
+        """Check a bare JSON block as a body fragment if it looks like a request."""
+        try:
+            body = json.loads(block.text)
+        except ValueError:
+            body = None
+        if (
+            not isinstance(body, dict)
+            or operation is None
+            or operation.body is None
+            or operation.body_fields is None
+        ):
+            self.stats["skipped"] += 1
+            return
+        keys = {name.split(".", 1)[0] for name in body}
+        request_hits = len(keys & operation.body_fields)
+        if not request_hits or request_hits < len(keys & operation.response_fields):
+            self.stats["skipped"] += 1
+            return
+        self.stats["json"] += 1
+        check_body(report, block.line, operation, body, fragment=True)
+
+    def check_file(self, rel: str, text: str) -> list[dict]:
+        report = Report(rel)
+        context = self._frontmatter_operation(text)
+        # JSON blocks wait until their <CodeGroup> ends, so a curl command
+        # later in the same group decides their endpoint.
+        pending: list[CodeBlock] = []
+        self.stats["files"] += 1
+        for block in iter_code_blocks(text):
+            self.stats["blocks"] += 1
+            if pending and block.group != pending[0].group:
+                for waiting in pending:
+                    self.check_json(report, waiting, context)
+                pending = []
+            if "curl" in block.text:
+                for command in split_commands(block.text):
+                    request = parse_curl(command)
+                    if request is not None:
+                        context = self.check_curl(report, block.line, request) or context
+            elif block.lang == "json":
+                if block.group is None:
+                    self.check_json(report, block, context)
+                else:
+                    pending.append(block)
+        for waiting in pending:
+            self.check_json(report, waiting, context)
+        return report.issues
+
+    def _frontmatter_operation(self, text: str) -> Operation | None:
+        if not text.startswith("---"):
+            return None
+        value = parse_frontmatter(text).get("openapi")
+        if not value:
+            return None
+        spec, method, path = parse_openapi_field(value)
+        validators = self.by_name.get(spec)
+        return validators.operation(method, path) if validators else None
+
+
+def validate_examples(root: Path, specs: list[str]) -> tuple[list[dict], dict]:
+    """Check every example in the repo; return (issues, stats)."""
+    validators = []
+    with PROFILER.phase("load specs"):
+        for name in specs:
+            validators.append(SpecValidators(name, load_spec(spec_path(name, root))))
+    checker = ExampleChecker(validators)
+    issues: list[dict] = []
+    with PROFILER.phase("scan examples"):
+        for rel in iter_sources(root):
+            text = PROFILER.read_text(root / rel)
+            if "```" in text or "~~~" in text:
+                issues.extend(checker.check_file(rel, text))
+    checker.stats["validators"] = sum(v.compiled for v in validators)
+    for key in ("blocks", "curl", "json", "validators"):
+        PROFILER.count(f"examples {key}", checker.stats[key])
+    return issues, checker.stats
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Validate curl and JSON request examples against the OpenAPI specs.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument(
+        "--spec",
+        action="append",
+        choices=list(OAS_SPECS),
+        help="Only check examples for this spec (repeatable; default: all)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    add_cache_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    apply_cache_arguments(args)
+
+    with profile_session(args, "validate_examples"):
+        _run(args)
+
+
+def _run(args) -> None:
+    root = Path(__file__).resolve().parent.parent
+    started = time.perf_counter()
+    issues, stats = validate_examples(root, args.spec or list(OAS_SPECS))
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        json.dump({"stats": stats, "issues": issues}, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print(
+            f"Checked {stats['curl']} curl and {stats['json']} JSON example(s) in "
+            f"{stats['blocks']} code blocks across {stats['files']} files "
+            f"({stats['validators']} schemas compiled) in {elapsed * 1000:.0f} ms."
+        )
+        for issue in issues:
+            print(
+                f"  ✗ [{issue['type']}] {issue['where']}: "
+                f"{issue['operation']}: {issue['message']}"
+            )
+
+    if issues:
+        if not args.json:
+            print(f"\n✗  {len(issues)} stale request example(s).", file=sys.stderr)
+        sys.exit(1)
+    if not args.json:
+        print("✓  All request examples match the specs.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Validate every `openapi:` / `api:` frontmatter reference against the specs.
+
+`generate_llms_txt.py` falls back silently when an endpoint page points at
+an operation that does not exist, and `generate_sitemap.py` never looks at
+the frontmatter at all.  This script checks every reference in one pass:
+the frontmatter of all pages is scanned once, and each reference is looked
+up in a per-spec set of (method, path) pairs built from the cached
+operation index (see oas_index.py).
+
+Reported problems:
+
+- unknown spec: the spec name is not in OAS_SPECS (legacy `events-api` and
+  `news-api-v2` references are called out as such)
+- malformed reference: not of the form `<spec> <method> <path>`
+- missing operation: the spec has no such method and path
+- duplicate pages: more than one page documents the same operation
+
+Usage:
+    python scripts/validate_openapi_refs.py
+    python scripts/validate_openapi_refs.py --json   # machine-readable report
+
+Exits 1 if any problem is found.
+
+Requirements:
+    pip install pyyaml
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from build_cache import add_cache_arguments, apply_cache_arguments
+from generate_llms_txt import OAS_SPECS
+from oas_deref import HTTP_METHODS
+from oas_index import build_operation_index, operation_keys, scan_openapi_pages
+from profiling import PROFILER, add_profile_arguments, profile_session
+
+# Specs that used to be documented; see the note on OAS_SPECS.
+LEGACY_SPECS = ("events-api", "news-api-v2")
+
+# ---------------------------------------------------------------------------
+# Validation
+# ---------------------------------------------------------------------------
+
+
+def validate_refs(index: dict, refs: list) -> list[dict]:
+    """Return one issue dict per problem found in `refs`."""
+    keys = operation_keys(index)
+    issues = []
+    pages_by_op: dict[tuple[str, str, str], list[str]] = defaultdict(list)
+
+    for ref in refs:
+        where = {"page": ref.page, "field": ref.field, "value": ref.raw}
+        if ref.spec not in OAS_SPECS:
+            legacy = ref.spec in LEGACY_SPECS
+            issues.append(
+                {
+                    "type": "unknown-spec",
+                    **where,
+                    "message": (
+                        f"legacy spec '{ref.spec}' is no longer published"
+                        if legacy
+                        else f"unknown spec '{ref.spec}'"
+                    ),
+                }
+            )
+        elif ref.method not in HTTP_METHODS or not ref.path.startswith("/"):
+            issues.append(
+                {
+                    "type": "malformed",
+                    **where,
+                    "message": "expected '<spec> <method> <path>'",
+                }
+            )
+        elif (ref.method, ref.path) not in keys[ref.spec]:
+            issues.append(
+                {
+                    "type": "missing-operation",
+                    **where,
+                    "message": f"{ref.method.upper()} {ref.path} not found in {ref.spec}",
+                }
+            )
+        else:
+            pages_by_op[(ref.spec, ref.method, ref.path)].append(ref.page)
+
+    for (spec, method, path), pages in pages_by_op.items():
+        if len(pages) > 1:
+            issues.append(
+                {
+                    "type": "duplicate",
+                    "page": pages[0],
+                    "pages": pages,
+                    "value": f"{spec} {method} {path}",
+                    "message": f"{len(pages)} pages document {method.upper()} {path}",
+                }
+            )
+    return issues
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Validate openapi:/api: frontmatter references against the specs.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    add_cache_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    apply_cache_arguments(args)
+
+    with profile_session(args, "validate_openapi_refs"):
+        _run(args)
+
+
+def _run(args) -> None:
+    root = Path(__file__).resolve().parent.parent
+    started = time.perf_counter()
+    with PROFILER.phase("operation index"):
+        index = build_operation_index(root, use_cache=not args.no_cache)
+    with PROFILER.phase("scan pages"):
+        refs = scan_openapi_pages(root)
+    with PROFILER.phase("validate"):
+        issues = validate_refs(index, refs)
+    PROFILER.count("references", len(refs))
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        json.dump({"references": len(refs), "issues": issues}, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print(f"Checked {len(refs)} references in {elapsed * 1000:.0f} ms.")
+        for issue in issues:
+            print(f"  ✗ [{issue['type']}] {issue['page']}: {issue['message']}")
+            for page in issue.get("pages", [])[1:]:
+                print(f"      also {page}")
+
+    if issues:
+        if not args.json:
+            print(f"\n✗  {len(issues)} invalid openapi reference(s).", file=sys.stderr)
+        sys.exit(1)
+    if not args.json:
+        print("✓  All openapi references resolve.")
+
+
+if __name__ == "__main__":
+    main()
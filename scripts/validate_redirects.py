@@ -11,6 +11,15 @@ Validates redirect-map.json against schema and checks for:
 
 Usage:
     python validate_redirects.py redirect-map.json [--schema redirect-map.schema.json]
+    python validate_redirects.py redirect-map.json --streaming
+    python validate_redirects.py redirect-map.json --base origin/main [--verify-full]
+
+`--streaming` reads the file in pieces and runs the schema and custom checks
+in a single pass, collects every error with its entry index, and scales
+linearly to very large maps.
+
+`--base <git-ref>` validates only the rules added, removed or changed since
+that ref, plus the parts of the redirect graph they touch.
 
 Author: Documentation Team
 """
@@ -18,9 +27,13 @@ Author: Documentation Team
 import json
 import sys
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Set, TextIO, Tuple, Union
 from collections import defaultdict
 
+from schema_compiler import compile_schema, iter_object_members
+
+DEFAULT_SCHEMA = "redirect-map.schema.json"
+
 
 class RedirectValidator:
     def __init__(self, redirect_map: dict):
@@ -294,6 +307,433 @@ class RedirectValidator:
         print()
 
 
+class StreamingRedirectValidator(RedirectValidator):
+    """
+    Single-pass validator for very large redirect maps.
+
+    Reads redirect-map.json (a string, or a text file read piece by piece)
+    and decodes it one redirect entry at a time, running the compiled JSON
+    Schema checks, the type/status consistency checks, the
+    duplicate-source check and the self-redirect check on each entry as it
+    arrives.  Every error is collected with its entry index instead of
+    stopping at the first one.  Cycle and chain checks then run once over the
+    source -> destination graph built during the pass, in linear time.
+    """
+
+    def __init__(self, source: Union[str, TextIO], schema: dict):
+        super().__init__({})
+        self.source = source
+        self.schema = schema
+        self.graph: Dict[str, str] = {}
+        self.count = 0
+        self.check_document, self.check_entry, self.min_items = self._compile()
+
+    def _compile(self):
+        """Split the schema into a document-level and a per-entry validator."""
+        document_schema = dict(self.schema)
+        properties = dict(document_schema.get("properties", {}))
+        redirects_schema = properties.pop("redirects", {})
+        # `redirects` is validated entry by entry; keep it known to the
+        # document validator without re-checking the array.
+        properties["redirects"] = {}
+        document_schema["properties"] = properties
+        return (
+            compile_schema(document_schema),
+            compile_schema(redirects_schema.get("items", {})),
+            redirects_schema.get("minItems", 0),
+        )
+
+    def _validate_entry(self, i: int, redirect) -> bool:
+        """Run the schema, consistency and self-redirect checks on one entry."""
+        errors: list = []
+        self.check_entry(redirect, "", errors)
+        for path, message in errors:
+            where = f"{path}: " if path else ""
+            self.errors.append(f"Redirect #{i+1}: {where}{message}")
+        valid = not errors
+        if not isinstance(redirect, dict):
+            return valid
+
+        source = redirect.get("source")
+        redirect_type = redirect.get("type")
+        status_code = redirect.get("status_code")
+
+        if redirect_type == "permanent" and status_code not in [301, 308]:
+            self.warnings.append(
+                f"Redirect #{i+1}: Type is 'permanent' but status code is {status_code} (expected 301 or 308)"
+            )
+        if redirect_type == "temporary" and status_code not in [302, 307]:
+            self.warnings.append(
+                f"Redirect #{i+1}: Type is 'temporary' but status code is {status_code} (expected 302 or 307)"
+            )
+
+        if source == redirect.get("destination"):
+            self.errors.append(
+                f"Redirect #{i+1}: Source and destination are identical: {source}"
+            )
+            valid = False
+        return valid
+
+    def _validate_document(self, members: dict) -> bool:
+        """Check every top-level member except the redirect entries."""
+        errors: list = []
+        self.check_document(members, "", errors)
+        if "redirects" in members and self.count < self.min_items:
+            errors.append(("redirects", f"must contain at least {self.min_items} item(s)"))
+        for path, message in errors:
+            self.errors.append(f"Document: {path + ': ' if path else ''}{message}")
+        return not errors
+
+    def stream(self) -> bool:
+        """Run every per-entry check in one pass over the document."""
+        print("Validating redirect map in a single streaming pass...")
+
+        members = {}
+        first_seen: Dict[str, int] = {}
+        valid = True
+
+        try:
+            for kind, key, value in iter_object_members(self.source, "redirects"):
+                if kind == "member":
+                    members[key] = value
+                    continue
+                if kind == "array":
+                    # Entries are checked one by one below; the document
+                    # validator only needs to know the key is present.
+                    members[key] = []
+                    continue
+
+                i = key
+                self.count += 1
+                valid &= self._validate_entry(i, value)
+                if not isinstance(value, dict):
+                    continue
+
+                source = value.get("source")
+                if source in first_seen:
+                    self.errors.append(
+                        f"Source '{source}' appears in redirects #{first_seen[source]+1} and #{i+1}"
+                    )
+                    valid = False
+                else:
+                    first_seen[source] = i
+
+                self.graph[source] = value.get("destination")
+        except json.JSONDecodeError as e:
+            self.errors.append(f"Invalid JSON: {e}")
+            return False
+
+        valid &= self._validate_document(members)
+        print(f"  Checked {self.count} redirect rules")
+        return valid
+
+    @staticmethod
+    def find_cycles(graph: Dict[str, str], starts) -> List[str]:
+        """
+        Return every cycle reachable from `starts`, each reported once.
+
+        Cycles are rotated to begin at the node that comes first in `graph`
+        order, so the same cycle always produces the same message no matter
+        where the walk entered it.
+        """
+        order = {node: k for k, node in enumerate(graph)}
+        # 0 = unvisited, 1 = on the current walk, 2 = finished
+        state: Dict[str, int] = {}
+        cycles = []
+        for start in starts:
+            if state.get(start):
+                continue
+            walk = []
+            node = start
+            while node in graph and not state.get(node):
+                state[node] = 1
+                walk.append(node)
+                node = graph[node]
+            if state.get(node) == 1:
+                cycle = walk[walk.index(node) :]
+                first = min(range(len(cycle)), key=lambda k: order[cycle[k]])
+                cycle = cycle[first:] + cycle[:first]
+                cycles.append(" -> ".join(cycle + [cycle[0]]))
+            for visited in walk:
+                state[visited] = 2
+        return cycles
+
+    @staticmethod
+    def find_long_chains(graph: Dict[str, str], starts) -> List[str]:
+        """Return a warning for every chain from `starts` longer than 3 hops."""
+        # Chain length (in nodes) for every source that does not run into a
+        # cycle, memoised so each edge is followed once
+        lengths: Dict[str, int] = {}
+        cyclic: Set[str] = set()
+        starts = list(starts)
+        for start in starts:
+            walk = []
+            on_walk = set()
+            node = start
+            while (
+                node in graph
+                and node not in lengths
+                and node not in on_walk
+                and node not in cyclic
+            ):
+                on_walk.add(node)
+                walk.append(node)
+                node = graph[node]
+            if node in on_walk or node in cyclic:
+                cyclic.update(walk)
+                continue
+            length = lengths.get(node, 1)
+            for visited in reversed(walk):
+                length += 1
+                lengths[visited] = length
+
+        long_chains = []
+        for start in starts:
+            if lengths.get(start, 4) <= 3:
+                continue
+            chain = [start]
+            seen = {start}
+            current = start
+            while current in graph and graph[current] not in seen:
+                current = graph[current]
+                chain.append(current)
+                seen.add(current)
+            if len(chain) > 3:
+                long_chains.append(f"Long chain ({len(chain)} hops): {' -> '.join(chain)}")
+        return long_chains
+
+    def check_graph(self, starts=None) -> bool:
+        """Report circular redirects and long chains reachable from `starts`."""
+        print("Checking redirect graph...")
+
+        starts = self.graph if starts is None else starts
+        cycles = self.find_cycles(self.graph, starts)
+        for cycle in cycles:
+            self.errors.append(f"Circular redirect: {cycle}")
+
+        long_chains = self.find_long_chains(self.graph, starts)
+        if long_chains:
+            self.warnings.extend(long_chains)
+            print(f"  ⚠ Found {len(long_chains)} redirect chains longer than 3 hops")
+
+        if cycles:
+            return False
+        print(f"  ✓ No circular redirects found")
+        return True
+
+    def validate_all(self) -> bool:
+        """Run the streaming pass and the graph checks."""
+        print("=" * 70)
+        print("Redirect Map Validation (streaming)")
+        print("=" * 70)
+        print()
+
+        valid = self.stream()
+        valid &= self.check_graph()
+        return valid
+
+
+class IncrementalRedirectValidator(StreamingRedirectValidator):
+    """
+    Validates only what changed between a base version of the map and HEAD.
+
+    Entries are diffed as whole rules, so an edited rule counts as removed
+    (old form) plus added (new form).  The per-entry checks run on added
+    entries only; duplicate checks run on the sources they introduce; cycle
+    checks start from every source whose mapping changed; chain checks cover
+    every source upstream of such a change.  Added sources that are already
+    the destination of an unchanged rule are reported as shadowing it.
+
+    When the base version passes full validation, the errors reported here
+    are exactly the errors a full validation of HEAD would report (messages
+    use HEAD entry numbers), so the PR verdict is identical.
+    """
+
+    def __init__(self, text: str, base_text: str, schema: dict):
+        super().__init__(text, schema)
+        self.base_text = base_text
+        self.added: List[int] = []
+        self.removed: List[dict] = []
+        self.changed_sources: Set[str] = set()
+
+    @staticmethod
+    def _entry_key(redirect) -> str:
+        return json.dumps(redirect, sort_keys=True)
+
+    def diff(self, data: dict, base: dict) -> None:
+        """Compute added and removed entries as multisets of rules."""
+        base_counts: Dict[str, int] = defaultdict(int)
+        base_entries = base.get("redirects", []) if isinstance(base, dict) else []
+        for redirect in base_entries:
+            base_counts[self._entry_key(redirect)] += 1
+
+        head_entries = data.get("redirects", [])
+        for i, redirect in enumerate(head_entries):
+            key = self._entry_key(redirect)
+            if base_counts.get(key):
+                base_counts[key] -= 1
+            else:
+                self.added.append(i)
+
+        remaining = dict(base_counts)
+        for redirect in base_entries:
+            key = self._entry_key(redirect)
+            if remaining.get(key):
+                remaining[key] -= 1
+                self.removed.append(redirect)
+
+        head_sources = {
+            r.get("source") for r in (head_entries[i] for i in self.added) if isinstance(r, dict)
+        }
+        base_sources = {r.get("source") for r in self.removed if isinstance(r, dict)}
+        self.changed_sources = head_sources & base_sources
+
+    def validate_all(self) -> bool:
+        print("=" * 70)
+        print("Redirect Map Validation (incremental)")
+        print("=" * 70)
+        print()
+
+        try:
+            data = json.loads(self.source)
+            base = json.loads(self.base_text)
+        except json.JSONDecodeError as e:
+            self.errors.append(f"Invalid JSON: {e}")
+            return False
+
+        if not isinstance(data, dict) or not isinstance(data.get("redirects"), list):
+            # Structural problems: nothing to diff against, validate in full
+            return super().validate_all()
+
+        self.diff(data, base)
+        entries = data["redirects"]
+        self.count = len(entries)
+        added_sources = {
+            entries[i].get("source") for i in self.added if isinstance(entries[i], dict)
+        }
+        removed_sources = {r.get("source") for r in self.removed if isinstance(r, dict)}
+        print(
+            f"Changes vs base: {len(added_sources - removed_sources)} added, "
+            f"{len(removed_sources - added_sources)} removed, "
+            f"{len(self.changed_sources)} changed"
+        )
+        print()
+
+        print(f"Validating {len(self.added)} added or changed redirect rules...")
+        members = {k: v for k, v in data.items() if k != "redirects"}
+        members["redirects"] = []
+        valid = self._validate_document(members)
+        for i in self.added:
+            valid &= self._validate_entry(i, entries[i])
+
+        # Source -> entry indices, destination -> entry indices, and the graph
+        positions: Dict[str, List[int]] = defaultdict(list)
+        destinations: Dict[str, List[int]] = defaultdict(list)
+        for i, redirect in enumerate(entries):
+            if isinstance(redirect, dict):
+                source = redirect.get("source")
+                positions[source].append(i)
+                destinations[redirect.get("destination")].append(i)
+                self.graph[source] = redirect.get("destination")
+
+        print("Checking added sources for duplicates...")
+        for source in sorted(added_sources, key=lambda s: positions[s][0]):
+            indices = positions[source]
+            for j in indices[1:]:
+                self.errors.append(
+                    f"Source '{source}' appears in redirects #{indices[0]+1} and #{j+1}"
+                )
+                valid = False
+
+        print("Checking added sources for shadowed destinations...")
+        added_set = set(self.added)
+        for i in self.added:
+            redirect = entries[i]
+            if not isinstance(redirect, dict):
+                continue
+            for j in destinations.get(redirect.get("source"), []):
+                if j not in added_set:
+                    self.warnings.append(
+                        f"Redirect #{i+1}: Source {redirect.get('source')} shadows the "
+                        f"destination of redirect #{j+1}, which now takes an extra hop"
+                    )
+
+        # Every source whose mapping changed, plus everything upstream of it
+        touched = [s for s in self.graph if s in added_sources or s in removed_sources]
+        reverse: Dict[str, List[str]] = defaultdict(list)
+        for source, destination in self.graph.items():
+            reverse[destination].append(source)
+        upstream = set(touched)
+        frontier = list(touched)
+        while frontier:
+            node = frontier.pop()
+            for parent in reverse.get(node, []):
+                if parent not in upstream:
+                    upstream.add(parent)
+                    frontier.append(parent)
+        # Keep graph order so messages match a full run
+        affected = [s for s in self.graph if s in upstream]
+        print(f"  {len(affected)} source(s) in the affected graph neighbourhood")
+
+        valid &= self.check_graph(affected)
+        return valid
+
+
+def load_base_version(json_file: str, base_ref: str):
+    """Return the text of `json_file` at git ref `base_ref`, or None if absent."""
+    import subprocess
+
+    repo_path = Path(json_file).resolve().relative_to(Path.cwd().resolve())
+    result = subprocess.run(
+        ["git", "show", f"{base_ref}:{repo_path.as_posix()}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        if "exists on disk, but not in" in result.stderr or "does not exist in" in result.stderr:
+            return None
+        print(f"Error: could not read {repo_path} at {base_ref}:")
+        print(f"  {result.stderr.strip()}")
+        sys.exit(1)
+    return result.stdout
+
+
+def verify_incremental(
+    incremental: "IncrementalRedirectValidator", text: str, base_text: str, schema: dict
+) -> bool:
+    """
+    Cross-check an incremental run against full validations of base and HEAD.
+
+    Used to confirm the incremental mode in CI while it beds in: when the base
+    passes, the incremental errors must equal the full HEAD errors.
+    """
+    import contextlib
+    import io
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        full_base = StreamingRedirectValidator(base_text, schema)
+        base_valid = full_base.validate_all()
+        full_head = StreamingRedirectValidator(text, schema)
+        full_head.validate_all()
+
+    print("Cross-checking against full validation...")
+    if not base_valid:
+        extra = set(incremental.errors) - set(full_head.errors)
+        if extra:
+            print(f"  ❌ {len(extra)} incremental error(s) not reported by a full run")
+            return False
+        print("  ℹ️  Base has errors of its own; incremental errors are a subset of the full run")
+        return True
+
+    if sorted(incremental.errors) != sorted(full_head.errors):
+        print("  ❌ Incremental and full validation disagree:")
+        for error in sorted(set(incremental.errors) ^ set(full_head.errors)):
+            print(f"     - {error}")
+        return False
+    print("  ✓ Incremental errors match a full validation")
+    return True
+
+
 def validate_with_jsonschema(data: dict, schema_file: str) -> bool:
     """Validate using JSON Schema (if jsonschema is installed)."""
     try:
@@ -332,7 +772,7 @@ def main():
 
     if len(sys.argv) < 2:
         print(
-            "Usage: python validate_redirects.py redirect-map.json [--schema redirect-map.schema.json]"
+            "Usage: python validate_redirects.py redirect-map.json [--schema redirect-map.schema.json] [--streaming] [--base GIT_REF [--verify-full]]"
         )
         sys.exit(1)
 
@@ -350,6 +790,43 @@ def main():
         print(f"Error: File not found: {json_file}")
         sys.exit(1)
 
+    base_ref = None
+    if "--base" in sys.argv:
+        base_idx = sys.argv.index("--base")
+        if base_idx + 1 < len(sys.argv):
+            base_ref = sys.argv[base_idx + 1]
+
+    # Streaming mode: one pass over the raw text merging schema and custom
+    # checks.  Incremental mode builds on it and checks only the diff.
+    if "--streaming" in sys.argv or base_ref:
+        schema_path = Path(schema_file or DEFAULT_SCHEMA)
+        if not schema_path.exists():
+            print(f"Error: Schema file not found: {schema_path}")
+            sys.exit(1)
+        with open(schema_path, "r", encoding="utf-8") as f:
+            schema = json.load(f)
+
+        base_text = load_base_version(json_file, base_ref) if base_ref else None
+        with open(json_file, "r", encoding="utf-8") as f:
+            if base_text is None:
+                if base_ref:
+                    print(f"ℹ️  {json_file} does not exist at {base_ref} - validating in full\n")
+                # Read as the pass goes rather than loading the whole file.
+                validator = StreamingRedirectValidator(f, schema)
+            else:
+                print(f"Validating changes against {base_ref}\n")
+                text = f.read()
+                validator = IncrementalRedirectValidator(text, base_text, schema)
+            valid = validator.validate_all()
+        validator.print_summary()
+
+        if base_text is not None and "--verify-full" in sys.argv:
+            valid &= verify_incremental(validator, text, base_text, schema)
+
+        if not valid:
+            sys.exit(1)
+        return
+
     # Load JSON
     try:
         with open(json_file, "r", encoding="utf-8") as f:
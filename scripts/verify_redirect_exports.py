@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Redirect Export Verifier
+
+Parses every artifact written by export_redirects.py back into redirect
+rules and checks that each one is semantically equivalent to
+redirect-map.json.
+
+Each platform format can express a different subset of a rule:
+
+- mintlify   - source and destination only (Mintlify treats redirects as permanent)
+- cloudflare - source, destination and exact status code
+- nginx      - source, destination and exact status code
+- apache     - source, destination and exact status code (unknown codes fall back to 302)
+- vercel     - source, destination and a `permanent` boolean
+- netlify    - source, destination and exact status code
+
+Rules are compared on the fields the format can express.  The report lists,
+per format, rules missing from the artifact, rules the artifact adds, and
+field-level differences for rules present in both.
+
+Usage:
+    python verify_redirect_exports.py redirect-map.json
+    python verify_redirect_exports.py redirect-map.json --dir exported-redirects
+    python verify_redirect_exports.py redirect-map.json --json verify-report.json
+
+Author: Documentation Team
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+EXPORT_DIR = "exported-redirects"
+SITE_ORIGIN = "https://www.newscatcherapi.com"
+
+# Apache's RewriteRule `R` flag without an explicit code issues a 302.
+APACHE_DEFAULT_STATUS = 302
+
+# Number of differences printed per format (the JSON report has all of them).
+MAX_PRINTED_DIFFS = 20
+
+
+# ---------------------------------------------------------------------------
+# Artifact parsers
+#
+# Each parser returns a list of rules as dicts containing only the fields the
+# format can express.
+# ---------------------------------------------------------------------------
+
+
+def parse_mintlify(text: str) -> List[Dict]:
+    data = json.loads(text)
+    return [
+        {
+            "source": r["source"],
+            "destination": r["destination"],
+            "permanent": r.get("permanent", True),
+        }
+        for r in data.get("redirects", [])
+    ]
+
+
+def parse_cloudflare(text: str) -> List[Dict]:
+    rules = []
+    current: Dict = {}
+    for line in text.splitlines():
+        if line.startswith("URL Match: "):
+            current = {"source": line[len("URL Match: ") :].replace(SITE_ORIGIN, "", 1)}
+        elif line.startswith("Status Code: "):
+            current["status_code"] = int(line[len("Status Code: ") :])
+        elif line.startswith("Destination: "):
+            current["destination"] = line[len("Destination: ") :].replace(
+                SITE_ORIGIN, "", 1
+            )
+            rules.append(current)
+            current = {}
+    return rules
+
+
+_NGINX_LOCATION_RE = re.compile(r"^\s*location = (\S+) \{$")
+_NGINX_RETURN_RE = re.compile(r"^\s*return (\d{3}) (\S+);$")
+
+
+def parse_nginx(text: str) -> List[Dict]:
+    rules = []
+    source: Optional[str] = None
+    for line in text.splitlines():
+        match = _NGINX_LOCATION_RE.match(line)
+        if match:
+            source = match.group(1)
+            continue
+        match = _NGINX_RETURN_RE.match(line)
+        if match and source is not None:
+            rules.append(
+                {
+                    "source": source,
+                    "destination": match.group(2),
+                    "status_code": int(match.group(1)),
+                }
+            )
+            source = None
+    return rules
+
+
+_APACHE_RULE_RE = re.compile(r"^RewriteRule \^(\S*)\$ (\S+) \[([^\]]+)\]$")
+
+
+def parse_apache(text: str) -> List[Dict]:
+    rules = []
+    for line in text.splitlines():
+        match = _APACHE_RULE_RE.match(line)
+        if not match:
+            continue
+        pattern, destination, flags = match.groups()
+        status = APACHE_DEFAULT_STATUS
+        for flag in flags.split(","):
+            if flag.startswith("R="):
+                status = int(flag[2:])
+        rules.append(
+            {
+                "source": "/" + pattern.replace(r"\.", "."),
+                "destination": destination,
+                "status_code": status,
+            }
+        )
+    return rules
+
+
+def parse_vercel(text: str) -> List[Dict]:
+    data = json.loads(text)
+    return [
+        {
+            "source": r["source"],
+            "destination": r["destination"],
+            "permanent": bool(r.get("permanent")),
+        }
+        for r in data.get("redirects", [])
+    ]
+
+
+def parse_netlify(text: str) -> List[Dict]:
+    rules = []
+    for line in text.splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        parts = line.split()
+        if len(parts) < 2:
+            continue
+        status = int(parts[2].rstrip("!")) if len(parts) > 2 else 301
+        rules.append(
+            {"source": parts[0], "destination": parts[1], "status_code": status}
+        )
+    return rules
+
+
+# Format name -> (artifact file name, parser, compared fields)
+ARTIFACTS = {
+    "mintlify": (
+        "mintlify-redirects.json",
+        parse_mintlify,
+        ("destination", "permanent"),
+    ),
+    "cloudflare": (
+        "cloudflare-rules.txt",
+        parse_cloudflare,
+        ("destination", "status_code"),
+    ),
+    "nginx": ("nginx-redirects.conf", parse_nginx, ("destination", "status_code")),
+    "apache": (
+        "apache-redirects.htaccess",
+        parse_apache,
+        ("destination", "status_code"),
+    ),
+    "vercel": ("vercel-redirects.json", parse_vercel, ("destination", "permanent")),
+    "netlify": ("_redirects", parse_netlify, ("destination", "status_code")),
+}
+
+
+# ---------------------------------------------------------------------------
+# Comparison
+# ---------------------------------------------------------------------------
+
+
+def expected_fields(redirect: Dict) -> Dict:
+    """Project a source rule onto every field an artifact may express."""
+    return {
+        "destination": redirect.get("destination"),
+        "status_code": redirect.get("status_code"),
+        # Derived from `type`, exactly as export_vercel does.
+        "permanent": redirect.get("type") == "permanent",
+    }
+
+
+def compare_rules(
+    redirects: Iterable[Dict], parsed: List[Dict], fields: Tuple[str, ...]
+) -> Dict:
+    """Diff parsed artifact rules against the source map in linear time."""
+    expected = {}
+    for redirect in redirects:
+        expected.setdefault(redirect.get("source"), expected_fields(redirect))
+
+    actual: Dict[str, Dict] = {}
+    duplicates = []
+    for rule in parsed:
+        if rule["source"] in actual:
+            duplicates.append(rule["source"])
+        else:
+            actual[rule["source"]] = rule
+
+    missing = [source for source in expected if source not in actual]
+    extra = [source for source in actual if source not in expected]
+    changed = []
+    for source, want in expected.items():
+        got = actual.get(source)
+        if got is None:
+            continue
+        for field in fields:
+            if got.get(field) != want[field]:
+                changed.append(
+                    {
+                        "source": source,
+                        "field": field,
+                        "expected": want[field],
+                        "actual": got.get(field),
+                    }
+                )
+
+    return {
+        "rules": len(parsed),
+        "missing": missing,
+        "extra": extra,
+        "duplicates": duplicates,
+        "changed": changed,
+    }
+
+
+def verify_exports(
+    redirects: Iterable[Dict], export_dir: Path, formats: Optional[List[str]] = None
+) -> Dict[str, Dict]:
+    """Verify artifacts in `export_dir` (all formats by default), keyed by format."""
+    results = {}
+    for fmt, (filename, parser, fields) in ARTIFACTS.items():
+        if formats is not None and fmt not in formats:
+            continue
+        path = export_dir / filename
+        if not path.exists():
+            results[fmt] = {"file": str(path), "error": "artifact not found"}
+            continue
+        try:
+            parsed = parser(path.read_text(encoding="utf-8"))
+        except (ValueError, KeyError) as e:
+            results[fmt] = {"file": str(path), "error": f"could not parse: {e}"}
+            continue
+        result = compare_rules(redirects, parsed, fields)
+        result["file"] = str(path)
+        results[fmt] = result
+    return results
+
+
+def is_equivalent(result: Dict) -> bool:
+    return "error" not in result and not any(
+        result[key] for key in ("missing", "extra", "duplicates", "changed")
+    )
+
+
+def print_results(results: Dict[str, Dict]) -> bool:
+    """Print a per-format summary.  Returns True if every format matches."""
+    print("=" * 70)
+    print("Redirect Export Verification")
+    print("=" * 70)
+
+    all_ok = True
+    for fmt, result in results.items():
+        print()
+        if "error" in result:
+            all_ok = False
+            print(f"❌ {fmt}: {result['error']} ({result['file']})")
+            continue
+        if is_equivalent(result):
+            print(f"✓ {fmt}: {result['rules']} rules match ({result['file']})")
+            continue
+
+        all_ok = False
+        print(f"❌ {fmt}: differs from source map ({result['file']})")
+        lines = []
+        lines.extend(f"missing:   {s}" for s in result["missing"])
+        lines.extend(f"extra:     {s}" for s in result["extra"])
+        lines.extend(f"duplicate: {s}" for s in result["duplicates"])
+        lines.extend(
+            f"changed:   {c['source']} {c['field']}: "
+            f"expected {c['expected']!r}, got {c['actual']!r}"
+            for c in result["changed"]
+        )
+        for line in lines[:MAX_PRINTED_DIFFS]:
+            print(f"  - {line}")
+        if len(lines) > MAX_PRINTED_DIFFS:
+            print(f"  ... and {len(lines) - MAX_PRINTED_DIFFS} more")
+
+    print()
+    return all_ok
+
+
+def main():
+    import os
+
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent if script_dir.name == "scripts" else script_dir
+    os.chdir(project_root)
+    print(f"Working directory: {project_root}\n")
+
+    if len(sys.argv) < 2:
+        print(
+            "Usage: python verify_redirect_exports.py redirect-map.json [--dir exported-redirects] [--json FILE]"
+        )
+        sys.exit(1)
+
+    json_file = sys.argv[1]
+    export_dir = EXPORT_DIR
+    report_file = None
+
+    if "--dir" in sys.argv:
+        dir_idx = sys.argv.index("--dir")
+        if dir_idx + 1 < len(sys.argv):
+            export_dir = sys.argv[dir_idx + 1]
+
+    if "--json" in sys.argv:
+        json_idx = sys.argv.index("--json")
+        if json_idx + 1 < len(sys.argv):
+            report_file = sys.argv[json_idx + 1]
+
+    if not Path(json_file).exists():
+        print(f"Error: File not found: {json_file}")
+        sys.exit(1)
+
+    try:
+        with open(json_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON in {json_file}")
+        print(f"  {e}")
+        sys.exit(1)
+
+    results = verify_exports(data.get("redirects", []), Path(export_dir))
+    all_ok = print_results(results)
+
+    if report_file:
+        with open(report_file, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Report written to: {report_file}")
+
+    if not all_ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""Filesystem change notification for the --watch modes.
+
+On Linux, changes are read from inotify (through ctypes, no extra packages):
+every directory under the project root gets a watch, new directories are
+added as they appear, and events are filtered down to the files a generator
+cares about.  Elsewhere, or when inotify is unavailable (for example when
+the watch limit is exhausted), the tree is polled for mtime/size changes.
+
+Events arriving in quick succession (an editor saving several files, a git
+checkout) are coalesced into one batch.
+
+Requirements:
+    Python 3.10+, stdlib only
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+# Directories never watched.
+SKIP_DIRS = {"node_modules", "__pycache__"}
+
+POLL_INTERVAL = 0.5
+# Quiet period that closes a batch of events.
+DEBOUNCE = 0.05
+
+# inotify constants from <sys/inotify.h>.
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+)
+_EVENT = struct.Struct("iIII")
+
+
+def _walk_dirs(root: Path):
+    """Yield `root` and every watchable directory below it."""
+    yield root
+    for dirpath, dirnames, _ in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".") and d not in SKIP_DIRS]
+        for d in dirnames:
+            yield Path(dirpath) / d
+
+
+def _iter_files(root: Path):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".") and d not in SKIP_DIRS]
+        for filename in filenames:
+            yield Path(dirpath) / filename
+
+
+# ---------------------------------------------------------------------------
+# inotify backend
+# ---------------------------------------------------------------------------
+
+
+class InotifyWatcher:
+    """Recursive inotify watcher."""
+
+    name = "inotify"
+
+    def __init__(self, root: Path, include: Callable[[Path], bool]):
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or not libc_name:
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.root = root
+        self.include = include
+        self._dirs: dict[int, Path] = {}
+        try:
+            for directory in _walk_dirs(root):
+                self._add(directory)
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def _add(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self._dirs[wd] = directory
+
+    def _read(self) -> set[Path]:
+        changed: set[Path] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    # Events were dropped: report everything that matches.
+                    changed.update(self._scan_all())
+                    continue
+                if mask & IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is None or not name:
+                    continue
+                path = directory / os.fsdecode(name)
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO) and not path.name.startswith("."):
+                        # Watch the new directory and pick up files created
+                        # in it before the watch existed.
+                        for sub in _walk_dirs(path):
+                            try:
+                                self._add(sub)
+                            except OSError:
+                                continue
+                        changed.update(p for p in _iter_files(path) if self.include(p))
+                    continue
+                if self.include(path):
+                    changed.add(path)
+
+    def _scan_all(self) -> set[Path]:
+        return {p for p in _iter_files(self.root) if self.include(p)}
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        """Block until matching files change; return the batch of paths."""
+        changed: set[Path] = set()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not changed:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                return changed
+            changed |= self._read()
+        # Coalesce a burst of events into one batch.
+        while select.select([self._fd], [], [], DEBOUNCE)[0]:
+            changed |= self._read()
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+# ---------------------------------------------------------------------------
+# Polling backend
+# ---------------------------------------------------------------------------
+
+
+class PollingWatcher:
+    """Portable fallback: compare mtime and size of matching files."""
+
+    name = "polling"
+
+    def __init__(
+        self, root: Path, include: Callable[[Path], bool], interval: float = POLL_INTERVAL
+    ):
+        self.root = root
+        self.include = include
+        self.interval = interval
+        self._stamps = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        stamps = {}
+        for path in _iter_files(self.root):
+            if self.include(path):
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                stamps[path] = (st.st_mtime_ns, st.st_size)
+        return stamps
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            stamps = self._scan()
+            changed = {
+                p
+                for p in stamps.keys() | self._stamps.keys()
+                if stamps.get(p) != self._stamps.get(p)
+            }
+            self._stamps = stamps
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval)
+
+    def close(self) -> None:
+        pass
+
+
+def make_watcher(root: Path, include: Callable[[Path], bool], polling: bool = False):
+    """Return an inotify watcher when possible, otherwise a polling one."""
+    if not polling:
+        try:
+            return InotifyWatcher(root, include)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, include)
+
+
+def run_watch(
+    root: Path,
+    include: Callable[[Path], bool],
+    on_change: Callable[[set[Path]], None],
+    polling: bool = False,
+) -> None:
+    """Call `on_change` with each batch of changed paths until interrupted."""
+    watcher = make_watcher(root, include, polling)
+    print(f"Watching {root} for changes ({watcher.name}, Ctrl+C to stop)...")
+    try:
+        while True:
+            changed = watcher.wait()
+            if changed:
+                on_change(changed)
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        watcher.close()